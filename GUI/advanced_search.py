@@ -0,0 +1,177 @@
+# advanced_search.py - Ranked full-text search across customers and their records
+from customer_search import create_missing_indexes
+
+# Text search configuration; 'simple' does not stem, so names and city names match as typed
+TEXT_SEARCH_CONFIG = 'simple'
+
+# Ranked customers returned per search
+ADVANCED_SEARCH_LIMIT = 200
+
+# Table -> text kept in its search_vector column. The columns are GENERATED ... STORED,
+# so Postgres keeps them current on every insert and update
+SEARCH_VECTORS = {
+    'Customer': "coalesce(Customer_First_Name, '') || ' ' || coalesce(Customer_Last_Name, '')",
+    'Address': "coalesce(street_address, '') || ' ' || coalesce(city_name, '')",
+    'Contact': "coalesce(contact_value, '')",
+    'CustomerNote': "coalesce(note_text, '')"
+}
+
+# Searchable record kinds: label -> (table, alias, customer column, text shown for a hit)
+SEARCH_SOURCES = {
+    'Customer': ('Customer', 'c', 'CustomerID', "c.Customer_First_Name || ' ' || c.Customer_Last_Name"),
+    'Address': ('Address', 'a', 'customer_id', "a.street_address || ', ' || a.city_name"),
+    'Contact': ('Contact', 'ct', 'customer_id', "ct.contact_type || ': ' || ct.contact_value"),
+    'Note': ('CustomerNote', 'n', 'customer_id', "n.note_category || ': ' || left(n.note_text, 80)")
+}
+
+# Indexes the filters need besides the GIN indexes, so no filter falls back to a sequential scan
+FILTER_INDEXES = {
+    'CustomerSegmentAssignment': [
+        ('segment_assignment_customer_segment_idx',
+         "CREATE INDEX CONCURRENTLY IF NOT EXISTS segment_assignment_customer_segment_idx "
+         "ON CustomerSegmentAssignment (customer_id, segment_id)")
+    ]
+}
+
+
+def search_vector_column_sql(table):
+    """ALTER TABLE statement adding the search_vector column of a table"""
+    return (f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+            f"GENERATED ALWAYS AS (to_tsvector('{TEXT_SEARCH_CONFIG}', {SEARCH_VECTORS[table]})) STORED")
+
+
+def search_vector_index_sql(table):
+    """(index name, CREATE INDEX CONCURRENTLY statement) of a table's search_vector GIN index"""
+    name = f"{table.lower()}_search_vector_idx"
+    return name, f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} USING gin (search_vector)"
+
+
+def search_vector_statements():
+    """Columns and GIN indexes as plain statements, for building a fresh (empty) schema"""
+    statements = []
+    for table in SEARCH_VECTORS:
+        statements.append(search_vector_column_sql(table))
+        statements.append(search_vector_index_sql(table)[1].replace("CONCURRENTLY ", ""))
+    return statements
+
+
+def missing_search_vectors(cursor):
+    """Tables whose search_vector column or its valid GIN index is missing; reads only the catalogs"""
+    cursor.execute("""
+        SELECT table_name FROM information_schema.columns
+        WHERE column_name = 'search_vector' AND table_schema = current_schema()
+    """)
+    columns = {row[0] for row in cursor.fetchall()}
+    cursor.execute("""
+        SELECT c.relname FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indexrelid
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = current_schema() AND i.indisvalid AND c.relname LIKE '%%_search_vector_idx'
+    """)
+    indexes = {row[0] for row in cursor.fetchall()}
+    return [table for table in SEARCH_VECTORS
+            if table.lower() not in columns or search_vector_index_sql(table)[0] not in indexes]
+
+
+def ensure_search_vectors(cursor):
+    """
+    Migration: add any missing search_vector columns and build their GIN indexes
+
+    Adding a stored generated column rewrites the table under an exclusive
+    lock, so this runs from schema_migrations.py, never from the GUI.
+    Returns the names of the indexes that were built.
+    """
+    for table in SEARCH_VECTORS:
+        cursor.execute(search_vector_column_sql(table))
+    cursor.connection.commit()
+
+    built = []
+    for table in SEARCH_VECTORS:
+        built += create_missing_indexes(cursor, table, [search_vector_index_sql(table)])
+    for table, indexes in FILTER_INDEXES.items():
+        built += create_missing_indexes(cursor, table, indexes)
+    return built
+
+
+def build_advanced_search(text, sources=None, segment_id=None, since_from=None, since_to=None,
+                          notes_from=None, notes_to=None, important_only=False,
+                          limit=ADVANCED_SEARCH_LIMIT):
+    """
+    Build one ranked query over every selected record kind
+
+    Each kind contributes the customers whose search_vector matches the query
+    (a GIN index lookup), the hits are combined with UNION ALL and grouped per
+    customer, and customers are ranked by the sum of their ts_rank scores.
+    Filters are applied to the matched customers only, through primary key and
+    index lookups.
+
+    Parameters:
+        text (str): Search text, in web search syntax ("quoted phrase", -exclude, or)
+        sources (list): Keys of SEARCH_SOURCES to search (defaults to all)
+        segment_id (int): Only customers assigned to this segment
+        since_from (str): Only customers since this date (YYYY-MM-DD)
+        since_to (str): Only customers since on or before this date
+        notes_from (str): Only note hits dated on or after this date
+        notes_to (str): Only note hits dated on or before this date
+        important_only (bool): Only note hits marked important
+        limit (int): Maximum customers returned
+
+    Returns:
+        tuple: (sql, params); rows are (CustomerID, first name, last name,
+            matched kinds, rank, best matching text); note filters without
+            'Note' among the sources raise ValueError instead of being ignored
+    """
+    sources = sources or list(SEARCH_SOURCES)
+    if (notes_from or notes_to or important_only) and 'Note' not in sources:
+        raise ValueError("Note date and importance filters need notes to be searched")
+
+    branches, params = [], []
+    for source in sources:
+        table, alias, customer_column, snippet = SEARCH_SOURCES[source]
+        conditions = [f"{alias}.search_vector @@ websearch_to_tsquery('{TEXT_SEARCH_CONFIG}', %s)"]
+        branch_params = [text, text]
+        if source == 'Note':
+            if important_only:
+                conditions.append("n.is_important")
+            if notes_from:
+                conditions.append("n.note_date >= %s")
+                branch_params.append(notes_from)
+            if notes_to:
+                conditions.append("n.note_date <= %s")
+                branch_params.append(notes_to)
+        branches.append(f"""
+            SELECT {alias}.{customer_column} AS customer_id, '{source}' AS source, {snippet} AS snippet,
+                   ts_rank({alias}.search_vector, websearch_to_tsquery('{TEXT_SEARCH_CONFIG}', %s)) AS rank
+            FROM {table} {alias}
+            WHERE {' AND '.join(conditions)}""")
+        params += branch_params
+
+    filters = []
+    if segment_id is not None:
+        filters.append("""EXISTS (SELECT 1 FROM CustomerSegmentAssignment csa
+                       WHERE csa.customer_id = c.CustomerID AND csa.segment_id = %s)""")
+        params.append(segment_id)
+    if since_from:
+        filters.append("c.customer_since >= %s")
+        params.append(since_from)
+    if since_to:
+        filters.append("c.customer_since <= %s")
+        params.append(since_to)
+    where = f"WHERE {' AND '.join(filters)}" if filters else ""
+
+    union = '\n            UNION ALL'.join(branches)
+    sql = f"""
+        WITH hits AS ({union}
+        )
+        SELECT c.CustomerID, c.Customer_First_Name, c.Customer_Last_Name,
+               string_agg(DISTINCT h.source, ', ') AS matched_in,
+               SUM(h.rank) AS rank,
+               (array_agg(h.snippet ORDER BY h.rank DESC))[1] AS best_match
+        FROM hits h
+        JOIN Customer c ON c.CustomerID = h.customer_id
+        {where}
+        GROUP BY c.CustomerID, c.Customer_First_Name, c.Customer_Last_Name
+        ORDER BY rank DESC, c.CustomerID
+        LIMIT %s
+    """
+    return sql, params + [limit]
@@ -5,7 +5,7 @@ import subprocess
 class DatabaseConfig:
     """Simple database configuration management"""
     
-    def _init_(self):
+    def __init__(self):
         """Initialize with default configuration"""
         self.config = {
             'host': os.getenv('DB_HOST', 'localhost'),
@@ -14,7 +14,13 @@ class DatabaseConfig:
             'user': os.getenv('DB_USER', 'postgres'),
             'password': os.getenv('DB_PASSWORD', ''),
             'connection_timeout': 30,
-            'command_timeout': 60
+            'command_timeout': 60,
+            'pool_min_size': int(os.getenv('DB_POOL_MIN_SIZE', '1')),
+            'pool_size': int(os.getenv('DB_POOL_SIZE', '5')),
+            'health_check_interval': 30,
+            # Server-side statement_timeout in seconds; 0 leaves it off, since exports, index
+            # builds and view refreshes legitimately run for a long time
+            'statement_timeout': int(os.getenv('DB_STATEMENT_TIMEOUT', '0'))
         }
     
     def get_config(self):
@@ -27,6 +33,25 @@ class DatabaseConfig:
             if key in self.config:
                 self.config[key] = value
     
+    def get_connect_params(self):
+        """
+        Keyword arguments for psycopg2.connect
+        
+        A non-zero statement_timeout is set on every session, so a runaway
+        query is cancelled by Postgres instead of holding a connection forever.
+        """
+        params = {
+            'host': self.config['host'],
+            'port': self.config['port'],
+            'database': self.config['database'],
+            'user': self.config['user'],
+            'password': self.config['password'],
+            'connect_timeout': self.config['connection_timeout']
+        }
+        if self.config['statement_timeout']:
+            params['options'] = f"-c statement_timeout={int(self.config['statement_timeout'] * 1000)}"
+        return params
+    
     def get_connection_string(self):
         """Generate PostgreSQL connection string"""
         return f"postgresql://{self.config['user']}:{self.config['password']}@{self.config['host']}:{self.config['port']}/{self.config['database']}"
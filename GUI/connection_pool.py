@@ -0,0 +1,123 @@
+# connection_pool.py - Shared, health-checked connection pool built on DatabaseConfig
+import threading
+import time
+from contextlib import contextmanager
+import psycopg2
+import psycopg2.extras
+from psycopg2 import pool
+from config import DatabaseConfig
+
+# Seconds a caller waits for a free connection before giving up
+POOL_WAIT_TIMEOUT = 30.0
+
+
+class DatabasePool:
+    """
+    Thread-safe pool of database connections, one checked out per operation
+
+    Built on psycopg2's ThreadedConnectionPool with the settings of a
+    DatabaseConfig: pool_min_size / pool_size connections, connection_timeout
+    for connecting and statement_timeout (off unless configured) for each session.
+    Callers block (up to POOL_WAIT_TIMEOUT) instead of failing when every
+    connection is busy. A connection idle for longer than
+    health_check_interval is checked with SELECT 1 before it is handed out,
+    and replaced if the server dropped it.
+
+    Parameters:
+        config (DatabaseConfig): Connection and pool settings
+    """
+
+    def __init__(self, config=None):
+        self.config = config or DatabaseConfig()
+        settings = self.config.get_config()
+        self.connect_params = self.config.get_connect_params()
+        self.size = settings['pool_size']
+        self.health_check_interval = settings['health_check_interval']
+
+        self.pool = pool.ThreadedConnectionPool(min(settings['pool_min_size'], self.size), self.size,
+                                                **self.connect_params)
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._lock = threading.Lock()
+        self._last_used = {}
+
+    @classmethod
+    def from_params(cls, **connect_params):
+        """Pool for the given host / port / database / user / password on top of the default settings"""
+        config = DatabaseConfig()
+        config.update_config(**connect_params)
+        return cls(config)
+
+    def _healthy(self, connection):
+        """Whether a pooled connection can still be used"""
+        if connection.closed:
+            return False
+        with self._lock:
+            # Connections the pool just opened have no entry and count as fresh
+            idle = time.monotonic() - self._last_used.get(id(connection), time.monotonic())
+        if idle < self.health_check_interval:
+            return True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            connection.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def getconn(self):
+        """Check out a healthy connection; pair every call with putconn()"""
+        if not self._slots.acquire(timeout=POOL_WAIT_TIMEOUT):
+            raise pool.PoolError(f"No database connection free within {POOL_WAIT_TIMEOUT:.0f}s "
+                                 f"(pool size {self.size})")
+        try:
+            connection = self.pool.getconn()
+            if not self._healthy(connection):
+                self.pool.putconn(connection, close=True)
+                connection = self.pool.getconn()
+            return connection
+        except Exception:
+            self._slots.release()
+            raise
+
+    def putconn(self, connection):
+        """Return a connection, rolling back anything left open; broken ones are discarded"""
+        try:
+            try:
+                if not connection.closed:
+                    connection.rollback()
+            except psycopg2.Error:
+                connection.close()
+            with self._lock:
+                if connection.closed:
+                    self._last_used.pop(id(connection), None)
+                else:
+                    self._last_used[id(connection)] = time.monotonic()
+            self.pool.putconn(connection, close=bool(connection.closed))
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def connection(self):
+        """A connection for one operation: committed on success, rolled back on error"""
+        connection = self.getconn()
+        try:
+            yield connection
+            connection.commit()
+        except Exception:
+            if not connection.closed:
+                connection.rollback()
+            raise
+        finally:
+            self.putconn(connection)
+
+    @contextmanager
+    def cursor(self, cursor_factory=psycopg2.extras.DictCursor):
+        """A fresh cursor on a pooled connection, in its own transaction"""
+        with self.connection() as connection:
+            with connection.cursor(cursor_factory=cursor_factory) as cursor:
+                yield cursor
+
+    def close(self):
+        """Close every connection in the pool"""
+        if not self.pool.closed:
+            self.pool.closeall()
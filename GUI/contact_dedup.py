@@ -0,0 +1,151 @@
+# contact_dedup.py - Find duplicate contacts in one window-function pass and delete them in batches
+import threading
+import time
+from maintenance_jobs import MAINTENANCE_BATCH_SIZE, MAINTENANCE_PAUSE
+
+
+def normalized_value(column='contact_value'):
+    """SQL expression for a contact value compared ignoring case and surrounding / repeated whitespace"""
+    return f"lower(regexp_replace(btrim({column}), '\\s+', ' ', 'g'))"
+
+
+# Contacts of a customer with the same type and normalized value are duplicates. The one kept is
+# the primary, else the oldest; the index matches the window's partition and order, so the
+# duplicates come out of an index scan without a sort.
+DEDUP_ORDER = "is_primary DESC NULLS LAST, contactID"
+CONTACT_DEDUP_INDEX = 'contact_dedup_idx'
+CONTACT_DEDUP_INDEX_SQL = (f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {CONTACT_DEDUP_INDEX} "
+                           f"ON Contact (customer_id, contact_type, ({normalized_value()}), {DEDUP_ORDER})")
+
+# Every contact but the first of its group, with the contact kept in its place
+DUPLICATE_CONTACTS_SQL = f"""
+    SELECT contactID, customer_id, contact_type, contact_value, kept_id, kept_value
+    FROM (
+        SELECT contactID, customer_id, contact_type, contact_value,
+               ROW_NUMBER() OVER contact_group AS position,
+               FIRST_VALUE(contactID) OVER contact_group AS kept_id,
+               FIRST_VALUE(contact_value) OVER contact_group AS kept_value
+        FROM Contact
+        WINDOW contact_group AS (
+            PARTITION BY customer_id, contact_type, {normalized_value()}
+            ORDER BY {DEDUP_ORDER}
+        )
+    ) ranked
+    WHERE position > 1
+    ORDER BY customer_id, kept_id, contactID
+"""
+
+# Delete a batch of duplicates, each only if the contact kept in its place still exists and still
+# matches it, so nothing changed since the dry run loses its last copy
+DELETE_DUPLICATES_SQL = f"""
+    DELETE FROM Contact C
+    USING unnest(%s::int[], %s::int[]) AS D(contact_id, kept_id), Contact K
+    WHERE C.contactID = D.contact_id
+      AND K.contactID = D.kept_id
+      AND K.contactID <> C.contactID
+      AND K.customer_id = C.customer_id
+      AND K.contact_type = C.contact_type
+      AND {normalized_value('K.contact_value')} = {normalized_value('C.contact_value')}
+    RETURNING C.contactID
+"""
+
+# Duplicates listed one by one in the dry-run report
+MAX_REPORTED_DUPLICATES = 50
+
+
+def find_duplicate_contacts(cursor):
+    """
+    Dry run: every duplicate contact that deduplication would delete
+
+    Returns:
+        list: dicts with contact_id, customer_id, contact_type, contact_value,
+            kept_id and kept_value
+    """
+    cursor.execute(DUPLICATE_CONTACTS_SQL)
+    return [{'contact_id': row[0], 'customer_id': row[1], 'contact_type': row[2], 'contact_value': row[3],
+             'kept_id': row[4], 'kept_value': row[5]} for row in cursor.fetchall()]
+
+
+def duplicate_report(duplicates):
+    """Plain-text dry-run report of find_duplicate_contacts()"""
+    groups = len({duplicate['kept_id'] for duplicate in duplicates})
+    lines = ["DUPLICATE CONTACTS (dry run)", "=" * 40,
+             f"{len(duplicates)} duplicates in {groups} groups would be deleted\n"]
+    for duplicate in duplicates[:MAX_REPORTED_DUPLICATES]:
+        lines.append(f"Customer {duplicate['customer_id']} {duplicate['contact_type']}: "
+                     f"#{duplicate['contact_id']} '{duplicate['contact_value']}' "
+                     f"-> keeps #{duplicate['kept_id']} '{duplicate['kept_value']}'")
+    if len(duplicates) > MAX_REPORTED_DUPLICATES:
+        lines.append(f"... and {len(duplicates) - MAX_REPORTED_DUPLICATES} more")
+    return "\n".join(lines)
+
+
+class ContactDeduplicator:
+    """
+    Delete the duplicates found by find_duplicate_contacts() in batches, committing each
+
+    Parameters:
+        db_pool (DatabasePool): Pool the batches borrow a connection from
+        batch_size (int): Contacts deleted per batch
+        pause (float): Seconds slept between batches
+    """
+
+    def __init__(self, db_pool, batch_size=MAINTENANCE_BATCH_SIZE, pause=MAINTENANCE_PAUSE):
+        self.db_pool = db_pool
+        self.batch_size = batch_size
+        self.pause = pause
+
+        self.stop = threading.Event()
+        self.deleted = 0
+        self.total = 0
+
+    def status(self):
+        """Progress text for the progress window"""
+        return f"{self.deleted:,} of {self.total:,} duplicates deleted"
+
+    def delete(self, duplicates):
+        """
+        Delete duplicates batch by batch until done or stop is set
+
+        Returns:
+            dict: deleted, skipped (changed since the dry run), seconds and
+                finished (False when stopped early)
+        """
+        self.total = len(duplicates)
+        started = time.perf_counter()
+        done = 0
+
+        for start in range(0, len(duplicates), self.batch_size):
+            if start and self.stop.wait(self.pause):
+                break
+            batch = duplicates[start:start + self.batch_size]
+            with self.db_pool.cursor() as cursor:
+                cursor.execute(DELETE_DUPLICATES_SQL, ([duplicate['contact_id'] for duplicate in batch],
+                                                       [duplicate['kept_id'] for duplicate in batch]))
+                self.deleted += len(cursor.fetchall())
+            done += len(batch)
+
+        seconds = time.perf_counter() - started
+        print(f"🧹 Deleted {self.deleted:,} duplicate contacts in {seconds:.2f}s")
+        return {'deleted': self.deleted, 'skipped': done - self.deleted, 'seconds': seconds,
+                'finished': done == len(duplicates)}
+
+
+if __name__ == "__main__":
+    from config import DatabaseConfig
+    from connection_pool import DatabasePool
+
+    # Connection settings come from DatabaseConfig (DB_HOST, DB_PORT, ... environment variables)
+    db_config = DatabaseConfig()
+    if not db_config.get_config()['password']:
+        db_config.update_config(password=input("Enter PostgreSQL password: "))
+
+    db_pool = DatabasePool(db_config)
+    try:
+        with db_pool.cursor() as cursor:
+            found = find_duplicate_contacts(cursor)
+        print(duplicate_report(found))
+        if found and input("Delete these duplicates? (y/N): ").strip().lower() == 'y':
+            ContactDeduplicator(db_pool).delete(found)
+    finally:
+        db_pool.close()
@@ -0,0 +1,231 @@
+# customer_search.py - Indexed search-as-you-type over customers
+import re
+import time
+from psycopg2.extensions import QueryCanceledError
+
+# Quiet time after the last keystroke before a search is sent, in milliseconds
+SEARCH_DEBOUNCE_MS = 150
+
+# Ranked matches shown per search
+SEARCH_LIMIT = 100
+
+# Shortest name fragment the trigram indexes can look up (pg_trgm works on 3-letter groups)
+MIN_TRIGRAM_LENGTH = 3
+
+# Longest digit string that may still be a CustomerID (fits in INT)
+MAX_CUSTOMER_ID_DIGITS = 9
+
+# Index name -> definition; built CONCURRENTLY so the table stays writable meanwhile
+SEARCH_INDEXES = [
+    ('customer_first_name_trgm_idx',
+     "CREATE INDEX CONCURRENTLY IF NOT EXISTS customer_first_name_trgm_idx "
+     "ON Customer USING gin (Customer_First_Name gin_trgm_ops)"),
+    ('customer_last_name_trgm_idx',
+     "CREATE INDEX CONCURRENTLY IF NOT EXISTS customer_last_name_trgm_idx "
+     "ON Customer USING gin (Customer_Last_Name gin_trgm_ops)"),
+    ('customer_ssn_pattern_idx',
+     "CREATE INDEX CONCURRENTLY IF NOT EXISTS customer_ssn_pattern_idx "
+     "ON Customer (ssn text_pattern_ops)")
+]
+
+SEARCH_COLUMNS = """
+    SELECT EmployeeID, CustomerID, Customer_First_Name, Customer_Last_Name,
+           ssn, date_of_birth, customer_since
+    FROM Customer
+"""
+
+
+def create_missing_indexes(cursor, table, indexes, setup=()):
+    """
+    Build the indexes of a table that are missing or left invalid by a failed build
+
+    Runs on the QueryExecutor worker. CREATE INDEX CONCURRENTLY cannot run inside
+    a transaction, so the connection is switched to autocommit while building;
+    the setup statements run first, in the same mode, when anything is missing.
+
+    Parameters:
+        cursor: Worker cursor
+        table (str): Table the indexes belong to
+        indexes (list): (index name, CREATE INDEX CONCURRENTLY statement) pairs
+        setup (list): Statements needed before the indexes can be built
+
+    Returns:
+        list: Names of the indexes that were built
+    """
+    cursor.execute("""
+        SELECT c.relname, i.indisvalid
+        FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indexrelid
+        WHERE i.indrelid = %s::regclass
+    """, (table.lower(),))
+    existing = {row[0]: row[1] for row in cursor.fetchall()}
+    missing = [(name, sql) for name, sql in indexes if existing.get(name) is not True]
+    if not missing:
+        return []
+
+    connection = cursor.connection
+    connection.commit()
+    connection.autocommit = True
+    try:
+        for statement in setup:
+            cursor.execute(statement)
+        for name, sql in missing:
+            if name in existing:
+                # An interrupted concurrent build leaves an invalid index behind
+                cursor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+            cursor.execute(sql)
+    finally:
+        connection.autocommit = False
+    return [name for name, _ in missing]
+
+
+def ensure_search_indexes(cursor):
+    """Create the trigram and SSN pattern indexes the search box relies on"""
+    return create_missing_indexes(cursor, 'Customer', SEARCH_INDEXES,
+                                  setup=["CREATE EXTENSION IF NOT EXISTS pg_trgm"])
+
+
+def like_escape(text):
+    """Escape LIKE wildcards so user input only matches literally"""
+    return re.sub(r'([\\%_])', r'\\\1', text)
+
+
+def build_search(term, limit=SEARCH_LIMIT):
+    """
+    Ranked customer search for a search box entry
+
+    Digits (and dashes) match a CustomerID exactly or an SSN by prefix, which the
+    text_pattern_ops index answers. Anything else is split into words, and every
+    word must appear in the first or last name; ILIKE '%word%' is answered by the
+    trigram GIN indexes. Name matches are ranked by trigram similarity to the
+    whole entry.
+
+    Parameters:
+        term (str): Text typed by the user
+        limit (int): Maximum rows returned
+
+    Returns:
+        tuple: (sql, params), or None when the entry is too short to search
+    """
+    term = term.strip()
+    if not term:
+        return None
+
+    if re.fullmatch(r'[\d-]+', term):
+        digits = term.replace('-', '')
+        if not digits:
+            return None
+        # SSNs are stored as AAA-GG-SSSS, so typed digits are matched in that layout
+        ssn_prefix = '-'.join(part for part in (digits[:3], digits[3:5], digits[5:9]) if part)
+        if term.endswith('-') and len(digits) in (3, 5):
+            ssn_prefix += '-'
+        conditions, params = ["ssn LIKE %s"], [like_escape(ssn_prefix) + '%']
+        if len(digits) <= MAX_CUSTOMER_ID_DIGITS:
+            conditions.insert(0, "CustomerID = %s")
+            params.insert(0, int(digits))
+            order = "CustomerID = %s DESC, ssn"
+            params.append(int(digits))
+        else:
+            order = "ssn"
+        sql = f"{SEARCH_COLUMNS} WHERE {' OR '.join(conditions)} ORDER BY {order} LIMIT %s"
+        return sql, params + [limit]
+
+    words = term.split()
+    if max(len(word) for word in words) < MIN_TRIGRAM_LENGTH:
+        return None
+
+    conditions, params = [], []
+    for word in words:
+        pattern = f'%{like_escape(word)}%'
+        conditions.append("(Customer_First_Name ILIKE %s OR Customer_Last_Name ILIKE %s)")
+        params += [pattern, pattern]
+    sql = f"""{SEARCH_COLUMNS}
+        WHERE {' AND '.join(conditions)}
+        ORDER BY similarity(Customer_First_Name || ' ' || Customer_Last_Name, %s) DESC, CustomerID
+        LIMIT %s
+    """
+    return sql, params + [term, limit]
+
+
+class IncrementalSearch:
+    """
+    Debounced search box that runs cancellable searches on a QueryExecutor
+
+    Each keystroke restarts the debounce timer; when it fires, the search still
+    in flight (if any) is cancelled and the new one is sent. Results of a search
+    that was overtaken are dropped.
+
+    Parameters:
+        entry (tk.Entry): Search box
+        executor (QueryExecutor): Runs the searches
+        on_results (callable): Called with (rows, term, elapsed_ms)
+        on_clear (callable): Called when the box is emptied
+        on_status (callable): Called with a short status message
+        delay (int): Debounce time in milliseconds
+    """
+
+    def __init__(self, entry, executor, on_results, on_clear, on_status, delay=SEARCH_DEBOUNCE_MS):
+        self.entry = entry
+        self.executor = executor
+        self.on_results = on_results
+        self.on_clear = on_clear
+        self.on_status = on_status
+        self.delay = delay
+
+        self._after_id = None
+        self._future = None
+        self._generation = 0
+        self._last_term = ''
+
+        self.entry.bind('<KeyRelease>', self._on_key)
+        self.entry.bind('<Return>', lambda event: self.search_now())
+
+    def _on_key(self, event):
+        """Restart the debounce timer"""
+        if self._after_id is not None:
+            self.entry.after_cancel(self._after_id)
+        self._after_id = self.entry.after(self.delay, self.search_now)
+
+    def search_now(self):
+        """Search for the current entry text, replacing any search in flight"""
+        if self._after_id is not None:
+            self.entry.after_cancel(self._after_id)
+            self._after_id = None
+
+        term = self.entry.get().strip()
+        if term == self._last_term and self._future is not None:
+            return
+        self._last_term = term
+
+        self._generation += 1
+        generation = self._generation
+        if self._future is not None and not self._future.done():
+            self.executor.cancel_job(self._future)
+        self._future = None
+
+        if not term:
+            self.on_clear()
+            return
+
+        search = build_search(term)
+        if search is None:
+            self.on_status(f"Type at least {MIN_TRIGRAM_LENGTH} letters or a number")
+            return
+
+        started = time.monotonic()
+
+        def work(cursor):
+            cursor.execute(*search)
+            return cursor.fetchall()
+
+        def show(rows):
+            if generation == self._generation:
+                self.on_results(rows, term, (time.monotonic() - started) * 1000)
+
+        def failed(error):
+            if generation != self._generation or isinstance(error, QueryCanceledError):
+                return
+            self.on_status(f"Search failed: {str(error)}")
+
+        self._future = self.executor.submit(work, on_success=show, on_error=failed,
+                                            description="Searching...")
@@ -0,0 +1,105 @@
+# customer_status.py - Customer verification status for many customers in one query
+import os
+import random
+import time
+
+# The one definition of check_customer_status and its set-based version customer_status_bulk
+# (one grouped pass per table instead of three EXISTS lookups per customer)
+FUNCTIONS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'part4', 'Functions')
+
+# Customers per benchmark run; doubling sizes make the growth rate easy to read
+BENCHMARK_SIZES = (250, 500, 1000, 2000, 4000)
+
+
+def install_customer_status_functions(cursor):
+    """Create or replace the functions of part4/Functions; a schema migration"""
+    with open(FUNCTIONS_FILE, 'r', encoding='utf-8') as file:
+        cursor.execute(file.read())
+    return ['check_customer_status', 'customer_status_bulk']
+
+
+def customer_status_functions_installed(cursor):
+    """Whether customer_status_bulk exists; reads only the catalogs"""
+    cursor.execute("SELECT to_regprocedure('customer_status_bulk(integer[])') IS NOT NULL")
+    return cursor.fetchone()[0]
+
+
+def customer_status_bulk(cursor, customer_ids=None):
+    """
+    Verification status of many customers in one round trip
+
+    The function is installed by schema_migrations.py.
+
+    Parameters:
+        cursor: psycopg2 cursor
+        customer_ids (list): Customers to check; None checks every customer
+
+    Returns:
+        dict: customer_id -> (status, has_address, has_contact, has_valid_document)
+    """
+    ids = None if customer_ids is None else [int(customer_id) for customer_id in customer_ids]
+    cursor.execute("SELECT * FROM customer_status_bulk(%s::int[])", (ids,))
+    return {row[0]: (row[4], row[1], row[2], row[3]) for row in cursor.fetchall()}
+
+
+def benchmark_customer_status(cursor, sizes=BENCHMARK_SIZES):
+    """
+    Time check_customer_status called once per customer against one customer_status_bulk call
+
+    Installs both functions, then for each size picks that many random
+    customers and runs both ways over the same IDs, checking they agree.
+    Time per customer staying flat as the size grows means linear scaling.
+
+    Returns:
+        list: dicts with customers, per_row_seconds and bulk_seconds
+    """
+    install_customer_status_functions(cursor)
+
+    cursor.execute("SELECT CustomerID FROM Customer")
+    all_ids = [row[0] for row in cursor.fetchall()]
+
+    print(f"{'Customers':>10} {'Per-row (s)':>12} {'µs/customer':>12} {'Bulk (s)':>10} {'µs/customer':>12}")
+    results = []
+    for size in sizes:
+        if size > len(all_ids):
+            print(f"⚠️ Only {len(all_ids)} customers, skipping {size}")
+            continue
+        ids = random.sample(all_ids, size)
+
+        # What a dashboard does today: one call, one round trip per customer
+        started = time.perf_counter()
+        per_row = {}
+        for customer_id in ids:
+            cursor.execute("SELECT check_customer_status(%s)", (customer_id,))
+            per_row[customer_id] = cursor.fetchone()[0]
+        per_row_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        bulk = customer_status_bulk(cursor, ids)
+        bulk_seconds = time.perf_counter() - started
+
+        mismatches = [customer_id for customer_id in ids if bulk[customer_id][0] != per_row[customer_id]]
+        if mismatches:
+            raise AssertionError(f"customer_status_bulk disagrees with check_customer_status for {mismatches[:10]}")
+
+        print(f"{size:>10} {per_row_seconds:>12.3f} {per_row_seconds / size * 1e6:>12.1f} "
+              f"{bulk_seconds:>10.3f} {bulk_seconds / size * 1e6:>12.1f}")
+        results.append({'customers': size, 'per_row_seconds': per_row_seconds, 'bulk_seconds': bulk_seconds})
+    return results
+
+
+if __name__ == "__main__":
+    from config import DatabaseConfig
+    from connection_pool import DatabasePool
+
+    # Connection settings come from DatabaseConfig (DB_HOST, DB_PORT, ... environment variables)
+    db_config = DatabaseConfig()
+    if not db_config.get_config()['password']:
+        db_config.update_config(password=input("Enter PostgreSQL password: "))
+
+    db_pool = DatabasePool(db_config)
+    try:
+        with db_pool.cursor() as cursor:
+            benchmark_customer_status(cursor)
+    finally:
+        db_pool.close()
@@ -1,71 +1,138 @@
 # db_utils.py - Database utilities and initialization
-import psycopg2
-import psycopg2.extras
 from datetime import datetime, date, timedelta
 import random
-from faker import Faker
+import io
+import itertools
+import os
 import sys
+import time
 
-fake = Faker()
+# The repository root, so the data_insert package shared with the loading scripts imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from data_insert.table_stats import table_counts, invalidate_stats
+from id_allocation import IDENTITY_KEYS, allocate_ids, ensure_identity_keys
+from connection_pool import DatabasePool
+from index_advisor import schema_index_statements
+from advanced_search import search_vector_statements
+from primary_address import PRIMARY_ADDRESS_INDEX_SQL, deferred_primary_address_check
+from schema_migrations import run_migrations
+from customer_status import BENCHMARK_SIZES, customer_status_bulk, benchmark_customer_status
+
+# Load modes for generate_sample_data: 'copy' streams rows with COPY FROM STDIN,
+# 'executemany' keeps the original row-by-row path for benchmarking
+LOAD_MODES = ('copy', 'executemany')
+
+# Rows per in-memory COPY buffer, keeps memory flat for large tables
+COPY_CHUNK_ROWS = 50000
+
+# Sample customer IDs are drawn from FIRST_CUSTOMER_ID onwards, over at least
+# CUSTOMER_ID_SPACE values (the space grows with num_customers)
+FIRST_CUSTOMER_ID = 1000
+CUSTOMER_ID_SPACE = 9000
+
+# Postgres columns loaded by generate_sample_data, in foreign key order
+SAMPLE_DATA_COLUMNS = {
+    'Customer': ['EmployeeID', 'CustomerID', 'Customer_First_Name', 'Customer_Last_Name',
+                 'ssn', 'date_of_birth', 'customer_since'],
+    'Address': ['addressID', 'customer_id', 'street_address', 'city_name',
+                'state', 'zip_code', 'country', 'asress_type', 'is_primary'],
+    'Contact': ['contactID', 'customer_id', 'contact_type', 'contact_value', 'is_primary'],
+    'CustomerDocument': ['document_id', 'customer_id', 'document_type', 'document_number',
+                         'issue_date', 'expiry_date', 'verification_status', 'file_reference'],
+    'CustomerNote': ['note_id', 'customer_id', 'employee_id', 'note_date',
+                     'note_category', 'note_text', 'is_important'],
+    'CustomerSegmentAssignment': ['assignment_id', 'customer_id', 'segment_id', 'assigned_date']
+}
+
+# Postgres column -> generator column where the names differ
+GENERATED_COLUMN_NAMES = {'asress_type': 'address_type'}
+
+
+def _copy_format_value(value):
+    """Format a Python value for PostgreSQL COPY text format"""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    text = str(value)
+    return (text.replace('\\', '\\\\')
+                .replace('\t', '\\t')
+                .replace('\n', '\\n')
+                .replace('\r', '\\r'))
 
 class DatabaseUtils:
-    """Utility functions for database management"""
+    """
+    Utility functions for database management
+    
+    Every operation checks a connection out of a DatabasePool, works on its
+    own cursor and transaction, and hands the connection back, so one
+    DatabaseUtils can be shared between threads.
     
-    def _init_(self, connection_params):
-        self.connection_params = connection_params
-        self.connection = None
-        self.cursor = None
+    Parameters:
+        connection_params (dict): host / port / database / user / password,
+            used to build a pool when none is given
+        pool (DatabasePool): Existing pool to use instead
+    """
+    
+    def __init__(self, connection_params=None, pool=None):
+        self.connection_params = connection_params or {}
+        self.pool = pool
+        self.owns_pool = pool is None
     
     def connect(self):
-        """Establish database connection"""
+        """Open the connection pool (if none was given) and check that the database answers"""
         try:
-            self.connection = psycopg2.connect(**self.connection_params)
-            self.cursor = self.connection.cursor(cursor_factory=psycopg2.extras.DictCursor)
+            if self.pool is None:
+                self.pool = DatabasePool.from_params(**self.connection_params)
+            with self.pool.cursor() as cursor:
+                cursor.execute("SELECT 1")
             return True
         except Exception as e:
             print(f"Connection failed: {e}")
             return False
     
     def disconnect(self):
-        """Close database connection"""
-        if self.cursor:
-            self.cursor.close()
-        if self.connection:
-            self.connection.close()
+        """Close the connection pool if this object opened it"""
+        if self.pool is not None and self.owns_pool:
+            self.pool.close()
+            self.pool = None
     
     def execute_sql_file(self, file_path):
         """Execute SQL commands from a file"""
         try:
             with open(file_path, 'r', encoding='utf-8') as file:
                 sql_commands = file.read()
-                self.cursor.execute(sql_commands)
-                self.connection.commit()
-                print(f"✅ Successfully executed {file_path}")
-                return True
+            with self.pool.cursor() as cursor:
+                cursor.execute(sql_commands)
+            print(f"✅ Successfully executed {file_path}")
+            return True
         except Exception as e:
             print(f"❌ Error executing {file_path}: {e}")
-            self.connection.rollback()
             return False
     
     def check_table_exists(self, table_name):
         """Check if a table exists"""
         try:
-            self.cursor.execute("""
-                SELECT EXISTS (
-                    SELECT FROM information_schema.tables 
-                    WHERE table_schema = 'public' 
-                    AND table_name = %s
-                )
-            """, (table_name.lower(),))
-            return self.cursor.fetchone()[0]
+            with self.pool.cursor() as cursor:
+                cursor.execute("""
+                    SELECT EXISTS (
+                        SELECT FROM information_schema.tables 
+                        WHERE table_schema = 'public' 
+                        AND table_name = %s
+                    )
+                """, (table_name.lower(),))
+                return cursor.fetchone()[0]
         except Exception:
             return False
     
     def get_table_count(self, table_name):
         """Get row count for a table"""
         try:
-            self.cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-            return self.cursor.fetchone()[0]
+            with self.pool.cursor() as cursor:
+                cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
+                return cursor.fetchone()[0]
         except Exception:
             return 0
     
@@ -94,7 +161,7 @@ class DatabaseUtils:
 
         -- Create Address table
         CREATE TABLE Address (
-            addressID INT PRIMARY KEY,
+            addressID INT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
             customer_id INT,
             street_address VARCHAR(255),
             city_name VARCHAR(50),
@@ -108,7 +175,7 @@ class DatabaseUtils:
 
         -- Create Contact table
         CREATE TABLE Contact (
-            contactID INT PRIMARY KEY,
+            contactID INT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
             customer_id INT,
             contact_type VARCHAR(50),
             contact_value VARCHAR(100),
@@ -118,7 +185,7 @@ class DatabaseUtils:
 
         -- Create CustomerDocument table
         CREATE TABLE CustomerDocument (
-            document_id INT PRIMARY KEY,
+            document_id INT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
             customer_id INT,
             document_type VARCHAR(50),
             document_number VARCHAR(50) UNIQUE,
@@ -131,7 +198,7 @@ class DatabaseUtils:
 
         -- Create CustomerNote table
         CREATE TABLE CustomerNote (
-            note_id INT PRIMARY KEY,
+            note_id INT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
             customer_id INT,
             employee_id INT,
             note_date DATE,
@@ -151,7 +218,7 @@ class DatabaseUtils:
 
         -- Create CustomerSegmentAssignment table
         CREATE TABLE CustomerSegmentAssignment (
-            assignment_id INT PRIMARY KEY,
+            assignment_id INT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
             customer_id INT,
             segment_id INT,
             assigned_date DATE,
@@ -161,13 +228,41 @@ class DatabaseUtils:
         """
         
         try:
-            self.cursor.execute(create_sql)
-            self.connection.commit()
+            with self.pool.cursor() as cursor:
+                cursor.execute(create_sql)
+                # Foreign key and report filter indexes, see index_advisor
+                for statement in schema_index_statements():
+                    cursor.execute(statement)
+                # Advanced search columns; cheap while the tables are still empty
+                for statement in search_vector_statements():
+                    cursor.execute(statement)
+                cursor.execute(PRIMARY_ADDRESS_INDEX_SQL)
             print("✅ Tables created successfully")
             return True
         except Exception as e:
             print(f"❌ Error creating tables: {e}")
-            self.connection.rollback()
+            return False
+    
+    def migrate_identity_keys(self):
+        """Turn the surrogate keys of an existing schema into identity columns and sync their sequences"""
+        try:
+            with self.pool.cursor() as cursor:
+                next_keys = ensure_identity_keys(cursor)
+            for table, next_key in next_keys.items():
+                print(f"✅ {table}: next key {next_key}")
+            return True
+        except Exception as e:
+            print(f"❌ Error migrating identity keys: {e}")
+            return False
+    
+    def migrate_schema(self):
+        """Apply the schema migrations (key sequences, indexes, notification triggers, report views)"""
+        try:
+            with self.pool.cursor() as cursor:
+                run_migrations(cursor)
+            return True
+        except Exception as e:
+            print(f"❌ Error migrating schema: {e}")
             return False
     
     def create_segments(self):
@@ -186,281 +281,187 @@ class DatabaseUtils:
         ]
         
         try:
-            for segment in segments:
-                self.cursor.execute("""
+            with self.pool.cursor() as cursor:
+                cursor.executemany("""
                     INSERT INTO CustomerSegment (segment_id, segment_name, description, min_balance_required)
                     VALUES (%s, %s, %s, %s)
                     ON CONFLICT (segment_id) DO NOTHING
-                """, segment)
+                """, segments)
             
-            self.connection.commit()
             print(f"✅ Created {len(segments)} customer segments")
             return True
         except Exception as e:
             print(f"❌ Error creating segments: {e}")
-            self.connection.rollback()
             return False
     
-    def generate_sample_data(self, num_customers=50):
-        """Generate sample data for testing"""
-        print(f"Generating sample data for {num_customers} customers...")
+    def copy_rows(self, cursor, table_name, columns, rows):
+        """Stream rows into a table with COPY FROM STDIN through in-memory buffers
+        
+        Returns the number of rows copied.
+        """
+        copy_sql = f"COPY {table_name} ({', '.join(columns)}) FROM STDIN"
+        rows = iter(rows)
+        total = 0
+        while True:
+            chunk = list(itertools.islice(rows, COPY_CHUNK_ROWS))
+            if not chunk:
+                break
+            buffer = io.StringIO()
+            for row in chunk:
+                buffer.write('\t'.join(_copy_format_value(value) for value in row))
+                buffer.write('\n')
+            buffer.seek(0)
+            cursor.copy_expert(copy_sql, buffer)
+            total += len(chunk)
+        return total
+    
+    def load_rows(self, cursor, table_name, columns, rows, load_mode='copy'):
+        """Load generated rows into a table, report throughput and return the row count"""
+        if load_mode not in LOAD_MODES:
+            raise ValueError(f"Unknown load mode '{load_mode}', expected one of {LOAD_MODES}")
+        
+        started = time.perf_counter()
+        if load_mode == 'copy':
+            row_count = self.copy_rows(cursor, table_name, columns, rows)
+        else:
+            rows = list(rows)
+            placeholders = ', '.join(['%s'] * len(columns))
+            cursor.executemany(
+                f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders})",
+                rows
+            )
+            row_count = len(rows)
+        elapsed = time.perf_counter() - started
+        
+        rate = row_count / elapsed if elapsed > 0 else float('inf')
+        print(f"   {table_name:<25}: {row_count:>8} rows in {elapsed:6.2f}s "
+              f"({rate:,.0f} rows/s, {load_mode})")
+        return row_count
+    
+    def generate_sample_data(self, num_customers=50, load_mode='copy'):
+        """Generate sample data for testing
+        
+        Tables are loaded in foreign key order (Customer, then the child tables;
+        CustomerSegment is seeded beforehand by create_segments). load_mode selects
+        COPY FROM STDIN ('copy') or the executemany fallback ('executemany').
+        """
+        print(f"Generating sample data for {num_customers} customers ({load_mode} mode)...")
+        
+        # Imported here so the rest of the module works without NumPy and Faker installed
+        import numpy as np
+        from data_insert.columnar_generator import generate_tables, iter_rows, rekey_table
+        from data_insert.unique_allocator import allocate
         
         try:
-            # Generate customers
-            customers = []
-            used_ssns = set()
-            used_ids = set()
-            
-            for i in range(num_customers):
-                # Generate unique customer ID
-                while True:
-                    customer_id = random.randint(1000, 9999)
-                    if customer_id not in used_ids:
-                        used_ids.add(customer_id)
-                        break
-                
-                # Generate unique SSN
-                while True:
-                    ssn = f"{random.randint(100, 999)}-{random.randint(10, 99)}-{random.randint(1000, 9999)}"
-                    if ssn not in used_ssns:
-                        used_ssns.add(ssn)
-                        break
-                
-                customer = (
-                    random.randint(1, 10),  # employee_id
-                    customer_id,
-                    fake.first_name(),
-                    fake.last_name(),
-                    ssn,
-                    fake.date_of_birth(minimum_age=18, maximum_age=90),
-                    fake.date_between(start_date='-10y', end_date='today')
-                )
-                customers.append(customer)
-            
-            # Insert customers
-            self.cursor.executemany("""
-                INSERT INTO Customer (EmployeeID, CustomerID, Customer_First_Name, Customer_Last_Name, 
-                                    ssn, date_of_birth, customer_since)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-            """, customers)
-            
-            print(f"✅ Inserted {len(customers)} customers")
-            
-            # Generate addresses
-            addresses = []
-            address_id = 1
-            address_types = ["Home", "Work", "Shipping", "Billing", "Secondary"]
-            countries = ["Israel", "USA", "Canada", "UK", "Australia", "Germany", "France"]
-            
-            for customer in customers:
-                customer_id = customer[1]
-                num_addresses = random.randint(1, 3)
-                
-                for j in range(num_addresses):
-                    address = (
-                        address_id,
-                        customer_id,
-                        fake.street_address(),
-                        fake.city(),
-                        fake.state(),
-                        fake.zipcode(),
-                        random.choice(countries),
-                        random.choice(address_types),
-                        j == 0  # First address is primary
-                    )
-                    addresses.append(address)
-                    address_id += 1
-            
-            self.cursor.executemany("""
-                INSERT INTO Address (addressID, customer_id, street_address, city_name, 
-                                   state, zip_code, country, asress_type, is_primary)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """, addresses)
-            
-            print(f"✅ Inserted {len(addresses)} addresses")
-            
-            # Generate contacts
-            contacts = []
-            contact_id = 1
-            contact_types = ["Email", "Phone", "Mobile", "Work Phone", "Fax"]
-            
-            for customer in customers:
-                customer_id = customer[1]
-                num_contacts = random.randint(1, 3)
-                
-                for j in range(num_contacts):
-                    contact_type = random.choice(contact_types)
-                    
-                    if contact_type == "Email":
-                        value = fake.email()
-                    else:
-                        value = fake.phone_number()
-                    
-                    contact = (
-                        contact_id,
-                        customer_id,
-                        contact_type,
-                        value,
-                        j == 0  # First contact is primary
-                    )
-                    contacts.append(contact)
-                    contact_id += 1
-            
-            self.cursor.executemany("""
-                INSERT INTO Contact (contactID, customer_id, contact_type, contact_value, is_primary)
-                VALUES (%s, %s, %s, %s, %s)
-            """, contacts)
-            
-            print(f"✅ Inserted {len(contacts)} contacts")
-            
-            # Generate documents
-            documents = []
-            document_id = 1
-            document_types = ["Passport", "Driver License", "ID Card", "Birth Certificate", "Social Security Card"]
-            used_doc_numbers = set()
-            
-            for customer in customers:
-                customer_id = customer[1]
-                num_documents = random.randint(1, 3)
-                
-                for j in range(num_documents):
-                    doc_type = random.choice(document_types)
-                    
-                    # Generate unique document number
-                    while True:
-                        doc_num = f"{doc_type[:2].upper()}-{random.randint(100000, 999999)}"
-                        if doc_num not in used_doc_numbers:
-                            used_doc_numbers.add(doc_num)
-                            break
-                    
-                    issue_date = fake.date_between(start_date='-10y', end_date='-1y')
-                    expiry_date = fake.date_between(start_date='+1y', end_date='+10y')
-                    
-                    document = (
-                        document_id,
-                        customer_id,
-                        doc_type,
-                        doc_num,
-                        issue_date,
-                        expiry_date,
-                        random.choice([True, False]),  # verification_status
-                        f"DOC_{customer_id}_{document_id}.pdf"
-                    )
-                    documents.append(document)
-                    document_id += 1
-            
-            self.cursor.executemany("""
-                INSERT INTO CustomerDocument (document_id, customer_id, document_type, 
-                                            document_number, issue_date, expiry_date, 
-                                            verification_status, file_reference)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-            """, documents)
-            
-            print(f"✅ Inserted {len(documents)} documents")
-            
-            # Generate notes
-            notes = []
-            note_id = 1
-            note_categories = ["Inquiry", "Complaint", "Request", "Feedback", "Update", "Alert"]
-            note_templates = [
-                "Customer called about account inquiry.",
-                "Customer visited branch for service request.",
-                "Follow-up needed on customer complaint.",
-                "Customer provided positive feedback.",
-                "Account information updated."
-            ]
-            
-            for customer in customers:
-                customer_id = customer[1]
-                num_notes = random.randint(0, 3)
-                
-                for j in range(num_notes):
-                    note = (
-                        note_id,
-                        customer_id,
-                        random.randint(1, 10),  # employee_id
-                        fake.date_between(start_date='-2y', end_date='today'),
-                        random.choice(note_categories),
-                        random.choice(note_templates),
-                        random.choice([True, False])  # is_important
-                    )
-                    notes.append(note)
-                    note_id += 1
-            
-            self.cursor.executemany("""
-                INSERT INTO CustomerNote (note_id, customer_id, employee_id, note_date, 
-                                        note_category, note_text, is_important)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-            """, notes)
+            # Generate unique customer IDs: a randomly keyed permutation of the
+            # ID space, so no retries and no limit on num_customers
+            id_space = max(CUSTOMER_ID_SPACE, num_customers)
+            customer_ids = FIRST_CUSTOMER_ID + allocate(id_space, np.arange(num_customers),
+                                                        key=random.getrandbits(32))
             
-            print(f"✅ Inserted {len(notes)} notes")
+            # Generate all tables at once as column arrays
+            generated = generate_tables(
+                customer_ids,
+                child_counts={'CustomerDocument': (1, 3), 'CustomerNote': (0, 3)},
+                max_employee_id=10
+            )
             
-            # Generate segment assignments
-            assignments = []
-            assignment_id = 1
+            # The Postgres Customer table also carries the handling employee
+            generated['Customer']['EmployeeID'] = np.random.default_rng().integers(1, 11, num_customers)
             
-            for customer in customers:
-                customer_id = customer[1]
-                segment_id = random.randint(1, 10)
+            # The whole load is one transaction on one pooled connection
+            with self.pool.cursor() as cursor:
+                # Child keys come from the identity sequences, reserved in batches,
+                # so the load never collides with rows other sessions insert
+                for table_name, key_column in IDENTITY_KEYS.items():
+                    table = generated[table_name]
+                    rekey_table(table_name, table, allocate_ids(cursor, table_name, len(table[key_column])))
                 
-                assignment = (
-                    assignment_id,
-                    customer_id,
-                    segment_id,
-                    fake.date_between(start_date='-3y', end_date='today')
-                )
-                assignments.append(assignment)
-                assignment_id += 1
+                # One primary address check for the whole load instead of an index probe per row
+                with deferred_primary_address_check(cursor):
+                    for table_name, columns in SAMPLE_DATA_COLUMNS.items():
+                        source_columns = [GENERATED_COLUMN_NAMES.get(column, column) for column in columns]
+                        row_count = self.load_rows(cursor, table_name, columns,
+                                                   iter_rows(generated[table_name], source_columns),
+                                                   load_mode)
+                        print(f"✅ Inserted {row_count} rows into {table_name}")
             
-            self.cursor.executemany("""
-                INSERT INTO CustomerSegmentAssignment (assignment_id, customer_id, 
-                                                     segment_id, assigned_date)
-                VALUES (%s, %s, %s, %s)
-            """, assignments)
-            
-            print(f"✅ Inserted {len(assignments)} segment assignments")
-            
-            self.connection.commit()
+            invalidate_stats()
             print("✅ Sample data generation completed successfully!")
             return True
             
         except Exception as e:
             print(f"❌ Error generating sample data: {e}")
-            self.connection.rollback()
             return False
     
-    def get_database_summary(self):
-        """Get summary of database contents"""
-        tables = ['Customer', 'Address', 'Contact', 'CustomerDocument', 
-                 'CustomerNote', 'CustomerSegment', 'CustomerSegmentAssignment']
+    def get_database_summary(self, mode='estimate'):
+        """
+        Get summary of database contents
+        
+        Parameters:
+            mode (str): 'estimate' reads planner statistics instantly, 'exact'
+                counts every table in one query; results are cached for a while
+        """
+        with self.pool.cursor() as cursor:
+            counts = table_counts(cursor, mode)
         
-        summary = "DATABASE SUMMARY\n" + "=" * 40 + "\n"
+        summary = f"DATABASE SUMMARY ({mode})\n" + "=" * 40 + "\n"
         
-        for table in tables:
-            if self.check_table_exists(table):
-                count = self.get_table_count(table)
+        for table, count in counts.items():
+            if count is not None:
                 summary += f"{table:<25}: {count:>8} records\n"
             else:
                 summary += f"{table:<25}: Not found\n"
         
         return summary
+    
+    def get_customer_statuses(self, customer_ids=None):
+        """
+        Verification status of many customers, computed by customer_status_bulk in one query
+        
+        Parameters:
+            customer_ids (list): Customers to check; None checks every customer
+        
+        Returns:
+            dict: customer_id -> (status, has_address, has_contact, has_valid_document)
+        """
+        with self.pool.cursor() as cursor:
+            return customer_status_bulk(cursor, customer_ids)
+    
+    def benchmark_customer_status(self, sizes=BENCHMARK_SIZES):
+        """Time per-customer check_customer_status calls against customer_status_bulk"""
+        try:
+            with self.pool.cursor() as cursor:
+                return benchmark_customer_status(cursor, sizes)
+        except Exception as e:
+            print(f"❌ Error benchmarking customer status: {e}")
+            return None
 
-def main():
-    """Main function for database initialization"""
+def main(pool=None):
+    """
+    Main function for database initialization
+    
+    Parameters:
+        pool (DatabasePool): Pool to initialize through (the launcher passes its
+            own); without one, connection details are asked for on the console
+    """
     print("Database Initialization Utility")
     print("=" * 40)
     
-    # Connection parameters
-    connection_params = {
-        'host': 'localhost',
-        'port': '5432',
-        'database': 'postgres',
-        'user': 'postgres',
-        'password': input("Enter PostgreSQL password: ")
-    }
-    
-    # Initialize database utils
-    db_utils = DatabaseUtils(connection_params)
+    if pool is None:
+        # Connection parameters
+        connection_params = {
+            'host': 'localhost',
+            'port': '5432',
+            'database': 'postgres',
+            'user': 'postgres',
+            'password': input("Enter PostgreSQL password: ")
+        }
+        
+        # Initialize database utils
+        db_utils = DatabaseUtils(connection_params)
+    else:
+        db_utils = DatabaseUtils(pool=pool)
     
     if not db_utils.connect():
         print("Failed to connect to database. Exiting.")
@@ -483,15 +484,23 @@ def main():
         
         print("\n3. Generating sample data...")
         num_customers = int(input("Enter number of customers to generate (default: 50): ") or "50")
+        load_mode = input(f"Enter load mode {LOAD_MODES} (default: copy): ").strip() or "copy"
         
-        if db_utils.generate_sample_data(num_customers):
+        if db_utils.generate_sample_data(num_customers, load_mode):
             print("✅ Sample data generated successfully")
         else:
             print("❌ Failed to generate sample data")
             return
         
-        print("\n4. Database summary:")
-        print(db_utils.get_database_summary())
+        print("\n4. Applying schema migrations...")
+        if db_utils.migrate_schema():
+            print("✅ Schema up to date")
+        else:
+            print("❌ Failed to apply schema migrations")
+            return
+        
+        print("\n5. Database summary:")
+        print(db_utils.get_database_summary('exact'))
         
         print("\n✅ Database initialization completed successfully!")
         print("You can now run the GUI application: python customer_db_gui.py")
@@ -0,0 +1,170 @@
+# exporter.py - Stream query results to CSV, gzip CSV or Parquet files
+import datetime
+import decimal
+import gzip
+import os
+import threading
+from psycopg2.extensions import QueryCanceledError, encodings
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+# Export format -> (file type label, file extension)
+EXPORT_FORMATS = {
+    'csv': ("CSV", '.csv'),
+    'csv.gz': ("Compressed CSV", '.csv.gz'),
+    'parquet': ("Parquet", '.parquet')
+}
+
+# Bytes per COPY chunk written to the file
+COPY_CHUNK_BYTES = 1 << 20
+
+# Rows per Parquet row group, and per server-side cursor fetch while writing one
+PARQUET_ROW_GROUP_ROWS = 100000
+
+
+def available_formats():
+    """Export formats that can be written with the installed packages"""
+    return [name for name in EXPORT_FORMATS if name != 'parquet' or PARQUET_AVAILABLE]
+
+
+class ExportProgress:
+    """
+    Rows / bytes written so far, shared between the worker and the Tk thread
+
+    The worker only adds to the counters and checks stop; the Tk thread reads
+    them through status() for the progress window.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.bytes = 0
+        self.stop = threading.Event()
+
+    def check(self):
+        """Worker thread: abort the export if the user cancelled it"""
+        if self.stop.is_set():
+            raise QueryCanceledError("canceling export due to user request")
+
+    def status(self):
+        """Progress text for the progress window"""
+        if self.rows:
+            return f"{self.rows:,} rows written"
+        return f"{self.bytes / (1 << 20):,.1f} MB written"
+
+
+class CopyTarget:
+    """
+    File-like object that COPY TO STDOUT writes into
+
+    psycopg2 hands over raw CSV bytes as they arrive from the server, so rows
+    are never turned into Python objects and only one chunk is in memory.
+    """
+
+    def __init__(self, file, progress):
+        self.file = file
+        self.progress = progress
+
+    def write(self, data):
+        self.progress.check()
+        self.file.write(data)
+        self.progress.bytes += len(data)
+
+
+def export_csv(cursor, sql, params, path, compress=False, progress=None):
+    """
+    Export a query with COPY (...) TO STDOUT as CSV with a header row
+
+    Parameters:
+        cursor: QueryExecutor worker cursor
+        sql (str): SELECT statement to export
+        params (list): Parameters of the statement
+        path (str): Output file
+        compress (bool): Write gzip-compressed CSV
+        progress (ExportProgress): Counters and cancel flag
+
+    Returns:
+        int: Bytes of CSV written (before compression)
+    """
+    progress = progress or ExportProgress()
+    # COPY cannot take bind parameters, so they are inlined with psycopg2's quoting
+    query = cursor.mogrify(sql, params or None).decode(encodings[cursor.connection.encoding])
+    opener = gzip.open if compress else open
+    with opener(path, 'wb') as file:
+        cursor.copy_expert(f"COPY ({query}) TO STDOUT WITH (FORMAT csv, HEADER true)",
+                           CopyTarget(file, progress), size=COPY_CHUNK_BYTES)
+    return progress.bytes
+
+
+def arrow_type(type_code):
+    """Arrow type for a Postgres column type OID; unknown types are exported as text"""
+    types = {
+        16: pa.bool_(),
+        20: pa.int64(), 21: pa.int16(), 23: pa.int32(),
+        700: pa.float32(), 701: pa.float64(), 1700: pa.float64(),
+        1082: pa.date32(), 1114: pa.timestamp('us'), 1184: pa.timestamp('us', tz='UTC')
+    }
+    return types.get(type_code, pa.string())
+
+
+def arrow_value(value, column_type):
+    """Convert one value for an Arrow column of the given type"""
+    if value is None:
+        return None
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if pa.types.is_string(column_type) and not isinstance(value, str):
+        return value.isoformat() if isinstance(value, (datetime.date, datetime.time)) else str(value)
+    return value
+
+
+def export_parquet(cursor, sql, params, path, progress=None, row_group_rows=PARQUET_ROW_GROUP_ROWS):
+    """
+    Export a query to Parquet, one row group per server-side cursor fetch
+
+    Only one row group of rows is held at a time, so memory stays flat no
+    matter how many rows the query returns.
+
+    Returns:
+        int: Rows written
+    """
+    progress = progress or ExportProgress()
+    with cursor.connection.cursor(name='gui_export') as named:
+        named.itersize = row_group_rows
+        named.execute(sql, params or None)
+
+        writer = None
+        try:
+            while True:
+                rows = named.fetchmany(row_group_rows)
+                progress.check()
+                if writer is None:
+                    schema = pa.schema([(column.name, arrow_type(column.type_code))
+                                        for column in named.description])
+                    writer = pq.ParquetWriter(path, schema)
+                if not rows:
+                    break
+                columns = [pa.array([arrow_value(value, field.type) for value in values], type=field.type)
+                           for field, values in zip(schema, zip(*rows))]
+                writer.write_table(pa.Table.from_arrays(columns, schema=schema), row_group_size=row_group_rows)
+                progress.rows += len(rows)
+        finally:
+            if writer is not None:
+                writer.close()
+    return progress.rows
+
+
+def export_query(cursor, sql, params, path, file_format, progress=None):
+    """Worker thread: export a query in one of EXPORT_FORMATS, removing the partial file on failure"""
+    try:
+        if file_format == 'parquet':
+            return export_parquet(cursor, sql, params, path, progress)
+        return export_csv(cursor, sql, params, path, file_format == 'csv.gz', progress)
+    except Exception:
+        if os.path.exists(path):
+            os.remove(path)
+        raise
@@ -1,10 +1,32 @@
 # complete_customer_db_gui.py - Complete Customer Database Management System
 import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog
-import psycopg2
-from psycopg2.extras import DictCursor
+from tkinter import ttk, messagebox, simpledialog, filedialog
 from datetime import datetime, date
 import re
+import os
+import sys
+
+# The repository root, so the data_insert package shared with the loading scripts imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from data_insert.table_stats import table_counts, COVERAGE_METRICS
+from query_executor import QueryExecutor
+from connection_pool import DatabasePool
+from customer_search import IncrementalSearch, SEARCH_LIMIT
+from report_queries import (VALID_DOCUMENTS_SQL, NEW_CUSTOMER_ADDRESSES_SQL, IMPORTANT_NOTES_SQL,
+                            PRIMARY_CONTACTS_SQL, SEGMENT_AGE_SQL, MONTHLY_REGISTRATION_SQL, REPORTS,
+                            SEGMENT_AGE_CACHED_SQL, MONTHLY_REGISTRATION_CACHED_SQL)
+from report_cache import ReportCacheRefresher
+from exporter import EXPORT_FORMATS, ExportProgress, available_formats, export_query
+from report_engine import REPORT_FORMATS, ReportEngine, available_report_formats, write_report
+from advanced_search import SEARCH_SOURCES, build_advanced_search, missing_search_vectors
+from index_advisor import ensure_recommended_indexes, index_report
+from primary_address import describe_error
+from live_updates import ChangeListener
+from schema_migrations import LIVE_UPDATES, MIGRATE_COMMAND, REPORT_CACHE, check_schema
+from maintenance_jobs import MaintenanceJob
+from contact_dedup import ContactDeduplicator, duplicate_report, find_duplicate_contacts
+from virtual_grid import NOT_NULL, KeysetPager, VirtualGrid
+from screen_cache import ScreenCache
 
 class CustomerDatabaseGUI:
     def __init__(self, root):
@@ -13,9 +35,18 @@ class CustomerDatabaseGUI:
         self.root.geometry("1200x800")
         self.root.configure(bg='#f0f0f0')
         
-        # Database connection variables
-        self.connection = None
-        self.cursor = None
+        # Database work runs on the executor's worker thread and connection
+        self.executor = None
+        
+        # Row change notifications keep the cached grids in sync with every client
+        self.change_listener = None
+        self.live_grids = {}
+        
+        # Aggregate reports read materialized views refreshed in the background
+        self.report_cache = None
+        
+        # Screens are built once and hidden / shown on navigation
+        self.screen_cache = ScreenCache(self.root)
         
         # Style configuration
         self.setup_styles()
@@ -35,12 +66,53 @@ class CustomerDatabaseGUI:
         style.map('Custom.TButton', background=[('active', '#4CAF50')])
     
     def clear_screen(self):
-        """Clear all widgets from the screen"""
+        """Hide the cached screens and clear all other widgets from the screen"""
+        self.screen_cache.hide()
         for widget in self.root.winfo_children():
-            widget.destroy()
+            if not self.screen_cache.holds(widget):
+                widget.destroy()
+    
+    def show_screen(self, name, build, refresh=None, tree=None, table=None):
+        """
+        Show a cached screen, building it on first use
+        
+        A screen shown again keeps its rows; refresh() only reloads them when the
+        screen was marked dirty, or when change notifications are not running
+        (so changes made elsewhere cannot have been patched in).
+        
+        Parameters:
+            name (str): Cache key of the screen
+            build (callable): build(frame) creates the widgets and loads the data
+            refresh (callable): Reloads the screen's data
+            tree (str): Attribute holding the screen's Treeview, whose rows count towards the cache limit
+            table (str): Table whose change notifications the screen subscribes to
+        """
+        self.clear_screen()
+        weight = (lambda: len(getattr(self, tree).get_children())) if tree else None
+        on_evict = (lambda: self.unsubscribe_changes(table)) if table else None
+        _, dirty = self.screen_cache.show(name, build, weight=weight, on_evict=on_evict)
+        if refresh is not None and dirty is not None and (dirty or not self.live_updates_running()):
+            refresh()
+    
+    def live_updates_running(self):
+        """True while change notifications keep the grids current"""
+        return self.change_listener is not None and self.change_listener.active
     
     def show_login_screen(self):
         """Screen 1: Login Screen"""
+        # Disconnect: stop the background work, then the worker and its connections
+        if self.report_cache is not None:
+            self.report_cache.stop()
+            self.report_cache = None
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+        if self.change_listener is not None:
+            self.change_listener.stop()
+            self.change_listener = None
+        
+        self.screen_cache.clear()
+        self.live_grids = {}
         self.clear_screen()
         
         # Main frame
@@ -105,33 +177,68 @@ class CustomerDatabaseGUI:
     
     def connect_database(self):
         """Connect to PostgreSQL database"""
-        try:
-            self.connection = psycopg2.connect(
-                host=self.host_entry.get(),
-                port=self.port_entry.get(),
-                database=self.database_entry.get(),
-                user=self.username_entry.get(),
-                password=self.password_entry.get()
-            )
-            self.cursor = self.connection.cursor(cursor_factory=DictCursor)
-            
+        connect_params = {
+            'host': self.host_entry.get(),
+            'port': self.port_entry.get(),
+            'database': self.database_entry.get(),
+            'user': self.username_entry.get(),
+            'password': self.password_entry.get()
+        }
+        # Connections are opened on first use by the worker, never on the Tk thread
+        executor = QueryExecutor(self.root, DatabasePool.from_params(pool_min_size=0, **connect_params))
+        
+        def work(cursor):
             # Test connection
-            self.cursor.execute("SELECT version();")
-            version = self.cursor.fetchone()[0]
-            
+            cursor.execute("SELECT version();")
+            return cursor.fetchone()[0]
+        
+        def connected(version):
+            self.executor = executor
             messagebox.showinfo("Success", f"Connected successfully!\n\nDatabase: {version[:50]}...")
             self.show_main_menu()
             
-        except Exception as e:
+            # Schema upgrades are applied by an administrator (schema_migrations.py); at login
+            # the schema is only read and compared with what they would produce
+            def schema_checked(problems):
+                if problems:
+                    details = "\n".join(f"• {feature}: {problem}" for feature, problem in problems.items())
+                    messagebox.showwarning("Database Schema", f"The database schema is not up to date:\n\n{details}\n\n"
+                                           f"Ask an administrator to run:\n{MIGRATE_COMMAND}")
+                
+                # Triggers publish changed keys; the listener patches the open grid from them
+                if LIVE_UPDATES not in problems:
+                    self.change_listener = ChangeListener(self.root, executor.connect_params)
+                    for table, grid in self.live_grids.items():
+                        self.change_listener.subscribe(table, grid.apply_changes)
+                    self.change_listener.start()
+                    # Grids loaded before the listener started may have missed changes
+                    self.screen_cache.mark_dirty(exclude=self.screen_cache.current)
+                
+                # Segment age and monthly registration reports read from materialized views
+                if REPORT_CACHE not in problems:
+                    self.report_cache = ReportCacheRefresher(executor.db_pool)
+                    self.report_cache.start(refresh_now=True)
+            
+            executor.submit(check_schema, on_success=schema_checked, description="Checking database schema...",
+                            on_error=lambda e: print(f"⚠️ Could not check the database schema: {e}"),
+                            background=True)
+        
+        def failed(e):
+            executor.shutdown()
             messagebox.showerror("Connection Error", f"Failed to connect to database:\n\n{str(e)}")
             self.status_label.config(text="Connection failed. Please check credentials.", fg='red')
+        
+        self.status_label.config(text="Connecting...", fg='#7f8c8d')
+        executor.submit(work, on_success=connected, on_error=failed, description="Connecting...")
     
     def show_main_menu(self):
         """Screen 2: Main Menu Screen"""
-        self.clear_screen()
-        
+        self.show_screen('main_menu', self.build_main_menu)
+    
+    def build_main_menu(self, screen):
+        """Build the main menu into its cached frame"""
         # Header
-        header_frame = tk.Frame(self.root, bg='#34495e', height=80)
+        header_frame = tk.Frame(screen, bg='#34495e', height=80)
         header_frame.pack(fill='x')
         header_frame.pack_propagate(False)
         
@@ -140,7 +247,7 @@ class CustomerDatabaseGUI:
         title_label.pack(expand=True)
         
         # Main content
-        content_frame = tk.Frame(self.root, bg='#ecf0f1', padx=50, pady=30)
+        content_frame = tk.Frame(screen, bg='#ecf0f1', padx=50, pady=30)
         content_frame.pack(fill='both', expand=True)
         
         # Welcome message
@@ -175,13 +282,16 @@ class CustomerDatabaseGUI:
     
     def show_customer_management(self):
         """Screen 3: Customer Management (CRUD for Customer table)"""
-        self.clear_screen()
-        
+        self.show_screen('customers', self.build_customer_management, refresh=self.refresh_customers,
+                         tree='customer_tree', table='Customer')
+    
+    def build_customer_management(self, screen):
+        """Build the customer management screen into its cached frame"""
         # Header
-        self.create_header("Customer Management")
+        self.create_header(screen, "Customer Management")
         
         # Main content
-        content_frame = tk.Frame(self.root, bg='#ecf0f1', padx=20, pady=20)
+        content_frame = tk.Frame(screen, bg='#ecf0f1', padx=20, pady=20)
         content_frame.pack(fill='both', expand=True)
         
         # Buttons frame
@@ -197,11 +307,21 @@ class CustomerDatabaseGUI:
                  bg='#e74c3c', fg='white', font=('Arial', 10, 'bold')).pack(side='left', padx=5)
         tk.Button(buttons_frame, text="🔄 Refresh", command=self.refresh_customers,
                  bg='#3498db', fg='white', font=('Arial', 10, 'bold')).pack(side='left', padx=5)
-        tk.Button(buttons_frame, text="🔍 Search", command=self.search_customers,
-                 bg='#9b59b6', fg='white', font=('Arial', 10, 'bold')).pack(side='left', padx=5)
         tk.Button(buttons_frame, text="⬅️ Back", command=self.show_main_menu,
                  bg='#95a5a6', fg='white', font=('Arial', 10, 'bold')).pack(side='right', padx=5)
         
+        # Search as you type: name, customer ID or SSN
+        search_frame = tk.Frame(content_frame, bg='#ecf0f1')
+        search_frame.pack(fill='x', pady=(0, 10))
+        
+        tk.Label(search_frame, text="🔍 Search:", font=('Arial', 10, 'bold'),
+                bg='#ecf0f1', fg='#2c3e50').pack(side='left', padx=5)
+        search_entry = tk.Entry(search_frame, font=('Arial', 11), width=40)
+        search_entry.pack(side='left', padx=5)
+        self.search_status = tk.Label(search_frame, text="Name, customer ID or SSN",
+                                     font=('Arial', 9), bg='#ecf0f1', fg='#7f8c8d')
+        self.search_status.pack(side='left', padx=10)
+        
         # Treeview for customers
         tree_frame = tk.Frame(content_frame)
         tree_frame.pack(fill='both', expand=True)
@@ -232,18 +352,29 @@ class CustomerDatabaseGUI:
         v_scrollbar.pack(side='right', fill='y')
         h_scrollbar.pack(side='bottom', fill='x')
         
+        # Rows are loaded a page at a time as the user scrolls
+        self.customer_grid = VirtualGrid(self.customer_tree, v_scrollbar, self.customer_pager(), self.executor)
+        self.customer_search = IncrementalSearch(search_entry, self.executor,
+                                                 on_results=self.show_search_results,
+                                                 on_clear=self.clear_search,
+                                                 on_status=lambda text: self.search_status.config(text=text))
+        self.subscribe_changes('Customer', self.customer_grid)
+        
         # Load customer data
         self.refresh_customers()
     
     def show_address_management(self):
         """Screen 4: Address Management (CRUD for Address table)"""
-        self.clear_screen()
-        
+        self.show_screen('addresses', self.build_address_management, refresh=self.refresh_addresses,
+                         tree='address_tree', table='Address')
+    
+    def build_address_management(self, screen):
+        """Build the address management screen into its cached frame"""
         # Header
-        self.create_header("Address Management")
+        self.create_header(screen, "Address Management")
         
         # Main content
-        content_frame = tk.Frame(self.root, bg='#ecf0f1', padx=20, pady=20)
+        content_frame = tk.Frame(screen, bg='#ecf0f1', padx=20, pady=20)
         content_frame.pack(fill='both', expand=True)
         
         # Buttons frame
@@ -292,18 +423,26 @@ class CustomerDatabaseGUI:
         v_scrollbar.pack(side='right', fill='y')
         h_scrollbar.pack(side='bottom', fill='x')
         
+        # Rows are loaded a page at a time as the user scrolls
+        self.address_grid = VirtualGrid(self.address_tree, v_scrollbar, self.address_pager(), self.executor,
+                                        format_row=self.format_address_row)
+        self.subscribe_changes('Address', self.address_grid)
+        
         # Load address data
         self.refresh_addresses()
     
     def show_segment_management(self):
         """Screen 5: Segment Management (CRUD for CustomerSegmentAssignment - linking table)"""
-        self.clear_screen()
-        
+        self.show_screen('segments', self.build_segment_management, refresh=self.refresh_segment_assignments,
+                         tree='segment_tree', table='CustomerSegmentAssignment')
+    
+    def build_segment_management(self, screen):
+        """Build the customer segment management screen into its cached frame"""
         # Header
-        self.create_header("Customer Segment Management")
+        self.create_header(screen, "Customer Segment Management")
         
         # Main content
-        content_frame = tk.Frame(self.root, bg='#ecf0f1', padx=20, pady=20)
+        content_frame = tk.Frame(screen, bg='#ecf0f1', padx=20, pady=20)
         content_frame.pack(fill='both', expand=True)
         
         # Buttons frame
@@ -352,18 +491,25 @@ class CustomerDatabaseGUI:
         v_scrollbar.pack(side='right', fill='y')
         h_scrollbar.pack(side='bottom', fill='x')
         
+        # Rows are loaded a page at a time as the user scrolls
+        self.segment_grid = VirtualGrid(self.segment_tree, v_scrollbar, self.segment_assignment_pager(),
+                                        self.executor)
+        self.subscribe_changes('CustomerSegmentAssignment', self.segment_grid)
+        
         # Load segment assignment data
         self.refresh_segment_assignments()
     
     def show_reports_screen(self):
         """Screen 6: Reports and Queries (From part 2)"""
-        self.clear_screen()
-        
+        self.show_screen('reports', self.build_reports_screen)
+    
+    def build_reports_screen(self, screen):
+        """Build the reports & database queries screen into its cached frame"""
         # Header
-        self.create_header("Reports & Database Queries")
+        self.create_header(screen, "Reports & Database Queries")
         
         # Main content
-        content_frame = tk.Frame(self.root, bg='#ecf0f1', padx=20, pady=20)
+        content_frame = tk.Frame(screen, bg='#ecf0f1', padx=20, pady=20)
         content_frame.pack(fill='both', expand=True)
         
         # Left panel for query buttons
@@ -383,6 +529,8 @@ class CustomerDatabaseGUI:
             ("👥 Customer Segment Age Analysis", self.query_segment_age_analysis),
             ("📅 Monthly Customer Registration", self.query_monthly_registration),
             ("📊 Database Statistics", self.show_database_stats),
+            ("🔢 Exact Record Counts", lambda: self.show_database_stats('exact')),
+            ("🔄 Refresh Report Cache", self.refresh_report_cache),
             ("🔧 Database Functions", self.show_database_functions)
         ]
         
@@ -415,25 +563,32 @@ class CustomerDatabaseGUI:
         
         # Initial message
         self.results_text.insert('1.0', "Select a report from the left panel to view results...\n\n")
+        
+        # Database function buttons appear here
+        self.function_buttons = tk.Frame(screen)
+        self.function_buttons.pack(pady=10)
     
     def show_database_operations(self):
         """Additional screen for database operations"""
-        self.clear_screen()
-        
+        self.show_screen('operations', self.build_database_operations)
+    
+    def build_database_operations(self, screen):
+        """Build the database operations screen into its cached frame"""
         # Header
-        self.create_header("Database Operations")
+        self.create_header(screen, "Database Operations")
         
         # Main content
-        content_frame = tk.Frame(self.root, bg='#ecf0f1', padx=20, pady=20)
+        content_frame = tk.Frame(screen, bg='#ecf0f1', padx=20, pady=20)
         content_frame.pack(fill='both', expand=True)
         
         # Operations buttons
         operations = [
             ("📊 Database Summary", self.show_db_summary),
             ("🔄 Refresh All Data", self.refresh_all_data),
-            ("📋 Export Customer List", self.export_customers),
+            ("💾 Export Data", self.export_data),
             ("🔍 Advanced Search", self.advanced_search),
             ("📈 Generate Report", self.generate_report),
+            ("🧭 Index Advisor", self.show_index_advisor),
             ("⬅️ Back to Main Menu", self.show_main_menu)
         ]
         
@@ -443,9 +598,9 @@ class CustomerDatabaseGUI:
                            width=30, height=2, cursor='hand2')
             btn.pack(pady=10)
     
-    def create_header(self, title):
+    def create_header(self, parent, title):
         """Create consistent header for screens"""
-        header_frame = tk.Frame(self.root, bg='#34495e', height=60)
+        header_frame = tk.Frame(parent, bg='#34495e', height=60)
         header_frame.pack(fill='x')
         header_frame.pack_propagate(False)
         
@@ -453,33 +608,47 @@ class CustomerDatabaseGUI:
                               font=('Arial', 16, 'bold'), fg='white', bg='#34495e')
         title_label.pack(expand=True)
     
+    @staticmethod
+    def loaded_message(count, grid, noun):
+        """Status text for the first page shown in a virtual grid"""
+        if grid.has_after:
+            return f"Loaded first {count} {noun} (more load as you scroll)"
+        return f"Loaded {count} {noun}"
+    
     # CRUD Operations for Customer
+    def customer_pager(self, where=None, params=()):
+        """Keyset pager over customers ordered by CustomerID"""
+        return KeysetPager("""
+            SELECT EmployeeID, CustomerID, Customer_First_Name, Customer_Last_Name, 
+                   ssn, date_of_birth, customer_since 
+            FROM Customer
+        """, [('CustomerID', 'ASC', 1, NOT_NULL)], where, params)
+    
+    def subscribe_changes(self, table, grid):
+        """Patch grid from the change notifications of table while its screen is cached"""
+        self.live_grids[table] = grid
+        if self.change_listener is not None:
+            self.change_listener.subscribe(table, grid.apply_changes)
+    
+    def unsubscribe_changes(self, table):
+        """Stop patching the grid of a screen that was evicted from the cache"""
+        self.live_grids.pop(table, None)
+        if self.change_listener is not None:
+            self.change_listener.unsubscribe(table)
+    
+    def reload_unless_live(self, refresh):
+        """After a change: the listener patches the grid, so only reload when it is not running"""
+        if self.change_listener is None or not self.change_listener.active:
+            refresh()
+    
     def refresh_customers(self):
-        """Load all customers into the treeview"""
-        try:
-            # Clear existing data
-            for item in self.customer_tree.get_children():
-                self.customer_tree.delete(item)
-            
-            # Fetch customers
-            self.cursor.execute("""
-                SELECT EmployeeID, CustomerID, Customer_First_Name, Customer_Last_Name, 
-                       ssn, date_of_birth, customer_since 
-                FROM Customer 
-                ORDER BY CustomerID
-            """)
-            
-            customers = self.cursor.fetchall()
-            
-            # Insert into treeview
-            for customer in customers:
-                self.customer_tree.insert('', 'end', values=customer)
-                
+        """Load customers into the treeview, one page at a time"""
+        def loaded(count):
             # Update status
-            messagebox.showinfo("Success", f"Loaded {len(customers)} customers")
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load customers: {str(e)}")
+            messagebox.showinfo("Success", self.loaded_message(count, self.customer_grid, "customers"))
+        
+        self.customer_grid.reset(self.customer_pager(), on_loaded=loaded,
+                                 on_error=lambda e: messagebox.showerror("Error", f"Failed to load customers: {str(e)}"))
     
     def add_customer(self):
         """Add new customer"""
@@ -487,21 +656,20 @@ class CustomerDatabaseGUI:
         self.root.wait_window(dialog.dialog)
         
         if dialog.result:
-            try:
+            def work(cursor):
                 # Insert new customer
-                self.cursor.execute("""
+                cursor.execute("""
                     INSERT INTO Customer (EmployeeID, CustomerID, Customer_First_Name, 
                                         Customer_Last_Name, ssn, date_of_birth, customer_since)
                     VALUES (%s, %s, %s, %s, %s, %s, %s)
                 """, dialog.result)
-                
-                self.connection.commit()
+            
+            def done(_):
                 messagebox.showinfo("Success", "Customer added successfully!")
-                self.refresh_customers()
-                
-            except Exception as e:
-                self.connection.rollback()
-                messagebox.showerror("Error", f"Failed to add customer: {str(e)}")
+                self.reload_unless_live(self.refresh_customers)
+            
+            self.executor.submit(work, on_success=done, description="Adding customer...",
+                                 on_error=lambda e: messagebox.showerror("Error", f"Failed to add customer: {str(e)}"))
     
     def edit_customer(self):
         """Edit selected customer"""
@@ -518,22 +686,21 @@ class CustomerDatabaseGUI:
         self.root.wait_window(dialog.dialog)
         
         if dialog.result:
-            try:
+            def work(cursor):
                 # Update customer
-                self.cursor.execute("""
+                cursor.execute("""
                     UPDATE Customer 
                     SET EmployeeID = %s, Customer_First_Name = %s, Customer_Last_Name = %s,
                         ssn = %s, date_of_birth = %s, customer_since = %s
                     WHERE CustomerID = %s
                 """, dialog.result[:-1] + [customer_data[1]])  # Exclude CustomerID from update, use for WHERE
-                
-                self.connection.commit()
+            
+            def done(_):
                 messagebox.showinfo("Success", "Customer updated successfully!")
-                self.refresh_customers()
-                
-            except Exception as e:
-                self.connection.rollback()
-                messagebox.showerror("Error", f"Failed to update customer: {str(e)}")
+                self.reload_unless_live(self.refresh_customers)
+            
+            self.executor.submit(work, on_success=done, description="Updating customer...",
+                                 on_error=lambda e: messagebox.showerror("Error", f"Failed to update customer: {str(e)}"))
     
     def delete_customer(self):
         """Delete selected customer"""
@@ -550,107 +717,78 @@ class CustomerDatabaseGUI:
         # Confirm deletion
         if messagebox.askyesno("Confirm Delete", 
                               f"Are you sure you want to delete customer:\n{customer_name} (ID: {customer_id})?\n\nThis will also delete all related records."):
-            try:
-                self.cursor.execute("DELETE FROM Customer WHERE CustomerID = %s", (customer_id,))
-                self.connection.commit()
+            def work(cursor):
+                cursor.execute("DELETE FROM Customer WHERE CustomerID = %s", (customer_id,))
+            
+            def done(_):
                 messagebox.showinfo("Success", "Customer deleted successfully!")
-                self.refresh_customers()
-                
-            except Exception as e:
-                self.connection.rollback()
-                messagebox.showerror("Error", f"Failed to delete customer: {str(e)}")
-    
-    def search_customers(self):
-        """Search customers"""
-        search_term = simpledialog.askstring("Search Customers", 
-                                            "Enter customer name, ID, or SSN:")
-        if search_term:
-            try:
-                # Clear existing data
-                for item in self.customer_tree.get_children():
-                    self.customer_tree.delete(item)
-                
-                # Search customers
-                self.cursor.execute("""
-                    SELECT EmployeeID, CustomerID, Customer_First_Name, Customer_Last_Name, 
-                           ssn, date_of_birth, customer_since 
-                    FROM Customer 
-                    WHERE Customer_First_Name ILIKE %s 
-                       OR Customer_Last_Name ILIKE %s 
-                       OR CAST(CustomerID AS TEXT) LIKE %s
-                       OR ssn LIKE %s
-                    ORDER BY CustomerID
-                """, (f'%{search_term}%', f'%{search_term}%', f'%{search_term}%', f'%{search_term}%'))
-                
-                customers = self.cursor.fetchall()
-                
-                # Insert search results
-                for customer in customers:
-                    self.customer_tree.insert('', 'end', values=customer)
-                
-                messagebox.showinfo("Search Results", f"Found {len(customers)} customers matching '{search_term}'")
-                
-            except Exception as e:
-                messagebox.showerror("Error", f"Search failed: {str(e)}")
+                self.reload_unless_live(self.refresh_customers)
+            
+            self.executor.submit(work, on_success=done, description="Deleting customer...",
+                                 on_error=lambda e: messagebox.showerror("Error", f"Failed to delete customer: {str(e)}"))
+    
+    def clear_search(self):
+        """Go back to the full, paged customer list when the search box is emptied"""
+        self.customer_grid.reset(self.customer_pager(),
+                                 on_loaded=lambda count: self.search_status.config(
+                                     text=self.loaded_message(count, self.customer_grid, "customers")))
+    
+    def show_search_results(self, rows, term, elapsed_ms):
+        """Show ranked search matches in the customer grid"""
+        self.customer_grid.show_rows(rows)
+        more = "+" if len(rows) == SEARCH_LIMIT else ""
+        self.search_status.config(text=f"{len(rows)}{more} matches for '{term}' ({elapsed_ms:.0f} ms)")
     
     # CRUD Operations for Address
+    def address_pager(self):
+        """Keyset pager over addresses with customer names, ordered by customer"""
+        # The inner join leaves no NULL customer_id, so pages are range scans of address_keyset_idx
+        return KeysetPager("""
+            SELECT a.addressID, a.customer_id, 
+                   CONCAT(c.Customer_First_Name, ' ', c.Customer_Last_Name) as customer_name,
+                   a.street_address, a.city_name, a.state, a.zip_code, 
+                   a.country, a.address_type, a.is_primary
+            FROM Address a
+            JOIN Customer c ON a.customer_id = c.CustomerID
+        """, [('a.customer_id', 'ASC', 1, NOT_NULL), ('a.addressID', 'ASC', 0, NOT_NULL)])
+    
+    @staticmethod
+    def format_address_row(address):
+        """Treeview values for an address row"""
+        values = list(address)
+        values[-1] = "Yes" if values[-1] else "No"  # Convert boolean to text
+        return values
+    
     def refresh_addresses(self):
-        """Load all addresses with customer names"""
-        try:
-            # Clear existing data
-            for item in self.address_tree.get_children():
-                self.address_tree.delete(item)
-            
-            # Fetch addresses with customer names
-            self.cursor.execute("""
-                SELECT a.addressID, a.customer_id, 
-                       CONCAT(c.Customer_First_Name, ' ', c.Customer_Last_Name) as customer_name,
-                       a.street_address, a.city_name, a.state, a.zip_code, 
-                       a.country, a.address_type, a.is_primary
-                FROM Address a
-                JOIN Customer c ON a.customer_id = c.CustomerID
-                ORDER BY a.customer_id, a.addressID
-            """)
-            
-            addresses = self.cursor.fetchall()
-            
-            # Insert into treeview
-            for address in addresses:
-                values = list(address)
-                values[-1] = "Yes" if values[-1] else "No"  # Convert boolean to text
-                self.address_tree.insert('', 'end', values=values)
-                
-            messagebox.showinfo("Success", f"Loaded {len(addresses)} addresses")
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load addresses: {str(e)}")
+        """Load addresses with customer names, one page at a time"""
+        def loaded(count):
+            messagebox.showinfo("Success", self.loaded_message(count, self.address_grid, "addresses"))
+        
+        self.address_grid.reset(self.address_pager(), on_loaded=loaded,
+                                on_error=lambda e: messagebox.showerror("Error", f"Failed to load addresses: {str(e)}"))
     
     def add_address(self):
         """Add new address"""
-        dialog = AddressDialog(self.root, "Add Address", self.cursor)
+        dialog = AddressDialog(self.root, "Add Address", self.executor)
         self.root.wait_window(dialog.dialog)
         
         if dialog.result:
-            try:
-                # Generate new address ID
-                self.cursor.execute("SELECT COALESCE(MAX(addressID), 0) + 1 FROM Address")
-                new_id = self.cursor.fetchone()[0]
-                
-                # Insert new address
-                address_data = [new_id] + dialog.result
-                self.cursor.execute("""
-                    INSERT INTO Address (addressID, customer_id, street_address, city_name, 
+            def work(cursor):
+                # Insert new address; the identity column assigns its ID
+                cursor.execute("""
+                    INSERT INTO Address (customer_id, street_address, city_name, 
                                        state, zip_code, country, address_type, is_primary)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """, address_data)
-                
-                self.connection.commit()
-                messagebox.showinfo("Success", "Address added successfully!")
-                self.refresh_addresses()
-                
-            except Exception as e:
-                self.connection.rollback()
-                messagebox.showerror("Error", f"Failed to add address: {str(e)}")
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                    RETURNING addressID
+                """, dialog.result)
+                return cursor.fetchone()[0]
+            
+            def done(new_id):
+                messagebox.showinfo("Success", f"Address {new_id} added successfully!")
+                self.reload_unless_live(self.refresh_addresses)
+            
+            self.executor.submit(work, on_success=done, description="Adding address...",
+                                 on_error=lambda e: messagebox.showerror("Error", f"Failed to add address: {describe_error(e)}"))
     
     def edit_address(self):
         """Edit selected address"""
@@ -663,26 +801,25 @@ class CustomerDatabaseGUI:
         item = self.address_tree.item(selection[0])
         address_data = item['values']
         
-        dialog = AddressDialog(self.root, "Edit Address", self.cursor, address_data)
+        dialog = AddressDialog(self.root, "Edit Address", self.executor, address_data)
         self.root.wait_window(dialog.dialog)
         
         if dialog.result:
-            try:
+            def work(cursor):
                 # Update address
-                self.cursor.execute("""
+                cursor.execute("""
                     UPDATE Address 
                     SET customer_id = %s, street_address = %s, city_name = %s,
                         state = %s, zip_code = %s, country = %s, address_type = %s, is_primary = %s
                     WHERE addressID = %s
                 """, dialog.result + [address_data[0]])
-                
-                self.connection.commit()
+            
+            def done(_):
                 messagebox.showinfo("Success", "Address updated successfully!")
-                self.refresh_addresses()
-                
-            except Exception as e:
-                self.connection.rollback()
-                messagebox.showerror("Error", f"Failed to update address: {str(e)}")
+                self.reload_unless_live(self.refresh_addresses)
+            
+            self.executor.submit(work, on_success=done, description="Updating address...",
+                                 on_error=lambda e: messagebox.showerror("Error", f"Failed to update address: {describe_error(e)}"))
     
     def delete_address(self):
         """Delete selected address"""
@@ -699,71 +836,59 @@ class CustomerDatabaseGUI:
         # Confirm deletion
         if messagebox.askyesno("Confirm Delete", 
                               f"Are you sure you want to delete address:\n{address_info} (ID: {address_id})?"):
-            try:
-                self.cursor.execute("DELETE FROM Address WHERE addressID = %s", (address_id,))
-                self.connection.commit()
+            def work(cursor):
+                cursor.execute("DELETE FROM Address WHERE addressID = %s", (address_id,))
+            
+            def done(_):
                 messagebox.showinfo("Success", "Address deleted successfully!")
-                self.refresh_addresses()
-                
-            except Exception as e:
-                self.connection.rollback()
-                messagebox.showerror("Error", f"Failed to delete address: {str(e)}")
+                self.reload_unless_live(self.refresh_addresses)
+            
+            self.executor.submit(work, on_success=done, description="Deleting address...",
+                                 on_error=lambda e: messagebox.showerror("Error", f"Failed to delete address: {str(e)}"))
     
     # CRUD Operations for Customer Segment Assignment
+    def segment_assignment_pager(self):
+        """Keyset pager over segment assignments, newest first per customer"""
+        # Pages start at the key's customer in segment_assignment_keyset_idx; assigned_date may be NULL
+        return KeysetPager("""
+            SELECT csa.assignment_id, csa.customer_id, 
+                   CONCAT(c.Customer_First_Name, ' ', c.Customer_Last_Name) as customer_name,
+                   csa.segment_id, cs.segment_name, csa.assigned_date, cs.min_balance_required
+            FROM CustomerSegmentAssignment csa
+            JOIN Customer c ON csa.customer_id = c.CustomerID
+            JOIN CustomerSegment cs ON csa.segment_id = cs.segment_id
+        """, [('csa.customer_id', 'ASC', 1, NOT_NULL), ('csa.assigned_date', 'DESC', 5),
+              ('csa.assignment_id', 'ASC', 0, NOT_NULL)])
+    
     def refresh_segment_assignments(self):
-        """Load all segment assignments"""
-        try:
-            # Clear existing data
-            for item in self.segment_tree.get_children():
-                self.segment_tree.delete(item)
-            
-            # Fetch segment assignments with customer and segment names
-            self.cursor.execute("""
-                SELECT csa.assignment_id, csa.customer_id, 
-                       CONCAT(c.Customer_First_Name, ' ', c.Customer_Last_Name) as customer_name,
-                       csa.segment_id, cs.segment_name, csa.assigned_date, cs.min_balance_required
-                FROM CustomerSegmentAssignment csa
-                JOIN Customer c ON csa.customer_id = c.CustomerID
-                JOIN CustomerSegment cs ON csa.segment_id = cs.segment_id
-                ORDER BY csa.customer_id, csa.assigned_date DESC
-            """)
-            
-            assignments = self.cursor.fetchall()
-            
-            # Insert into treeview
-            for assignment in assignments:
-                self.segment_tree.insert('', 'end', values=assignment)
-                
-            messagebox.showinfo("Success", f"Loaded {len(assignments)} segment assignments")
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load segment assignments: {str(e)}")
+        """Load segment assignments with customer and segment names, one page at a time"""
+        def loaded(count):
+            messagebox.showinfo("Success", self.loaded_message(count, self.segment_grid, "segment assignments"))
+        
+        self.segment_grid.reset(self.segment_assignment_pager(), on_loaded=loaded,
+                                on_error=lambda e: messagebox.showerror("Error", f"Failed to load segment assignments: {str(e)}"))
     
     def assign_segment(self):
         """Assign customer to segment"""
-        dialog = SegmentAssignmentDialog(self.root, "Assign Customer to Segment", self.cursor)
+        dialog = SegmentAssignmentDialog(self.root, "Assign Customer to Segment", self.executor)
         self.root.wait_window(dialog.dialog)
         
         if dialog.result:
-            try:
-                # Generate new assignment ID
-                self.cursor.execute("SELECT COALESCE(MAX(assignment_id), 0) + 1 FROM CustomerSegmentAssignment")
-                new_id = self.cursor.fetchone()[0]
-                
-                # Insert new assignment
-                assignment_data = [new_id] + dialog.result
-                self.cursor.execute("""
-                    INSERT INTO CustomerSegmentAssignment (assignment_id, customer_id, segment_id, assigned_date)
-                    VALUES (%s, %s, %s, %s)
-                """, assignment_data)
-                
-                self.connection.commit()
-                messagebox.showinfo("Success", "Customer assigned to segment successfully!")
-                self.refresh_segment_assignments()
-                
-            except Exception as e:
-                self.connection.rollback()
-                messagebox.showerror("Error", f"Failed to assign segment: {str(e)}")
+            def work(cursor):
+                # Insert new assignment; the identity column assigns its ID
+                cursor.execute("""
+                    INSERT INTO CustomerSegmentAssignment (customer_id, segment_id, assigned_date)
+                    VALUES (%s, %s, %s)
+                    RETURNING assignment_id
+                """, dialog.result)
+                return cursor.fetchone()[0]
+            
+            def done(new_id):
+                messagebox.showinfo("Success", f"Customer assigned to segment successfully! (Assignment {new_id})")
+                self.reload_unless_live(self.refresh_segment_assignments)
+            
+            self.executor.submit(work, on_success=done, description="Assigning segment...",
+                                 on_error=lambda e: messagebox.showerror("Error", f"Failed to assign segment: {str(e)}"))
     
     def update_segment_assignment(self):
         """Update selected segment assignment"""
@@ -776,25 +901,24 @@ class CustomerDatabaseGUI:
         item = self.segment_tree.item(selection[0])
         assignment_data = item['values']
         
-        dialog = SegmentAssignmentDialog(self.root, "Update Segment Assignment", self.cursor, assignment_data)
+        dialog = SegmentAssignmentDialog(self.root, "Update Segment Assignment", self.executor, assignment_data)
         self.root.wait_window(dialog.dialog)
         
         if dialog.result:
-            try:
+            def work(cursor):
                 # Update assignment
-                self.cursor.execute("""
+                cursor.execute("""
                     UPDATE CustomerSegmentAssignment 
                     SET customer_id = %s, segment_id = %s, assigned_date = %s
                     WHERE assignment_id = %s
                 """, dialog.result + [assignment_data[0]])
-                
-                self.connection.commit()
+            
+            def done(_):
                 messagebox.showinfo("Success", "Segment assignment updated successfully!")
-                self.refresh_segment_assignments()
-                
-            except Exception as e:
-                self.connection.rollback()
-                messagebox.showerror("Error", f"Failed to update assignment: {str(e)}")
+                self.reload_unless_live(self.refresh_segment_assignments)
+            
+            self.executor.submit(work, on_success=done, description="Updating assignment...",
+                                 on_error=lambda e: messagebox.showerror("Error", f"Failed to update assignment: {str(e)}"))
     
     def remove_segment_assignment(self):
         """Remove selected segment assignment"""
@@ -812,282 +936,174 @@ class CustomerDatabaseGUI:
         # Confirm removal
         if messagebox.askyesno("Confirm Remove", 
                               f"Remove segment assignment:\n{customer_name} from {segment_name}?"):
-            try:
-                self.cursor.execute("DELETE FROM CustomerSegmentAssignment WHERE assignment_id = %s", (assignment_id,))
-                self.connection.commit()
+            def work(cursor):
+                cursor.execute("DELETE FROM CustomerSegmentAssignment WHERE assignment_id = %s", (assignment_id,))
+            
+            def done(_):
                 messagebox.showinfo("Success", "Segment assignment removed successfully!")
-                self.refresh_segment_assignments()
-                
-            except Exception as e:
-                self.connection.rollback()
-                messagebox.showerror("Error", f"Failed to remove assignment: {str(e)}")
+                self.reload_unless_live(self.refresh_segment_assignments)
+            
+            self.executor.submit(work, on_success=done, description="Removing assignment...",
+                                 on_error=lambda e: messagebox.showerror("Error", f"Failed to remove assignment: {str(e)}"))
     
     # Query Functions (From Part 2)
+    def run_query(self, sql, title, show_row, empty_message, on_finished=None, params=None):
+        """
+        Stream a report query into the results panel
+        
+        Rows arrive in chunks from a server-side cursor and are written with
+        show_row(row) as they come, so the first rows appear right away however
+        large the result is. empty_message is shown when there are no rows, and
+        on_finished(row_count) runs after the last row.
+        """
+        self.results_text.delete('1.0', 'end')
+        self.results_text.insert('1.0', f"{title}\n")
+        self.results_text.insert('end', "="*50 + "\n\n")
+        
+        def show_rows(rows):
+            for row in rows:
+                show_row(row)
+        
+        def finished(row_count):
+            if row_count == 0:
+                self.results_text.insert('end', empty_message)
+            elif on_finished is not None:
+                on_finished(row_count)
+        
+        self.executor.stream(sql, params, on_rows=show_rows, on_success=finished,
+                             description="Running report...", background=True,
+                             on_error=lambda e: messagebox.showerror("Error", f"Query failed: {str(e)}"))
+    
     def query_customers_valid_docs(self):
         """Query 1: Customers with valid documents"""
-        try:
-            self.cursor.execute("""
-                SELECT 
-                    C.Customer_First_Name, 
-                    C.Customer_Last_Name, 
-                    COUNT(D.document_id) AS ValidDocuments
-                FROM 
-                    Customer C
-                JOIN 
-                    CustomerDocument D ON C.CustomerID = D.customer_id
-                WHERE 
-                    D.expiry_date > CURRENT_DATE
-                GROUP BY 
-                    C.CustomerID, C.Customer_First_Name, C.Customer_Last_Name
-                ORDER BY ValidDocuments DESC
-            """)
-            
-            results = self.cursor.fetchall()
-            
-            # Display results
-            self.results_text.delete('1.0', 'end')
-            self.results_text.insert('1.0', "CUSTOMERS WITH VALID DOCUMENTS\n")
-            self.results_text.insert('end', "="*50 + "\n\n")
-            
-            if results:
-                for row in results:
-                    self.results_text.insert('end', f"Customer: {row[0]} {row[1]}\n")
-                    self.results_text.insert('end', f"Valid Documents: {row[2]}\n")
-                    self.results_text.insert('end', "-"*30 + "\n")
-            else:
-                self.results_text.insert('end', "No customers with valid documents found.\n")
-                
-        except Exception as e:
-            messagebox.showerror("Error", f"Query failed: {str(e)}")
+        def show_row(row):
+            self.results_text.insert('end', f"Customer: {row[0]} {row[1]}\n")
+            self.results_text.insert('end', f"Valid Documents: {row[2]}\n")
+            self.results_text.insert('end', "-"*30 + "\n")
+        
+        self.run_query(VALID_DOCUMENTS_SQL, "CUSTOMERS WITH VALID DOCUMENTS", show_row,
+                       "No customers with valid documents found.\n")
     
     def query_new_customers_addresses(self):
         """Query 2: Primary addresses of customers who joined this year"""
-        try:
-            self.cursor.execute("""
-                SELECT 
-                    C.Customer_First_Name, 
-                    C.Customer_Last_Name,
-                    A.street_address, 
-                    A.city_name,
-                    C.customer_since
-                FROM 
-                    Customer C
-                JOIN 
-                    Address A ON C.CustomerID = A.customer_id
-                WHERE 
-                    A.is_primary = TRUE
-                    AND EXTRACT(YEAR FROM C.customer_since) = EXTRACT(YEAR FROM CURRENT_DATE)
-                ORDER BY C.customer_since DESC
-            """)
-            
-            results = self.cursor.fetchall()
-            
-            # Display results
-            self.results_text.delete('1.0', 'end')
-            self.results_text.insert('1.0', "NEW CUSTOMERS PRIMARY ADDRESSES (This Year)\n")
-            self.results_text.insert('end', "="*50 + "\n\n")
-            
-            if results:
-                for row in results:
-                    self.results_text.insert('end', f"Customer: {row[0]} {row[1]}\n")
-                    self.results_text.insert('end', f"Address: {row[2]}, {row[3]}\n")
-                    self.results_text.insert('end', f"Joined: {row[4]}\n")
-                    self.results_text.insert('end', "-"*30 + "\n")
-            else:
-                self.results_text.insert('end', "No new customers found for this year.\n")
-                
-        except Exception as e:
-            messagebox.showerror("Error", f"Query failed: {str(e)}")
+        def show_row(row):
+            self.results_text.insert('end', f"Customer: {row[0]} {row[1]}\n")
+            self.results_text.insert('end', f"Address: {row[2]}, {row[3]}\n")
+            self.results_text.insert('end', f"Joined: {row[4]}\n")
+            self.results_text.insert('end', "-"*30 + "\n")
+        
+        self.run_query(NEW_CUSTOMER_ADDRESSES_SQL, "NEW CUSTOMERS PRIMARY ADDRESSES (This Year)", show_row,
+                       "No new customers found for this year.\n")
     
     def query_important_notes(self):
         """Query 3: Important customer notes"""
-        try:
-            self.cursor.execute("""
-                SELECT 
-                    C.CustomerID, 
-                    C.Customer_First_Name, 
-                    C.Customer_Last_Name, 
-                    N.note_category,
-                    N.note_text,
-                    N.note_date
-                FROM 
-                    Customer C
-                JOIN 
-                    CustomerNote N ON C.CustomerID = N.customer_id
-                WHERE 
-                    N.is_important = TRUE
-                ORDER BY N.note_date DESC
-            """)
-            
-            results = self.cursor.fetchall()
-            
-            # Display results
-            self.results_text.delete('1.0', 'end')
-            self.results_text.insert('1.0', "IMPORTANT CUSTOMER NOTES\n")
-            self.results_text.insert('end', "="*50 + "\n\n")
-            
-            if results:
-                for row in results:
-                    self.results_text.insert('end', f"Customer: {row[1]} {row[2]} (ID: {row[0]})\n")
-                    self.results_text.insert('end', f"Category: {row[3]}\n")
-                    self.results_text.insert('end', f"Note: {row[4]}\n")
-                    self.results_text.insert('end', f"Date: {row[5]}\n")
-                    self.results_text.insert('end', "-"*30 + "\n")
-            else:
-                self.results_text.insert('end', "No important notes found.\n")
-                
-        except Exception as e:
-            messagebox.showerror("Error", f"Query failed: {str(e)}")
+        def show_row(row):
+            self.results_text.insert('end', f"Customer: {row[1]} {row[2]} (ID: {row[0]})\n")
+            self.results_text.insert('end', f"Category: {row[3]}\n")
+            self.results_text.insert('end', f"Note: {row[4]}\n")
+            self.results_text.insert('end', f"Date: {row[5]}\n")
+            self.results_text.insert('end', "-"*30 + "\n")
+        
+        self.run_query(IMPORTANT_NOTES_SQL, "IMPORTANT CUSTOMER NOTES", show_row,
+                       "No important notes found.\n")
     
     def query_primary_contacts(self):
         """Query 4: Primary contact information"""
-        try:
-            self.cursor.execute("""
-                SELECT 
-                    C.Customer_First_Name, 
-                    C.Customer_Last_Name,
-                    CT.contact_type, 
-                    CT.contact_value
-                FROM 
-                    Customer C
-                JOIN 
-                    Contact CT ON C.CustomerID = CT.customer_id
-                WHERE 
-                    CT.is_primary = TRUE
-                ORDER BY 
-                    CT.contact_type, C.Customer_Last_Name
-            """)
-            
-            results = self.cursor.fetchall()
-            
-            # Display results
-            self.results_text.delete('1.0', 'end')
-            self.results_text.insert('1.0', "PRIMARY CONTACT INFORMATION\n")
-            self.results_text.insert('end', "="*50 + "\n\n")
+        current_type = None
+        
+        def show_row(row):
+            nonlocal current_type
+            if row[2] != current_type:
+                current_type = row[2]
+                self.results_text.insert('end', f"\n{current_type.upper()}:\n")
+                self.results_text.insert('end', "-"*20 + "\n")
             
-            if results:
-                current_type = None
-                for row in results:
-                    if row[2] != current_type:
-                        current_type = row[2]
-                        self.results_text.insert('end', f"\n{current_type.upper()}:\n")
-                        self.results_text.insert('end', "-"*20 + "\n")
-                    
-                    self.results_text.insert('end', f"{row[0]} {row[1]}: {row[3]}\n")
-            else:
-                self.results_text.insert('end', "No primary contact information found.\n")
-                
-        except Exception as e:
-            messagebox.showerror("Error", f"Query failed: {str(e)}")
+            self.results_text.insert('end', f"{row[0]} {row[1]}: {row[3]}\n")
+        
+        self.run_query(PRIMARY_CONTACTS_SQL, "PRIMARY CONTACT INFORMATION", show_row,
+                       "No primary contact information found.\n")
+    
+    def cached_report(self, live_sql, cached_sql, title):
+        """(sql, title) for an aggregate report: the report cache when it is set up, else the live query"""
+        if self.report_cache is None:
+            return live_sql, title
+        return cached_sql, f"{title} ({self.report_cache.describe()})"
+    
+    def refresh_report_cache(self):
+        """Refresh the cached aggregate reports now instead of waiting for the schedule"""
+        if self.report_cache is None:
+            messagebox.showwarning("Report Cache", "The report cache is not set up; reports run live.")
+            return
+        self.report_cache.refresh_now()
+        messagebox.showinfo("Report Cache", "Report cache refresh started in the background.")
     
     def query_segment_age_analysis(self):
         """Query 6: Average age by customer segment"""
-        try:
-            self.cursor.execute("""
-                SELECT 
-                    S.segment_name, 
-                    ROUND(AVG(EXTRACT(YEAR FROM AGE(C.date_of_birth))), 1) AS avg_age,
-                    COUNT(*) as customer_count
-                FROM 
-                    CustomerSegmentAssignment A
-                JOIN 
-                    Customer C ON C.CustomerID = A.customer_id
-                JOIN 
-                    CustomerSegment S ON S.segment_id = A.segment_id
-                GROUP BY 
-                    S.segment_name, S.segment_id
-                ORDER BY avg_age DESC
-            """)
-            
-            results = self.cursor.fetchall()
-            
-            # Display results
-            self.results_text.delete('1.0', 'end')
-            self.results_text.insert('1.0', "CUSTOMER SEGMENT AGE ANALYSIS\n")
-            self.results_text.insert('end', "="*50 + "\n\n")
-            
-            if results:
-                for row in results:
-                    self.results_text.insert('end', f"Segment: {row[0]}\n")
-                    self.results_text.insert('end', f"Average Age: {row[1]} years\n")
-                    self.results_text.insert('end', f"Customers: {row[2]}\n")
-                    self.results_text.insert('end', "-"*30 + "\n")
-            else:
-                self.results_text.insert('end', "No segment data found.\n")
-                
-        except Exception as e:
-            messagebox.showerror("Error", f"Query failed: {str(e)}")
+        def show_row(row):
+            self.results_text.insert('end', f"Segment: {row[0]}\n")
+            self.results_text.insert('end', f"Average Age: {row[1]} years\n")
+            self.results_text.insert('end', f"Customers: {row[2]}\n")
+            self.results_text.insert('end', "-"*30 + "\n")
+        
+        sql, title = self.cached_report(SEGMENT_AGE_SQL, SEGMENT_AGE_CACHED_SQL, "CUSTOMER SEGMENT AGE ANALYSIS")
+        self.run_query(sql, title, show_row, "No segment data found.\n")
     
     def query_monthly_registration(self):
         """Query 8: Monthly customer registration"""
-        try:
-            self.cursor.execute("""
-                SELECT 
-                    EXTRACT(MONTH FROM customer_since) AS month,
-                    TO_CHAR(DATE_TRUNC('month', customer_since), 'Month YYYY') as month_name,
-                    COUNT(*) AS customer_count
-                FROM 
-                    Customer
-                GROUP BY 
-                    EXTRACT(MONTH FROM customer_since), DATE_TRUNC('month', customer_since)
-                ORDER BY 
-                    month
-            """)
-            
-            results = self.cursor.fetchall()
-            
-            # Display results
-            self.results_text.delete('1.0', 'end')
-            self.results_text.insert('1.0', "MONTHLY CUSTOMER REGISTRATION\n")
-            self.results_text.insert('end', "="*50 + "\n\n")
-            
-            if results:
-                total = sum(row[2] for row in results)
-                for row in results:
-                    self.results_text.insert('end', f"Month: {row[1].strip()}\n")
-                    self.results_text.insert('end', f"New Customers: {row[2]}\n")
-                    percentage = (row[2] / total) * 100
-                    self.results_text.insert('end', f"Percentage: {percentage:.1f}%\n")
-                    self.results_text.insert('end', "-"*30 + "\n")
-                
-                self.results_text.insert('end', f"\nTotal Customers: {total}\n")
-            else:
-                self.results_text.insert('end', "No registration data found.\n")
-                
-        except Exception as e:
-            messagebox.showerror("Error", f"Query failed: {str(e)}")
+        # Percentages come from a window total, so no row has to wait for the others
+        total = 0
+        
+        def show_row(row):
+            nonlocal total
+            total = row[4]
+            self.results_text.insert('end', f"Month: {row[1].strip()}\n")
+            self.results_text.insert('end', f"New Customers: {row[2]}\n")
+            self.results_text.insert('end', f"Percentage: {row[3]:.1f}%\n")
+            self.results_text.insert('end', "-"*30 + "\n")
+        
+        def show_total(_):
+            self.results_text.insert('end', f"\nTotal Customers: {total}\n")
+        
+        sql, title = self.cached_report(MONTHLY_REGISTRATION_SQL, MONTHLY_REGISTRATION_CACHED_SQL,
+                                        "MONTHLY CUSTOMER REGISTRATION")
+        self.run_query(sql, title, show_row, "No registration data found.\n", on_finished=show_total)
     
-    def show_database_stats(self):
-        """Show database statistics"""
-        try:
-            tables = ['Customer', 'Address', 'Contact', 'CustomerDocument', 
-                     'CustomerNote', 'CustomerSegment', 'CustomerSegmentAssignment']
+    def show_database_stats(self, mode='estimate'):
+        """
+        Show database statistics
+        
+        'estimate' reads the planner's row statistics and answers instantly;
+        'exact' counts every table in one query. Both are cached for a while.
+        """
+        def work(cursor):
+            return table_counts(cursor, mode, metrics=COVERAGE_METRICS)
+        
+        def show(counts):
+            approx = "~" if mode == 'estimate' else ""
             
             self.results_text.delete('1.0', 'end')
-            self.results_text.insert('1.0', "DATABASE STATISTICS\n")
+            self.results_text.insert('1.0', f"DATABASE STATISTICS ({mode.upper()})\n")
             self.results_text.insert('end', "="*50 + "\n\n")
             
             total_records = 0
-            for table in tables:
-                self.cursor.execute(f"SELECT COUNT(*) FROM {table}")
-                count = self.cursor.fetchone()[0]
-                total_records += count
-                self.results_text.insert('end', f"{table:<25}: {count:>8} records\n")
-            
-            self.results_text.insert('end', f"\n{'Total Records':<25}: {total_records:>8}\n")
-            
-            # Additional statistics
-            self.cursor.execute("SELECT COUNT(DISTINCT customer_id) FROM Address")
-            customers_with_addresses = self.cursor.fetchone()[0]
-            
-            self.cursor.execute("SELECT COUNT(DISTINCT customer_id) FROM CustomerDocument WHERE expiry_date > CURRENT_DATE")
-            customers_with_valid_docs = self.cursor.fetchone()[0]
-            
-            self.results_text.insert('end', f"\n{'Customers with Addresses':<25}: {customers_with_addresses:>8}\n")
-            self.results_text.insert('end', f"{'Customers with Valid Docs':<25}: {customers_with_valid_docs:>8}\n")
-                
-        except Exception as e:
-            messagebox.showerror("Error", f"Query failed: {str(e)}")
+            for table, count in counts.items():
+                if table in COVERAGE_METRICS:
+                    continue
+                total_records += count or 0
+                value = f"{approx}{count}" if count is not None else "not found"
+                self.results_text.insert('end', f"{table:<25}: {value:>9} records\n")
+            
+            self.results_text.insert('end', f"\n{'Total Records':<25}: {approx}{total_records:>8}\n\n")
+            
+            for metric in COVERAGE_METRICS:
+                value = counts[metric] if counts[metric] is not None else "n/a"
+                self.results_text.insert('end', f"{metric:<25}: {value:>9}\n")
+            if mode == 'estimate':
+                self.results_text.insert('end', "\nEstimates from table statistics; use Exact Record Counts for exact figures.\n")
+        
+        self.executor.submit(work, on_success=show,
+                             description="Counting records..." if mode == 'exact' else "Reading statistics...",
+                             on_error=lambda e: messagebox.showerror("Error", f"Query failed: {str(e)}"))
     
     def show_database_functions(self):
         """Show database functions and procedures"""
@@ -1107,20 +1123,20 @@ class CustomerDatabaseGUI:
         
         self.results_text.insert('end', "\nClick the buttons below to execute functions:\n\n")
         
-        # Add function buttons
-        button_frame = tk.Frame(self.root)
-        button_frame.pack(pady=10)
+        # Add function buttons (replacing any from an earlier click)
+        for widget in self.function_buttons.winfo_children():
+            widget.destroy()
         
         for name, func in functions:
-            btn = tk.Button(button_frame, text=name, command=func,
+            btn = tk.Button(self.function_buttons, text=name, command=func,
                            bg='#e67e22', fg='white', font=('Arial', 9))
             btn.pack(side='left', padx=5)
     
     # Database Functions (From Part 2 UPDATE/DELETE operations)
     def update_senior_notes(self):
         """Mark all notes for customers over 65 as important"""
-        try:
-            self.cursor.execute("""
+        def work(cursor):
+            cursor.execute("""
                 UPDATE CustomerNote
                 SET is_important = TRUE
                 WHERE customer_id IN (
@@ -1129,50 +1145,47 @@ class CustomerDatabaseGUI:
                 )
                 AND is_important = FALSE
             """)
-            
-            affected_rows = self.cursor.rowcount
-            self.connection.commit()
-            
-            messagebox.showinfo("Success", f"Updated {affected_rows} notes for senior customers")
-            
-        except Exception as e:
-            self.connection.rollback()
-            messagebox.showerror("Error", f"Function failed: {str(e)}")
+            return cursor.rowcount
+        
+        self.executor.submit(work, description="Updating senior notes...",
+                             on_success=lambda affected_rows: messagebox.showinfo("Success", f"Updated {affected_rows} notes for senior customers"),
+                             on_error=lambda e: messagebox.showerror("Error", f"Function failed: {str(e)}"),
+                             background=True)
     
     def mark_expired_documents(self):
         """Mark expired documents as unverified"""
-        try:
-            self.cursor.execute("""
-                UPDATE CustomerDocument
-                SET verification_status = FALSE
-                WHERE expiry_date < CURRENT_DATE
-                AND verification_status = TRUE
-            """)
-            
-            affected_rows = self.cursor.rowcount
-            self.connection.commit()
-            
-            messagebox.showinfo("Success", f"Marked {affected_rows} expired documents as unverified")
-            
-        except Exception as e:
-            self.connection.rollback()
-            messagebox.showerror("Error", f"Function failed: {str(e)}")
+        job = MaintenanceJob(self.executor.db_pool, 'expire_documents')
+        
+        def work(cursor):
+            # Batches commit on their own pooled connections; the worker only waits for them
+            return job.run()
+        
+        def done(result):
+            rate = f"{result['rows']:,} documents in {result['seconds']:.2f}s ({result['rows_per_second']:,.0f} rows/s)"
+            if result['finished']:
+                messagebox.showinfo("Success", f"Marked {rate} as unverified")
+            else:
+                messagebox.showinfo("Stopped", f"Marked {rate} as unverified.\n\nThe next run resumes where this one stopped.")
+        
+        self.executor.submit(work, description="Marking expired documents...",
+                             on_success=done,
+                             on_error=lambda e: messagebox.showerror("Error", f"Function failed: {str(e)}"),
+                             stop=job.stop, status=job.status, background=True)
     
     def promote_customers(self):
         """Promote customers with many valid documents to Premium segment"""
-        try:
+        def work(cursor):
             # First, check if Premium segment exists
-            self.cursor.execute("SELECT segment_id FROM CustomerSegment WHERE segment_name = 'Premium'")
-            premium_segment = self.cursor.fetchone()
+            cursor.execute("SELECT segment_id FROM CustomerSegment WHERE segment_name = 'Premium'")
+            premium_segment = cursor.fetchone()
             
             if not premium_segment:
-                messagebox.showwarning("Warning", "Premium segment not found in database")
-                return
+                return None
             
             premium_id = premium_segment[0]
             
             # Update segment assignments
-            self.cursor.execute("""
+            cursor.execute("""
                 UPDATE CustomerSegmentAssignment
                 SET segment_id = %s
                 WHERE customer_id IN (
@@ -1184,61 +1197,197 @@ class CustomerDatabaseGUI:
                 AND segment_id != %s
             """, (premium_id, premium_id))
             
-            affected_rows = self.cursor.rowcount
-            self.connection.commit()
-            
+            return cursor.rowcount
+        
+        def done(affected_rows):
+            if affected_rows is None:
+                messagebox.showwarning("Warning", "Premium segment not found in database")
+                return
             messagebox.showinfo("Success", f"Promoted {affected_rows} customers to Premium segment")
-            
-        except Exception as e:
-            self.connection.rollback()
-            messagebox.showerror("Error", f"Function failed: {str(e)}")
+        
+        self.executor.submit(work, on_success=done, description="Promoting customers...",
+                             on_error=lambda e: messagebox.showerror("Error", f"Function failed: {str(e)}"),
+                             background=True)
     
     def clean_duplicate_contacts(self):
-        """Remove duplicate non-primary contacts"""
-        try:
-            self.cursor.execute("""
-                DELETE FROM Contact
-                WHERE contactID IN (
-                    SELECT c1.contactID
-                    FROM Contact c1
-                    JOIN Contact c2 ON c1.customer_id = c2.customer_id 
-                        AND c1.contact_type = c2.contact_type
-                        AND c1.contact_value = c2.contact_value
-                        AND c1.contactID != c2.contactID
-                    WHERE c1.is_primary = FALSE
-                    AND c2.is_primary = TRUE
-                )
-            """)
+        """Find duplicate contacts, show what would be removed and delete them in batches on confirmation"""
+        def review(duplicates):
+            self.results_text.delete('1.0', 'end')
+            self.results_text.insert('1.0', duplicate_report(duplicates))
+            if not duplicates:
+                messagebox.showinfo("Duplicate Contacts", "No duplicate contacts found")
+                return
+            if not messagebox.askyesno("Duplicate Contacts",
+                                       f"Delete {len(duplicates)} duplicate contacts?\n\n"
+                                       f"The dry-run report is shown in the results area."):
+                return
             
-            affected_rows = self.cursor.rowcount
-            self.connection.commit()
+            dedup = ContactDeduplicator(self.executor.db_pool)
             
-            messagebox.showinfo("Success", f"Removed {affected_rows} duplicate contact records")
+            def work(cursor):
+                # Batches commit on their own pooled connections; the worker only waits for them
+                return dedup.delete(duplicates)
             
-        except Exception as e:
-            self.connection.rollback()
-            messagebox.showerror("Error", f"Function failed: {str(e)}")
+            def done(result):
+                message = f"Removed {result['deleted']} duplicate contact records"
+                if result['skipped']:
+                    message += f"\n{result['skipped']} were left alone because they changed since the dry run"
+                if not result['finished']:
+                    message += "\n\nStopped before the end; run it again to remove the rest."
+                messagebox.showinfo("Success", message)
+            
+            self.executor.submit(work, description="Removing duplicate contacts...", on_success=done,
+                                 on_error=lambda e: messagebox.showerror("Error", f"Function failed: {str(e)}"),
+                                 stop=dedup.stop, status=dedup.status, background=True)
+        
+        self.executor.submit(find_duplicate_contacts, description="Finding duplicate contacts...",
+                             on_success=review,
+                             on_error=lambda e: messagebox.showerror("Error", f"Function failed: {str(e)}"),
+                             background=True)
     
     # Additional helper functions
     def show_db_summary(self):
-        """Show database summary"""
-        self.show_database_stats()
+        """Show estimated record counts per table"""
+        def work(cursor):
+            return table_counts(cursor, 'estimate')
+        
+        def show(counts):
+            lines = [f"{table}: ~{count}" if count is not None else f"{table}: not found"
+                     for table, count in counts.items()]
+            messagebox.showinfo("Database Summary", "Estimated records per table:\n\n" + "\n".join(lines))
+        
+        self.executor.submit(work, on_success=show, description="Reading statistics...",
+                             on_error=lambda e: messagebox.showerror("Error", f"Query failed: {str(e)}"))
+    
+    def show_index_advisor(self):
+        """Show missing indexes, scan counters and which indexes the report queries use"""
+        def show(report):
+            window = tk.Toplevel(self.root)
+            window.title("Index Advisor")
+            window.geometry("760x560")
+            
+            text = tk.Text(window, font=('Courier', 10), wrap='none')
+            scrollbar = ttk.Scrollbar(window, command=text.yview)
+            text.config(yscrollcommand=scrollbar.set)
+            
+            tk.Button(window, text="🔨 Create Missing Indexes", command=lambda: create(window),
+                     bg='#27ae60', fg='white', font=('Arial', 10, 'bold')).pack(side='bottom', pady=10)
+            scrollbar.pack(side='right', fill='y')
+            text.pack(fill='both', expand=True)
+            text.insert('1.0', report)
+            text.config(state='disabled')
+        
+        def create(window):
+            def done(built):
+                window.destroy()
+                messagebox.showinfo("Index Advisor", f"Created {len(built)} indexes." if built
+                                    else "No indexes were missing.")
+                self.show_index_advisor()
+            
+            self.executor.submit(ensure_recommended_indexes, on_success=done, description="Creating indexes...",
+                                 on_error=lambda e: messagebox.showerror("Error", f"Failed to create indexes: {str(e)}"),
+                                 background=True)
+        
+        self.executor.submit(index_report, on_success=show, description="Analyzing indexes...",
+                             on_error=lambda e: messagebox.showerror("Error", f"Index analysis failed: {str(e)}"),
+                             background=True)
     
     def refresh_all_data(self):
-        """Refresh all data views"""
-        messagebox.showinfo("Refresh", "All data refreshed successfully!")
+        """Refresh all data views: every cached screen reloads its rows when next shown"""
+        # The button sits on the operations screen, so no grid is on display to reload now
+        self.screen_cache.mark_dirty()
+        messagebox.showinfo("Refresh", "Customer, address and segment screens will reload their data "
+                                       "the next time they are opened.")
+    
+    def export_sources(self):
+        """Exportable data: each grid screen's full list and each report, as name -> (sql, params)"""
+        sources = {
+            "Customers": self.customer_pager().full_query(),
+            "Addresses": self.address_pager().full_query(),
+            "Segment Assignments": self.segment_assignment_pager().full_query()
+        }
+        for title, sql in REPORTS:
+            sources[f"Report: {title.title()}"] = (sql, [])
+        return sources
     
-    def export_customers(self):
-        """Export customer list"""
-        messagebox.showinfo("Export", "Customer export feature would be implemented here")
+    def export_data(self):
+        """Export a grid or report to CSV, gzip CSV or Parquet"""
+        sources = self.export_sources()
+        dialog = ExportDialog(self.root, list(sources), available_formats())
+        self.root.wait_window(dialog.dialog)
+        
+        if not dialog.result:
+            return
+        source, file_format = dialog.result
+        label, extension = EXPORT_FORMATS[file_format]
+        path = filedialog.asksaveasfilename(parent=self.root, title="Export To",
+                                            defaultextension=extension,
+                                            filetypes=[(label, f"*{extension}"), ("All files", "*.*")])
+        if not path:
+            return
+        
+        sql, params = sources[source]
+        progress = ExportProgress()
+        
+        def done(_):
+            written = f"{progress.rows:,} rows" if progress.rows else f"{progress.bytes / (1 << 20):,.1f} MB of CSV"
+            messagebox.showinfo("Export", f"Exported {source}:\n{written} written to\n{path}")
+        
+        def failed(e):
+            if progress.stop.is_set():
+                messagebox.showinfo("Export", "Export cancelled.")
+            else:
+                messagebox.showerror("Error", f"Export failed: {str(e)}")
+        
+        self.executor.submit(export_query, sql, params, path, file_format, progress,
+                             on_success=done, on_error=failed, description=f"Exporting {source}...",
+                             stop=progress.stop, status=progress.status, background=True)
     
     def advanced_search(self):
-        """Advanced search functionality"""
-        messagebox.showinfo("Search", "Advanced search feature would be implemented here")
+        """Open the full-text search across customers, addresses, contacts and notes"""
+        AdvancedSearchDialog(self.root, self.executor)
     
     def generate_report(self):
-        """Generate comprehensive report"""
-        messagebox.showinfo("Report", "Report generation feature would be implemented here")
+        """Run every report section in parallel from one snapshot and save them as one document"""
+        formats = available_report_formats()
+        path = filedialog.asksaveasfilename(parent=self.root, title="Save Report As",
+                                            defaultextension=REPORT_FORMATS[formats[0]][1],
+                                            filetypes=[(REPORT_FORMATS[name][0], f"*{REPORT_FORMATS[name][1]}")
+                                                       for name in formats])
+        if not path:
+            return
+        
+        # The extension picks the format; anything unknown is written as HTML
+        report_format = next((name for name in formats if path.lower().endswith(REPORT_FORMATS[name][1])), 'html')
+        engine = ReportEngine(self.executor.db_pool)
+        
+        def work(cursor):
+            # The job's connection coordinates; the sections borrow their own from the pool
+            report = engine.run(cursor)
+            write_report(report, path, report_format)
+            return report
+        
+        def done(report):
+            timings = "\n".join(f"{section['title'].title()}: {section['seconds']:.2f}s"
+                                for section in report['sections'])
+            messagebox.showinfo("Report", f"Report saved to {path}\n\n{timings}\n\nTotal: {report['seconds']:.2f}s")
+        
+        def failed(e):
+            if engine.stop.is_set():
+                messagebox.showinfo("Report", "Report generation cancelled.")
+            else:
+                messagebox.showerror("Error", f"Report generation failed: {str(e)}")
+        
+        self.executor.submit(work, on_success=done, on_error=failed, description="Generating report...",
+                             stop=engine.stop, status=engine.status, background=True)
+
+
+def select_combo_value(combo, record_id):
+    """Select the "<id> - ..." entry of a combobox that belongs to record_id"""
+    for i, value in enumerate(combo['values']):
+        if value.startswith(f"{record_id} - "):
+            combo.current(i)
+            break
 
 
 class CustomerDialog:
@@ -1340,9 +1489,10 @@ class CustomerDialog:
 
 class AddressDialog:
     """Dialog for adding/editing addresses"""
-    def __init__(self, parent, title, cursor, address_data=None):
+    def __init__(self, parent, title, executor, address_data=None):
         self.result = None
-        self.cursor = cursor
+        self.executor = executor
+        self.address_data = address_data
         
         # Create dialog window
         self.dialog = tk.Toplevel(parent)
@@ -1417,30 +1567,26 @@ class AddressDialog:
                  bg='#e74c3c', fg='white', font=('Arial', 10, 'bold')).pack(side='left', padx=5)
     
     def load_customers(self):
-        """Load customer list for selection"""
-        try:
-            self.cursor.execute("""
+        """Load customer list for selection in the background"""
+        def work(cursor):
+            cursor.execute("""
                 SELECT CustomerID, CONCAT(Customer_First_Name, ' ', Customer_Last_Name)
                 FROM Customer ORDER BY Customer_Last_Name, Customer_First_Name
             """)
-            
-            customers = self.cursor.fetchall()
+            return cursor.fetchall()
+        
+        def loaded(customers):
             customer_list = [f"{row[0]} - {row[1]}" for row in customers]
             self.customer_combo['values'] = customer_list
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load customers: {str(e)}")
+            if self.address_data:
+                select_combo_value(self.customer_combo, self.address_data[1])
+        
+        self.executor.submit(work, on_success=loaded, description="Loading customers...",
+                             on_error=lambda e: messagebox.showerror("Error", f"Failed to load customers: {str(e)}"))
     
     def fill_existing_data(self, address_data):
-        """Fill form with existing address data"""
+        """Fill form with existing address data (the customer is selected once the list loads)"""
         try:
-            # Set customer
-            customer_id = address_data[1]
-            for i, value in enumerate(self.customer_combo['values']):
-                if value.startswith(str(customer_id)):
-                    self.customer_combo.current(i)
-                    break
-            
             # Fill other fields
             self.entries['street_address'].insert(0, address_data[3] or '')
             self.entries['city_name'].insert(0, address_data[4] or '')
@@ -1497,9 +1643,10 @@ class AddressDialog:
 
 class SegmentAssignmentDialog:
     """Dialog for assigning customers to segments"""
-    def __init__(self, parent, title, cursor, assignment_data=None):
+    def __init__(self, parent, title, executor, assignment_data=None):
         self.result = None
-        self.cursor = cursor
+        self.executor = executor
+        self.assignment_data = assignment_data
         
         # Create dialog window
         self.dialog = tk.Toplevel(parent)
@@ -1559,52 +1706,44 @@ class SegmentAssignmentDialog:
                  bg='#e74c3c', fg='white', font=('Arial', 10, 'bold')).pack(side='left', padx=5)
     
     def load_customers(self):
-        """Load customer list for selection"""
-        try:
-            self.cursor.execute("""
+        """Load customer list for selection in the background"""
+        def work(cursor):
+            cursor.execute("""
                 SELECT CustomerID, CONCAT(Customer_First_Name, ' ', Customer_Last_Name)
                 FROM Customer ORDER BY Customer_Last_Name, Customer_First_Name
             """)
-            
-            customers = self.cursor.fetchall()
+            return cursor.fetchall()
+        
+        def loaded(customers):
             customer_list = [f"{row[0]} - {row[1]}" for row in customers]
             self.customer_combo['values'] = customer_list
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load customers: {str(e)}")
+            if self.assignment_data:
+                select_combo_value(self.customer_combo, self.assignment_data[1])
+        
+        self.executor.submit(work, on_success=loaded, description="Loading customers...",
+                             on_error=lambda e: messagebox.showerror("Error", f"Failed to load customers: {str(e)}"))
     
     def load_segments(self):
-        """Load segment list for selection"""
-        try:
-            self.cursor.execute("""
+        """Load segment list for selection in the background"""
+        def work(cursor):
+            cursor.execute("""
                 SELECT segment_id, segment_name, description, min_balance_required
                 FROM CustomerSegment ORDER BY segment_name
             """)
-            
-            segments = self.cursor.fetchall()
+            return cursor.fetchall()
+        
+        def loaded(segments):
             segment_list = [f"{row[0]} - {row[1]} (Min: ${row[3]:,.2f})" for row in segments]
             self.segment_combo['values'] = segment_list
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load segments: {str(e)}")
+            if self.assignment_data:
+                select_combo_value(self.segment_combo, self.assignment_data[3])
+        
+        self.executor.submit(work, on_success=loaded, description="Loading segments...",
+                             on_error=lambda e: messagebox.showerror("Error", f"Failed to load segments: {str(e)}"))
     
     def fill_existing_data(self, assignment_data):
-        """Fill form with existing assignment data"""
+        """Fill form with existing assignment data (customer and segment are selected once the lists load)"""
         try:
-            # Set customer
-            customer_id = assignment_data[1]
-            for i, value in enumerate(self.customer_combo['values']):
-                if value.startswith(str(customer_id)):
-                    self.customer_combo.current(i)
-                    break
-            
-            # Set segment
-            segment_id = assignment_data[3]
-            for i, value in enumerate(self.segment_combo['values']):
-                if value.startswith(str(segment_id)):
-                    self.segment_combo.current(i)
-                    break
-            
             # Set date
             if assignment_data[5]:
                 self.date_entry.delete(0, 'end')
@@ -1653,6 +1792,224 @@ class SegmentAssignmentDialog:
         self.dialog.destroy()
 
 
+class ExportDialog:
+    """Dialog for choosing what to export and in which format"""
+    def __init__(self, parent, sources, formats):
+        self.result = None
+        
+        # Create dialog window
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Export Data")
+        self.dialog.geometry("420x300")
+        self.dialog.resizable(False, False)
+        self.dialog.grab_set()
+        
+        # Center the dialog
+        self.dialog.transient(parent)
+        
+        # Main frame
+        main_frame = tk.Frame(self.dialog, padx=20, pady=20)
+        main_frame.pack(fill='both', expand=True)
+        
+        # Data to export
+        tk.Label(main_frame, text="Export:", font=('Arial', 10, 'bold')).pack(anchor='w')
+        self.source_var = tk.StringVar(value=sources[0])
+        ttk.Combobox(main_frame, textvariable=self.source_var, values=sources,
+                     font=('Arial', 10), width=45, state='readonly').pack(fill='x', pady=(0, 15))
+        
+        # File format
+        tk.Label(main_frame, text="Format:", font=('Arial', 10, 'bold')).pack(anchor='w')
+        self.format_var = tk.StringVar(value=formats[0])
+        for file_format in formats:
+            tk.Radiobutton(main_frame, text=EXPORT_FORMATS[file_format][0], value=file_format,
+                           variable=self.format_var).pack(anchor='w')
+        
+        # Buttons
+        button_frame = tk.Frame(main_frame)
+        button_frame.pack(pady=20)
+        
+        tk.Button(button_frame, text="Export", command=self.save,
+                 bg='#27ae60', fg='white', font=('Arial', 10, 'bold')).pack(side='left', padx=5)
+        tk.Button(button_frame, text="Cancel", command=self.cancel,
+                 bg='#e74c3c', fg='white', font=('Arial', 10, 'bold')).pack(side='left', padx=5)
+    
+    def save(self):
+        """Accept the chosen source and format"""
+        self.result = (self.source_var.get(), self.format_var.get())
+        self.dialog.destroy()
+    
+    def cancel(self):
+        """Cancel dialog"""
+        self.dialog.destroy()
+
+
+class AdvancedSearchDialog:
+    """Dialog for ranked full-text search with segment, date and importance filters"""
+    def __init__(self, parent, executor):
+        self.executor = executor
+        self.search_ready = False
+        
+        # Create dialog window
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Advanced Search")
+        self.dialog.geometry("900x600")
+        self.dialog.transient(parent)
+        
+        # Main frame
+        main_frame = tk.Frame(self.dialog, padx=20, pady=20)
+        main_frame.pack(fill='both', expand=True)
+        
+        # Search text
+        search_frame = tk.Frame(main_frame)
+        search_frame.pack(fill='x')
+        tk.Label(search_frame, text="Search for:", font=('Arial', 10, 'bold')).pack(side='left')
+        self.text_entry = tk.Entry(search_frame, font=('Arial', 11), width=50)
+        self.text_entry.pack(side='left', padx=10, fill='x', expand=True)
+        self.text_entry.bind('<Return>', lambda event: self.search())
+        self.search_button = tk.Button(search_frame, text="🔍 Search", command=self.search, state='disabled',
+                                       bg='#9b59b6', fg='white', font=('Arial', 10, 'bold'))
+        self.search_button.pack(side='left')
+        
+        # Record kinds to search
+        sources_frame = tk.Frame(main_frame)
+        sources_frame.pack(fill='x', pady=(10, 0))
+        tk.Label(sources_frame, text="Search in:", font=('Arial', 10, 'bold')).pack(side='left')
+        self.source_vars = {}
+        for source in SEARCH_SOURCES:
+            self.source_vars[source] = tk.BooleanVar(value=True)
+            tk.Checkbutton(sources_frame, text=source, variable=self.source_vars[source]).pack(side='left', padx=5)
+        
+        # Filters
+        filters_frame = tk.LabelFrame(main_frame, text="Filters (dates as YYYY-MM-DD)", padx=10, pady=5)
+        filters_frame.pack(fill='x', pady=10)
+        
+        tk.Label(filters_frame, text="Segment:").grid(row=0, column=0, sticky='w')
+        self.segment_var = tk.StringVar(value="Any segment")
+        self.segment_combo = ttk.Combobox(filters_frame, textvariable=self.segment_var,
+                                          width=30, state='readonly', values=["Any segment"])
+        self.segment_combo.grid(row=0, column=1, columnspan=3, sticky='w', pady=2)
+        
+        self.date_entries = {}
+        for row, (label, start, end) in enumerate([("Customer since:", 'since_from', 'since_to'),
+                                                   ("Note date:", 'notes_from', 'notes_to')], start=1):
+            tk.Label(filters_frame, text=label).grid(row=row, column=0, sticky='w')
+            for column, (name, text) in enumerate([(start, "from"), (end, "to")]):
+                tk.Label(filters_frame, text=text).grid(row=row, column=1 + column * 2, sticky='e', padx=(5, 2))
+                self.date_entries[name] = tk.Entry(filters_frame, width=12)
+                self.date_entries[name].grid(row=row, column=2 + column * 2, sticky='w', pady=2)
+        
+        self.important_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(filters_frame, text="Important notes only",
+                       variable=self.important_var).grid(row=3, column=0, columnspan=3, sticky='w')
+        
+        # Results
+        tree_frame = tk.Frame(main_frame)
+        tree_frame.pack(fill='both', expand=True)
+        v_scrollbar = ttk.Scrollbar(tree_frame, orient='vertical')
+        self.results_tree = ttk.Treeview(tree_frame,
+                                         columns=('CustomerID', 'FirstName', 'LastName', 'MatchedIn', 'Rank', 'BestMatch'),
+                                         show='headings', yscrollcommand=v_scrollbar.set)
+        v_scrollbar.config(command=self.results_tree.yview)
+        
+        headings = [('Customer ID', 90), ('First Name', 110), ('Last Name', 110),
+                    ('Matched In', 140), ('Rank', 60), ('Best Match', 300)]
+        for i, (heading, width) in enumerate(headings):
+            self.results_tree.heading(f'#{i+1}', text=heading)
+            self.results_tree.column(f'#{i+1}', width=width)
+        
+        self.results_tree.pack(side='left', fill='both', expand=True)
+        v_scrollbar.pack(side='right', fill='y')
+        
+        self.status_label = tk.Label(main_frame, text="Preparing search indexes...",
+                                     font=('Arial', 9), fg='#7f8c8d')
+        self.status_label.pack(anchor='w', pady=(5, 0))
+        
+        # Load data
+        self.prepare_search()
+        self.load_segments()
+    
+    def prepare_search(self):
+        """Check that the search vectors and their indexes exist (they are added by schema_migrations.py)"""
+        def ready(missing):
+            if missing:
+                self.status_label.config(text="Advanced search is not set up in this database")
+                messagebox.showwarning("Advanced Search", f"Search vectors are missing on {', '.join(missing)}.\n\n"
+                                       f"Ask an administrator to run:\n{MIGRATE_COMMAND}", parent=self.dialog)
+                return
+            self.search_ready = True
+            self.search_button.config(state='normal')
+            self.status_label.config(text="Enter words to search for")
+        
+        def failed(e):
+            self.status_label.config(text="Search indexes are not available")
+            messagebox.showerror("Error", f"Failed to check search indexes: {str(e)}", parent=self.dialog)
+        
+        self.executor.submit(missing_search_vectors, on_success=ready, on_error=failed,
+                             description="Checking search indexes...")
+    
+    def load_segments(self):
+        """Load segment list for the filter in the background"""
+        def work(cursor):
+            cursor.execute("SELECT segment_id, segment_name FROM CustomerSegment ORDER BY segment_name")
+            return cursor.fetchall()
+        
+        def loaded(segments):
+            self.segment_combo['values'] = ["Any segment"] + [f"{row[0]} - {row[1]}" for row in segments]
+        
+        self.executor.submit(work, on_success=loaded, description="Loading segments...",
+                             on_error=lambda e: messagebox.showerror("Error", f"Failed to load segments: {str(e)}"))
+    
+    def search(self):
+        """Run the ranked search with the chosen filters"""
+        if not self.search_ready:
+            return
+        
+        text = self.text_entry.get().strip()
+        if not text:
+            messagebox.showwarning("Warning", "Please enter words to search for", parent=self.dialog)
+            return
+        
+        sources = [source for source, var in self.source_vars.items() if var.get()]
+        if not sources:
+            messagebox.showwarning("Warning", "Please choose at least one record type", parent=self.dialog)
+            return
+        
+        # Validate date formats
+        dates = {}
+        try:
+            for name, entry in self.date_entries.items():
+                if entry.get().strip():
+                    dates[name] = datetime.strptime(entry.get().strip(), '%Y-%m-%d').date()
+        except ValueError:
+            messagebox.showerror("Error", "Please use YYYY-MM-DD format for dates", parent=self.dialog)
+            return
+        
+        segment = self.segment_var.get()
+        segment_id = int(segment.split(' - ')[0]) if ' - ' in segment else None
+        
+        try:
+            sql, params = build_advanced_search(text, sources, segment_id,
+                                                important_only=self.important_var.get(), **dates)
+        except ValueError as e:
+            messagebox.showwarning("Warning", f"{e}. Tick Note or clear the note filters.", parent=self.dialog)
+            return
+        
+        def work(cursor):
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+        
+        def show(results):
+            self.results_tree.delete(*self.results_tree.get_children())
+            for row in results:
+                self.results_tree.insert('', 'end', values=(row[0], row[1], row[2], row[3],
+                                                            f"{row[4]:.3f}", row[5]))
+            self.status_label.config(text=f"Found {len(results)} matching customers")
+        
+        self.status_label.config(text="Searching...")
+        self.executor.submit(work, on_success=show, description="Searching...",
+                             on_error=lambda e: messagebox.showerror("Error", f"Search failed: {str(e)}"))
+
+
 def main():
     """Main function to run the application"""
     root = tk.Tk()
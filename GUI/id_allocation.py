@@ -0,0 +1,97 @@
+# id_allocation.py - Identity-backed primary keys and batched ID pre-allocation
+
+# Keys reserved per nextval round trip during bulk allocation
+ID_BATCH_SIZE = 100000
+
+# Surrogate keys generated by the database: table -> primary key column.
+# CustomerID stays a business key entered by the user.
+IDENTITY_KEYS = {
+    'Address': 'addressID',
+    'Contact': 'contactID',
+    'CustomerDocument': 'document_id',
+    'CustomerNote': 'note_id',
+    'CustomerSegmentAssignment': 'assignment_id'
+}
+
+
+def key_sequence(cursor, table):
+    """Name of the sequence behind a table's identity key, or None if it has none"""
+    cursor.execute("SELECT pg_get_serial_sequence(%s, %s)",
+                   (table.lower(), IDENTITY_KEYS[table].lower()))
+    return cursor.fetchone()[0]
+
+
+def next_sequence_key(cursor, table, sequence):
+    """
+    Next key a table's sequence hands out and the largest existing key, without consuming either
+
+    Returns:
+        tuple: (next_key, max_key)
+    """
+    cursor.execute(f"SELECT COALESCE(MAX({IDENTITY_KEYS[table]}), 0) FROM {table}")
+    max_key = cursor.fetchone()[0]
+    cursor.execute(f"SELECT last_value, is_called FROM {sequence}")
+    last_value, is_called = cursor.fetchone()
+    return (last_value + 1 if is_called else last_value), max_key
+
+
+def lagging_key_sequences(cursor):
+    """Tables whose identity sequence would hand out a key that already exists"""
+    lagging = []
+    for table in IDENTITY_KEYS:
+        sequence = key_sequence(cursor, table)
+        if sequence is not None:
+            next_key, max_key = next_sequence_key(cursor, table, sequence)
+            if next_key <= max_key:
+                lagging.append(table)
+    return lagging
+
+
+def ensure_identity_keys(cursor):
+    """
+    Migrate the surrogate keys to identity columns and sync their sequences
+
+    Keys without a sequence become GENERATED BY DEFAULT AS IDENTITY, so rows
+    loaded with explicit IDs (inserttable.sql, the data_insert scripts) are
+    still accepted. Every sequence is then moved past the largest existing
+    key, which is also needed after such explicit loads. Sequences are only
+    ever moved forward, so running this while others insert is safe.
+
+    Returns:
+        dict: table -> next key the sequence hands out
+    """
+    next_keys = {}
+    for table, column in IDENTITY_KEYS.items():
+        sequence = key_sequence(cursor, table)
+        if sequence is None:
+            cursor.execute(f"ALTER TABLE {table} ALTER COLUMN {column} ADD GENERATED BY DEFAULT AS IDENTITY")
+            sequence = key_sequence(cursor, table)
+
+        next_key, max_key = next_sequence_key(cursor, table, sequence)
+        if next_key <= max_key:
+            cursor.execute("SELECT setval(%s, %s)", (sequence, max_key))
+            next_key = max_key + 1
+        next_keys[table] = next_key
+    return next_keys
+
+
+def allocate_ids(cursor, table, count):
+    """
+    Reserve count keys from a table's identity sequence, ID_BATCH_SIZE per round trip
+
+    For bulk loads that supply their own keys. The keys are unique across
+    sessions but not necessarily consecutive.
+
+    Returns:
+        numpy.ndarray: The reserved keys
+    """
+    # Only bulk loads need NumPy; the key checks done at login do not
+    import numpy as np
+
+    sequence = key_sequence(cursor, table)
+    ids = np.empty(count, dtype=np.int64)
+    for start in range(0, count, ID_BATCH_SIZE):
+        batch = min(ID_BATCH_SIZE, count - start)
+        cursor.execute("SELECT nextval(%s) FROM generate_series(1, %s)", (sequence, batch))
+        ids[start:start + batch] = [row[0] for row in cursor.fetchall()]
+    return ids
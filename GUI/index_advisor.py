@@ -0,0 +1,227 @@
+# index_advisor.py - Find and build the indexes the customer schema is missing
+import json
+from customer_search import create_missing_indexes
+from advanced_search import FILTER_INDEXES
+from report_queries import REPORTS
+from contact_dedup import CONTACT_DEDUP_INDEX, CONTACT_DEDUP_INDEX_SQL
+
+# Table -> (index name, definition) pairs the schema should have; built CONCURRENTLY
+# so the tables stay writable meanwhile
+RECOMMENDED_INDEXES = {
+    # Foreign keys: joins to Customer and the ON DELETE CASCADE of every customer delete
+    'Address': [
+        # Primary addresses are served by primary_address.PRIMARY_ADDRESS_INDEX
+        ('address_customer_id_idx',
+         "CREATE INDEX CONCURRENTLY IF NOT EXISTS address_customer_id_idx ON Address (customer_id)"),
+        # Address grid pages, read in display order
+        ('address_keyset_idx',
+         "CREATE INDEX CONCURRENTLY IF NOT EXISTS address_keyset_idx ON Address (customer_id, addressID)")
+    ],
+    'Contact': [
+        ('contact_customer_id_idx',
+         "CREATE INDEX CONCURRENTLY IF NOT EXISTS contact_customer_id_idx ON Contact (customer_id)"),
+        ('contact_primary_idx',
+         "CREATE INDEX CONCURRENTLY IF NOT EXISTS contact_primary_idx ON Contact (customer_id) "
+         "WHERE is_primary"),
+        # Duplicate groups of contact_dedup, read in window order
+        (CONTACT_DEDUP_INDEX, CONTACT_DEDUP_INDEX_SQL)
+    ],
+    'CustomerDocument': [
+        ('customer_document_customer_id_idx',
+         "CREATE INDEX CONCURRENTLY IF NOT EXISTS customer_document_customer_id_idx "
+         "ON CustomerDocument (customer_id)"),
+        ('customer_document_expiry_idx',
+         "CREATE INDEX CONCURRENTLY IF NOT EXISTS customer_document_expiry_idx "
+         "ON CustomerDocument (expiry_date, customer_id)")
+    ],
+    'CustomerNote': [
+        ('customer_note_customer_id_idx',
+         "CREATE INDEX CONCURRENTLY IF NOT EXISTS customer_note_customer_id_idx "
+         "ON CustomerNote (customer_id)"),
+        ('customer_note_important_idx',
+         "CREATE INDEX CONCURRENTLY IF NOT EXISTS customer_note_important_idx "
+         "ON CustomerNote (note_date DESC) WHERE is_important")
+    ],
+    # (customer_id, segment_id) also serves the customer_id foreign key
+    'CustomerSegmentAssignment': FILTER_INDEXES['CustomerSegmentAssignment'] + [
+        ('segment_assignment_segment_id_idx',
+         "CREATE INDEX CONCURRENTLY IF NOT EXISTS segment_assignment_segment_id_idx "
+         "ON CustomerSegmentAssignment (segment_id)"),
+        # Segment assignment grid pages, read in display order
+        ('segment_assignment_keyset_idx',
+         "CREATE INDEX CONCURRENTLY IF NOT EXISTS segment_assignment_keyset_idx "
+         "ON CustomerSegmentAssignment (customer_id, assigned_date DESC, assignment_id)")
+    ]
+}
+
+# Indexes of RECOMMENDED_INDEXES that serve report filters and grid paging rather than foreign keys
+PREDICATE_INDEXES = {'contact_primary_idx', CONTACT_DEDUP_INDEX, 'customer_document_expiry_idx',
+                     'customer_note_important_idx', 'address_keyset_idx', 'segment_assignment_keyset_idx'}
+
+# Foreign keys whose columns do not lead any index of their table
+UNINDEXED_FOREIGN_KEYS_SQL = """
+    SELECT rel.relname, con.conname,
+           array_agg(att.attname ORDER BY key.ordinality) AS columns
+    FROM pg_constraint con
+    JOIN pg_class rel ON rel.oid = con.conrelid
+    JOIN pg_namespace nsp ON nsp.oid = rel.relnamespace
+    CROSS JOIN LATERAL unnest(con.conkey) WITH ORDINALITY AS key(attnum, ordinality)
+    JOIN pg_attribute att ON att.attrelid = con.conrelid AND att.attnum = key.attnum
+    WHERE con.contype = 'f'
+      AND nsp.nspname = current_schema()
+      AND NOT EXISTS (
+          SELECT 1 FROM pg_index idx
+          WHERE idx.indrelid = con.conrelid
+            AND idx.indisvalid
+            AND idx.indpred IS NULL
+            AND (idx.indkey::int2[])[0:cardinality(con.conkey) - 1] @> con.conkey
+            AND (idx.indkey::int2[])[0:cardinality(con.conkey) - 1] <@ con.conkey
+      )
+    GROUP BY rel.relname, con.conname
+    ORDER BY rel.relname, con.conname
+"""
+
+# Scan counters of the schema's tables, most sequentially scanned rows first
+SCAN_COUNTERS_SQL = """
+    SELECT relname, seq_scan, seq_tup_read, COALESCE(idx_scan, 0), n_live_tup
+    FROM pg_stat_user_tables
+    WHERE schemaname = current_schema()
+    ORDER BY seq_tup_read DESC
+"""
+
+
+def unindexed_foreign_keys(cursor):
+    """(table, constraint, columns) of every foreign key no index can serve"""
+    cursor.execute(UNINDEXED_FOREIGN_KEYS_SQL)
+    return [(row[0], row[1], list(row[2])) for row in cursor.fetchall()]
+
+
+def scan_counters(cursor):
+    """
+    Sequential vs. index scans per table since the statistics were last reset
+
+    Returns:
+        list: dicts with table, seq_scan, seq_tup_read, idx_scan and live_rows
+    """
+    cursor.execute(SCAN_COUNTERS_SQL)
+    return [{'table': row[0], 'seq_scan': row[1], 'seq_tup_read': row[2],
+             'idx_scan': row[3], 'live_rows': row[4]} for row in cursor.fetchall()]
+
+
+def propose_indexes(cursor):
+    """
+    Indexes worth building: the missing RECOMMENDED_INDEXES plus one for any
+    other foreign key left without an index
+
+    Returns:
+        list: dicts with table, index, statement and reason
+    """
+    cursor.execute("""
+        SELECT c.relname FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indexrelid
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = current_schema() AND i.indisvalid
+    """)
+    existing = {row[0] for row in cursor.fetchall()}
+
+    proposals = []
+    for table, indexes in RECOMMENDED_INDEXES.items():
+        for name, statement in indexes:
+            if name not in existing:
+                reason = "query predicate" if name in PREDICATE_INDEXES else "foreign key"
+                proposals.append({'table': table, 'index': name, 'statement': statement, 'reason': reason})
+
+    # Foreign keys added to the schema later than RECOMMENDED_INDEXES
+    for table, constraint, columns in unindexed_foreign_keys(cursor):
+        name = f"{table}_{'_'.join(columns)}_fk_idx"
+        if any(proposal['table'].lower() == table and proposal['reason'] == "foreign key"
+               and proposal['statement'].endswith(f"({', '.join(columns)})") for proposal in proposals):
+            continue
+        proposals.append({'table': table, 'index': name, 'reason': f"foreign key {constraint}",
+                          'statement': f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} "
+                                       f"ON {table} ({', '.join(columns)})"})
+    return proposals
+
+
+def create_indexes(cursor, proposals):
+    """
+    Build proposed indexes CONCURRENTLY and refresh the planner statistics of their tables
+
+    Returns:
+        list: Names of the indexes that were built
+    """
+    by_table = {}
+    for proposal in proposals:
+        by_table.setdefault(proposal['table'], []).append((proposal['index'], proposal['statement']))
+
+    built = []
+    for table, indexes in by_table.items():
+        built += create_missing_indexes(cursor, table, indexes)
+        cursor.execute(f"ANALYZE {table}")
+    return built
+
+
+def ensure_recommended_indexes(cursor):
+    """Auto-indexer: build whatever propose_indexes() finds missing; returns the indexes built"""
+    return create_indexes(cursor, propose_indexes(cursor))
+
+
+def _plan_nodes(node):
+    """Every node of an EXPLAIN (FORMAT JSON) plan tree"""
+    yield node
+    for child in node.get('Plans', []):
+        yield from _plan_nodes(child)
+
+
+def verify_query_plans(cursor, queries=REPORTS):
+    """
+    EXPLAIN each (title, sql) and report which indexes its plan uses
+
+    Small tables are legitimately read with sequential scans, so a sequential
+    scan is only a hint; compare with scan_counters() on real data volumes.
+
+    Returns:
+        list: dicts with title, indexes (names used) and seq_scans (tables scanned)
+    """
+    results = []
+    for title, sql in queries:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}")
+        plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        nodes = list(_plan_nodes(plan[0]['Plan']))
+        results.append({
+            'title': title,
+            'indexes': sorted({node['Index Name'] for node in nodes if 'Index Name' in node}),
+            'seq_scans': sorted({node['Relation Name'] for node in nodes if node['Node Type'] == 'Seq Scan'})
+        })
+    return results
+
+
+def index_report(cursor):
+    """Plain-text advisor report: proposals, scan counters and the report query plans"""
+    lines = ["INDEX ADVISOR", "=" * 40]
+
+    proposals = propose_indexes(cursor)
+    lines.append(f"\nMissing indexes: {len(proposals) or 'none'}")
+    for proposal in proposals:
+        lines.append(f"  {proposal['table']}.{proposal['index']} ({proposal['reason']})")
+
+    lines.append("\nScans per table (sequential / index, rows read sequentially):")
+    for counters in scan_counters(cursor):
+        lines.append(f"  {counters['table']:<26} {counters['seq_scan']:>7} / {counters['idx_scan']:<7} "
+                     f"{counters['seq_tup_read']:>12} rows")
+
+    lines.append("\nReport query plans:")
+    for result in verify_query_plans(cursor):
+        lines.append(f"  {result['title']}")
+        lines.append(f"    indexes: {', '.join(result['indexes']) or 'none'}")
+        if result['seq_scans']:
+            lines.append(f"    sequential scans: {', '.join(result['seq_scans'])}")
+    return "\n".join(lines)
+
+
+def schema_index_statements():
+    """RECOMMENDED_INDEXES as plain CREATE INDEX statements, for building a fresh schema"""
+    return [statement.replace("CONCURRENTLY ", "")
+            for indexes in RECOMMENDED_INDEXES.values() for _, statement in indexes]
@@ -65,7 +65,7 @@ def show_setup_menu():
         print("Creating tkinter window...")
         root = tk.Tk()
         root.title("Customer Database Setup")
-        root.geometry("500x400")
+        root.geometry("500x440")
         
         # Main frame
         main_frame = tk.Frame(root, padx=20, pady=20)
@@ -102,7 +102,10 @@ def show_setup_menu():
         tk.Button(buttons_frame, text="5. Check Docker PostgreSQL", 
                  command=lambda: check_docker_gui(root), **button_config).pack(pady=2)
         
-        tk.Button(buttons_frame, text="6. Exit", 
+        tk.Button(buttons_frame, text="6. Schedule Maintenance Jobs", 
+                 command=lambda: schedule_maintenance_gui(root), **button_config).pack(pady=2)
+        
+        tk.Button(buttons_frame, text="7. Exit", 
                  command=root.quit, **button_config).pack(pady=2)
         
         # Status label
@@ -163,11 +166,27 @@ def init_database_gui(parent):
                                "Database initialization will start in the console.\n\nCheck the console window for progress.")
             try:
                 import db_utils
+                from config import DatabaseConfig
+                from connection_pool import DatabasePool
+                
+                # Connection settings come from DatabaseConfig (DB_HOST, DB_PORT, ... environment variables)
+                db_config = DatabaseConfig()
+                if not db_config.get_config()['password']:
+                    password = simpledialog.askstring("Database Password", "Enter PostgreSQL password:",
+                                                      show='*', parent=parent)
+                    if password is None:
+                        return
+                    db_config.update_config(password=password)
+                
                 # Run in a separate thread to avoid blocking GUI
                 import threading
                 def run_init():
                     try:
-                        db_utils.main()
+                        pool = DatabasePool(db_config)
+                        try:
+                            db_utils.main(pool)
+                        finally:
+                            pool.close()
                         messagebox.showinfo("Success", "Database initialization completed!")
                     except Exception as e:
                         messagebox.showerror("Error", f"Database initialization failed: {e}")
@@ -181,6 +200,74 @@ def init_database_gui(parent):
     except Exception as e:
         messagebox.showerror("Error", f"Error during database initialization: {e}")
 
+# Scheduler started by schedule_maintenance_gui; later calls reschedule it
+maintenance_scheduler = None
+
+def schedule_maintenance_gui(parent):
+    """Run the maintenance jobs now, or every few minutes in the background"""
+    global maintenance_scheduler
+    try:
+        missing_deps = check_dependencies()
+        if 'psycopg2' in missing_deps:
+            messagebox.showerror("Error", "psycopg2 is required for database operations.\n\nInstall with: pip install psycopg2-binary")
+            return
+        
+        from config import DatabaseConfig
+        from connection_pool import DatabasePool
+        from maintenance_jobs import MAINTENANCE_INTERVAL, MAINTENANCE_JOBS, MaintenanceJob, MaintenanceScheduler
+        
+        minutes = simpledialog.askinteger("Maintenance Jobs",
+                                          "Run maintenance jobs every how many minutes?\n(0 = run once now)",
+                                          initialvalue=MAINTENANCE_INTERVAL // 60, minvalue=0, parent=parent)
+        if minutes is None:
+            return
+        
+        if maintenance_scheduler is not None:
+            if minutes:
+                maintenance_scheduler.interval = minutes * 60
+            maintenance_scheduler.run_now()
+            messagebox.showinfo("Maintenance Jobs", "Maintenance jobs started.\n\nCheck the console for rows/sec.")
+            return
+        
+        # Connection settings come from DatabaseConfig (DB_HOST, DB_PORT, ... environment variables)
+        db_config = DatabaseConfig()
+        if not db_config.get_config()['password']:
+            password = simpledialog.askstring("Database Password", "Enter PostgreSQL password:",
+                                              show='*', parent=parent)
+            if password is None:
+                return
+            db_config.update_config(password=password)
+        
+        pool = DatabasePool(db_config)
+        if minutes:
+            maintenance_scheduler = MaintenanceScheduler(pool, interval=minutes * 60)
+            maintenance_scheduler.start(run_now=True)
+            messagebox.showinfo("Maintenance Jobs",
+                                f"Maintenance jobs run now and every {minutes} minutes.\n\nCheck the console for rows/sec.")
+            return
+        
+        # One run in a separate thread to avoid blocking GUI
+        import threading
+        def run_jobs():
+            try:
+                try:
+                    results = [MaintenanceJob(pool, name).run() for name in MAINTENANCE_JOBS]
+                finally:
+                    pool.close()
+                summary = "\n".join(f"{result['job']}: {result['rows']:,} rows in {result['seconds']:.2f}s "
+                                    f"({result['rows_per_second']:,.0f} rows/s)" for result in results)
+                messagebox.showinfo("Success", f"Maintenance jobs completed!\n\n{summary}")
+            except Exception as e:
+                messagebox.showerror("Error", f"Maintenance jobs failed: {e}")
+        
+        thread = threading.Thread(target=run_jobs)
+        thread.daemon = True
+        thread.start()
+    except ImportError as e:
+        messagebox.showerror("Error", f"Could not import maintenance_jobs: {e}")
+    except Exception as e:
+        messagebox.showerror("Error", f"Error scheduling maintenance jobs: {e}")
+
 def launch_gui_app(parent):
     """Launch the main GUI application"""
     try:
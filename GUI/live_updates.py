@@ -0,0 +1,239 @@
+# live_updates.py - Row change notifications with LISTEN/NOTIFY
+import json
+import queue
+import select
+import threading
+import psycopg2
+import psycopg2.extensions
+
+# Notification channel the triggers publish on
+CHANGE_CHANNEL = 'table_changes'
+
+# Keys per notification; statements touching more rows ask listeners to reload instead
+NOTIFY_KEYS_PER_MESSAGE = 200
+NOTIFY_MAX_KEYS = 2000
+
+# Seconds the listener waits for a notification before checking whether to stop
+LISTEN_TIMEOUT = 1.0
+
+# Seconds between reconnect attempts after the listener connection drops
+RECONNECT_DELAY = 5.0
+
+# How often the Tk thread picks up received notifications, in milliseconds
+DISPATCH_INTERVAL_MS = 200
+
+# Table -> primary key column published by its triggers
+NOTIFY_TABLES = {
+    'Customer': 'CustomerID',
+    'Address': 'addressID',
+    'CustomerSegmentAssignment': 'assignment_id'
+}
+
+# Event -> transition tables of its trigger; a trigger with transition tables can only
+# handle one event, hence three per table
+NOTIFY_EVENTS = {
+    'INSERT': 'NEW TABLE AS new_rows',
+    'UPDATE': 'NEW TABLE AS new_rows OLD TABLE AS old_rows',
+    'DELETE': 'OLD TABLE AS old_rows'
+}
+
+# Statement-level trigger function: publishes the keys of every row a statement touched.
+# Transition tables keep bulk statements to a handful of notifications instead of one per row.
+NOTIFY_FUNCTION_SQL = f"""
+    CREATE OR REPLACE FUNCTION notify_row_changes() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    DECLARE
+        key_column TEXT := TG_ARGV[0];
+        changed TEXT[];
+        total INT;
+    BEGIN
+        -- Count (at most one past the limit) before aggregating, so bulk statements such as
+        -- COPY loads go straight to RELOAD without sorting every key
+        IF TG_OP = 'DELETE' THEN
+            SELECT count(*) INTO total FROM (SELECT 1 FROM old_rows LIMIT {NOTIFY_MAX_KEYS + 1}) changed_rows;
+        ELSE
+            SELECT count(*) INTO total FROM (SELECT 1 FROM new_rows LIMIT {NOTIFY_MAX_KEYS + 1}) changed_rows;
+        END IF;
+        IF total = 0 THEN
+            RETURN NULL;
+        ELSIF total > {NOTIFY_MAX_KEYS} THEN
+            PERFORM pg_notify('{CHANGE_CHANNEL}', json_build_object(
+                'table', TG_TABLE_NAME, 'op', 'RELOAD', 'keys', '[]'::json)::text);
+            RETURN NULL;
+        END IF;
+
+        IF TG_OP = 'INSERT' THEN
+            EXECUTE format('SELECT array_agg(DISTINCT %I::text) FROM new_rows', key_column) INTO changed;
+        ELSIF TG_OP = 'DELETE' THEN
+            EXECUTE format('SELECT array_agg(DISTINCT %I::text) FROM old_rows', key_column) INTO changed;
+        ELSE
+            EXECUTE format('SELECT array_agg(DISTINCT k) FROM (SELECT %1$I::text AS k FROM new_rows '
+                           'UNION SELECT %1$I::text FROM old_rows) keys', key_column) INTO changed;
+        END IF;
+
+        -- An update that changes keys touches up to twice as many keys as rows
+        total := coalesce(array_length(changed, 1), 0);
+        IF total > {NOTIFY_MAX_KEYS} THEN
+            PERFORM pg_notify('{CHANGE_CHANNEL}', json_build_object(
+                'table', TG_TABLE_NAME, 'op', 'RELOAD', 'keys', '[]'::json)::text);
+            RETURN NULL;
+        END IF;
+
+        FOR i IN 1..total BY {NOTIFY_KEYS_PER_MESSAGE} LOOP
+            PERFORM pg_notify('{CHANGE_CHANNEL}', json_build_object(
+                'table', TG_TABLE_NAME, 'op', TG_OP,
+                'keys', to_json(changed[i:i + {NOTIFY_KEYS_PER_MESSAGE - 1}]))::text);
+        END LOOP;
+        RETURN NULL;
+    END $$
+"""
+
+
+def notify_trigger_name(table, event):
+    """Name of the trigger publishing one event of a table"""
+    return f"{table.lower()}_notify_{event.lower()}"
+
+
+def existing_notify_triggers(cursor):
+    """The notification triggers of NOTIFY_TABLES that exist"""
+    names = [notify_trigger_name(table, event) for table in NOTIFY_TABLES for event in NOTIFY_EVENTS]
+    cursor.execute("SELECT tgname FROM pg_trigger WHERE tgname = ANY(%s)", (names,))
+    return {row[0] for row in cursor.fetchall()}
+
+
+def ensure_change_notifications(cursor):
+    """
+    Install the notify function and the NOTIFY_EVENTS triggers of NOTIFY_TABLES
+
+    Existing triggers are left alone. Returns the triggers created.
+    """
+    cursor.execute(NOTIFY_FUNCTION_SQL)
+    existing = existing_notify_triggers(cursor)
+
+    created = []
+    for table, key_column in NOTIFY_TABLES.items():
+        for event, transition in NOTIFY_EVENTS.items():
+            name = notify_trigger_name(table, event)
+            if name in existing:
+                continue
+            cursor.execute(f"""
+                CREATE TRIGGER {name}
+                AFTER {event} ON {table}
+                REFERENCING {transition}
+                FOR EACH STATEMENT EXECUTE FUNCTION notify_row_changes('{key_column.lower()}')
+            """)
+            created.append(name)
+    return created
+
+
+class ChangeListener:
+    """
+    Receive row change notifications on a background thread
+
+    The thread keeps its own autocommit connection LISTENing on CHANGE_CHANNEL
+    and queues what arrives; the Tk thread drains the queue with root.after and
+    calls the handler subscribed for the changed table with (operation, keys).
+    Operation is INSERT, UPDATE, DELETE, or RELOAD when too many rows changed
+    (or notifications may have been missed while reconnecting).
+
+    Parameters:
+        root (tk.Tk): Application root window
+        connect_params (dict): Keyword arguments for psycopg2.connect
+    """
+
+    def __init__(self, root, connect_params):
+        self.root = root
+        self.connect_params = connect_params
+        self.handlers = {}
+        self.changes = queue.Queue()
+        self.connected = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._after_id = None
+
+    def subscribe(self, table, handler):
+        """Call handler(operation, keys) for changes to table, replacing any earlier handler"""
+        self.handlers[table.lower()] = handler
+
+    def unsubscribe(self, table):
+        """Stop calling the handler of table"""
+        self.handlers.pop(table.lower(), None)
+
+    def start(self):
+        """Start listening and dispatching"""
+        self._thread = threading.Thread(target=self._listen, name='change-listener', daemon=True)
+        self._thread.start()
+        self._after_id = self.root.after(DISPATCH_INTERVAL_MS, self._dispatch)
+
+    def stop(self):
+        """Stop the listener thread and the dispatch loop"""
+        self._stop.set()
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    @property
+    def active(self):
+        """True while the listener is connected, so changes will show up without reloading"""
+        return self.connected.is_set()
+
+    def _listen(self):
+        """Listener thread: LISTEN, queue notifications, reconnect when the connection drops"""
+        reconnecting = False
+        while not self._stop.is_set():
+            try:
+                connection = psycopg2.connect(**self.connect_params)
+            except psycopg2.Error:
+                self._stop.wait(RECONNECT_DELAY)
+                continue
+
+            try:
+                connection.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+                with connection.cursor() as cursor:
+                    cursor.execute(f"LISTEN {CHANGE_CHANNEL}")
+                if reconnecting:
+                    # Changes made while disconnected were not seen
+                    for table in list(self.handlers):
+                        self.changes.put((table, 'RELOAD', []))
+                reconnecting = True
+                self.connected.set()
+
+                while not self._stop.is_set():
+                    if select.select([connection], [], [], LISTEN_TIMEOUT) == ([], [], []):
+                        continue
+                    connection.poll()
+                    while connection.notifies:
+                        self._queue(connection.notifies.pop(0).payload)
+            except (psycopg2.Error, OSError):
+                self._stop.wait(RECONNECT_DELAY)
+            finally:
+                self.connected.clear()
+                connection.close()
+
+    def _queue(self, payload):
+        """Listener thread: decode one notification"""
+        try:
+            change = json.loads(payload)
+        except ValueError:
+            return
+        keys = [int(key) if key.lstrip('-').isdigit() else key for key in change.get('keys') or []]
+        self.changes.put((change['table'], change['op'], keys))
+
+    def _dispatch(self):
+        """Tk thread: hand queued changes to the subscribed handlers"""
+        self._after_id = None
+        while True:
+            try:
+                table, operation, keys = self.changes.get_nowait()
+            except queue.Empty:
+                break
+            handler = self.handlers.get(table)
+            if handler is None:
+                continue
+            try:
+                handler(operation, keys)
+            except Exception:
+                # The screen that subscribed was closed meanwhile
+                self.handlers.pop(table, None)
+        if not self._stop.is_set():
+            self._after_id = self.root.after(DISPATCH_INTERVAL_MS, self._dispatch)
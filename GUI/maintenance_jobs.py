@@ -0,0 +1,262 @@
+# maintenance_jobs.py - Resumable, throttled batch jobs for bulk maintenance updates
+import threading
+import time
+from datetime import datetime
+
+# Rows changed per batch; every batch is its own short transaction
+MAINTENANCE_BATCH_SIZE = 1000
+
+# Seconds slept between batches, leaving the tables to interactive work
+MAINTENANCE_PAUSE = 0.05
+
+# Seconds between scheduled runs started from the launcher
+MAINTENANCE_INTERVAL = 3600
+
+# Progress of every job, committed together with each batch so a stopped run resumes where it left off
+CHECKPOINT_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS maintenance_checkpoint (
+        job_name VARCHAR(50) PRIMARY KEY,
+        last_key BIGINT NOT NULL DEFAULT 0,
+        rows_done BIGINT NOT NULL DEFAULT 0,
+        started_at TIMESTAMP NOT NULL DEFAULT now(),
+        updated_at TIMESTAMP NOT NULL DEFAULT now(),
+        finished_at TIMESTAMP
+    )
+"""
+
+# Job name -> 'batch': one keyset batch taking %(last_key)s and %(batch_size)s, returning the
+# highest key it scanned and the number of rows it changed; 'remaining': whether candidate rows
+# are left past %(last_key)s. Rows already in the target state are never touched, and SKIP LOCKED
+# leaves rows a GUI edit is holding to the next run instead of waiting for them, so a short batch
+# does not mean the table is done.
+MAINTENANCE_JOBS = {
+    'expire_documents': {
+        'batch': """
+            WITH batch AS (
+                SELECT document_id
+                FROM CustomerDocument
+                WHERE document_id > %(last_key)s
+                  AND expiry_date <= CURRENT_DATE
+                  AND verification_status IS DISTINCT FROM FALSE
+                ORDER BY document_id
+                LIMIT %(batch_size)s
+                FOR UPDATE SKIP LOCKED
+            ), changed AS (
+                UPDATE CustomerDocument D
+                SET verification_status = FALSE
+                FROM batch
+                WHERE D.document_id = batch.document_id
+                RETURNING D.document_id
+            )
+            SELECT (SELECT MAX(document_id) FROM batch), (SELECT COUNT(*) FROM changed)
+        """,
+        'remaining': """
+            SELECT EXISTS (
+                SELECT 1 FROM CustomerDocument
+                WHERE document_id > %(last_key)s
+                  AND expiry_date <= CURRENT_DATE
+                  AND verification_status IS DISTINCT FROM FALSE
+            )
+        """
+    }
+}
+
+
+def ensure_checkpoint_table(cursor):
+    """Create the maintenance_checkpoint table if it does not exist"""
+    cursor.execute(CHECKPOINT_TABLE_SQL)
+
+
+class MaintenanceJob:
+    """
+    Run one MAINTENANCE_JOBS entry in keyset-ordered batches, committing each
+
+    Each batch and its checkpoint row commit together, so stopping (or a
+    crash) between batches loses nothing: the next run of the job carries on
+    after the last committed key. A run is marked finished once no candidate
+    rows are left past that key, and the next one starts again from the
+    beginning. When the only candidates left are locked by other sessions the
+    run stops unfinished, and the next one resumes at the locked rows.
+
+    Parameters:
+        db_pool (DatabasePool): Pool the batches borrow a connection from
+        name (str): Key of MAINTENANCE_JOBS
+        batch_size (int): Rows changed per batch
+        pause (float): Seconds slept between batches
+    """
+
+    def __init__(self, db_pool, name, batch_size=MAINTENANCE_BATCH_SIZE, pause=MAINTENANCE_PAUSE):
+        self.db_pool = db_pool
+        self.name = name
+        self.batch_sql = MAINTENANCE_JOBS[name]['batch']
+        self.remaining_sql = MAINTENANCE_JOBS[name]['remaining']
+        self.batch_size = batch_size
+        self.pause = pause
+
+        self.stop = threading.Event()
+        self.rows = 0
+        self.batches = 0
+        self.started = None
+
+    def rows_per_second(self):
+        """Rows changed per second so far in this run"""
+        if self.started is None:
+            return 0.0
+        return self.rows / max(time.perf_counter() - self.started, 1e-9)
+
+    def status(self):
+        """Progress text for the progress window"""
+        return f"{self.rows:,} rows in {self.batches} batches ({self.rows_per_second():,.0f} rows/s)"
+
+    def _start(self):
+        """Resume the unfinished run of this job, or begin a new one; returns the key to start after"""
+        with self.db_pool.cursor() as cursor:
+            ensure_checkpoint_table(cursor)
+            cursor.execute("SELECT last_key FROM maintenance_checkpoint "
+                           "WHERE job_name = %s AND finished_at IS NULL", (self.name,))
+            row = cursor.fetchone()
+            if row is not None:
+                return row[0]
+            cursor.execute("""
+                INSERT INTO maintenance_checkpoint (job_name) VALUES (%s)
+                ON CONFLICT (job_name) DO UPDATE
+                SET last_key = 0, rows_done = 0, started_at = now(), updated_at = now(), finished_at = NULL
+            """, (self.name,))
+            return 0
+
+    def run(self):
+        """
+        Run batches until the job is done, the rows left are all locked, or stop is set
+
+        Returns:
+            dict: job, rows, batches, seconds, rows_per_second, resumed_from
+                (0 for a fresh run) and finished (False when stopped early)
+        """
+        last_key = resumed_from = self._start()
+        self.started = time.perf_counter()
+        finished = locked = False
+
+        while True:
+            with self.db_pool.cursor() as cursor:
+                cursor.execute(self.batch_sql, {'last_key': last_key, 'batch_size': self.batch_size})
+                scanned_key, changed = cursor.fetchone()
+                if scanned_key is not None:
+                    last_key = scanned_key
+                cursor.execute(self.remaining_sql, {'last_key': last_key})
+                remaining = cursor.fetchone()[0]
+                finished = not remaining
+                # Candidates are left but the batch could lock none of them
+                locked = remaining and scanned_key is None
+                cursor.execute("""
+                    UPDATE maintenance_checkpoint
+                    SET last_key = %s, rows_done = rows_done + %s, updated_at = now(),
+                        finished_at = CASE WHEN %s THEN now() END
+                    WHERE job_name = %s
+                """, (last_key, changed, finished, self.name))
+            self.rows += changed
+            self.batches += 1
+
+            if finished or locked or self.stop.wait(self.pause):
+                break
+
+        seconds = time.perf_counter() - self.started
+        outcome = '' if finished else ' - rows locked, will resume' if locked else ' - stopped, will resume'
+        print(f"🧹 {self.name}: {self.rows:,} rows in {self.batches} batches, {seconds:.2f}s "
+              f"({self.rows_per_second():,.0f} rows/s){outcome}")
+        return {'job': self.name, 'rows': self.rows, 'batches': self.batches, 'seconds': seconds,
+                'rows_per_second': self.rows_per_second(), 'resumed_from': resumed_from,
+                'finished': finished}
+
+
+class MaintenanceScheduler:
+    """
+    Run every MAINTENANCE_JOBS entry on a background thread every interval seconds
+
+    Parameters:
+        db_pool (DatabasePool): Pool the jobs borrow connections from
+        interval (float): Seconds between runs
+        batch_size (int): Rows changed per batch
+        pause (float): Seconds slept between batches
+    """
+
+    def __init__(self, db_pool, interval=MAINTENANCE_INTERVAL, batch_size=MAINTENANCE_BATCH_SIZE,
+                 pause=MAINTENANCE_PAUSE):
+        self.db_pool = db_pool
+        self.interval = interval
+        self.batch_size = batch_size
+        self.pause = pause
+        self.last_run = None
+        self.last_results = []
+        self.last_error = None
+        self._job = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self, run_now=False):
+        """Start the schedule, optionally with an immediate first run"""
+        if run_now:
+            self._wake.set()
+        self._thread = threading.Thread(target=self._run, name='maintenance-jobs', daemon=True)
+        self._thread.start()
+
+    def run_now(self):
+        """Ask for a run without waiting for the schedule"""
+        self._wake.set()
+
+    def stop(self):
+        """Stop the schedule; a job in progress stops after its current batch and resumes next time"""
+        self._stop.set()
+        self._wake.set()
+        job = self._job
+        if job is not None:
+            job.stop.set()
+
+    def describe(self):
+        """Outcome of the last run"""
+        if self.last_run is None:
+            return "maintenance jobs not run yet"
+        results = ", ".join(f"{result['job']} {result['rows']:,} rows ({result['rows_per_second']:,.0f} rows/s)"
+                            for result in self.last_results)
+        return f"maintenance jobs ran {self.last_run:%H:%M:%S}: {results or 'nothing to do'}"
+
+    def _run(self):
+        """Background thread: run every job, then sleep until the next interval or run_now()"""
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                return
+            results = []
+            try:
+                for name in MAINTENANCE_JOBS:
+                    self._job = MaintenanceJob(self.db_pool, name, self.batch_size, self.pause)
+                    if self._stop.is_set():
+                        return
+                    results.append(self._job.run())
+                self.last_error = None
+            except Exception as e:
+                self.last_error = e
+                print(f"❌ Maintenance job failed: {e}")
+            finally:
+                self._job = None
+            self.last_run = datetime.now()
+            self.last_results = results
+
+
+if __name__ == "__main__":
+    from config import DatabaseConfig
+    from connection_pool import DatabasePool
+
+    # Connection settings come from DatabaseConfig (DB_HOST, DB_PORT, ... environment variables);
+    # run from cron to schedule the jobs outside the launcher
+    db_config = DatabaseConfig()
+    if not db_config.get_config()['password']:
+        db_config.update_config(password=input("Enter PostgreSQL password: "))
+
+    db_pool = DatabasePool(db_config)
+    try:
+        for job_name in MAINTENANCE_JOBS:
+            MaintenanceJob(db_pool, job_name).run()
+    finally:
+        db_pool.close()
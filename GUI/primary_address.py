@@ -0,0 +1,110 @@
+# primary_address.py - One primary address per customer, enforced by a partial unique index
+from contextlib import contextmanager
+from psycopg2 import errors
+from customer_search import create_missing_indexes
+
+# Partial unique index replacing the per-row trg_check_primary_address trigger
+PRIMARY_ADDRESS_INDEX = 'address_one_primary_idx'
+PRIMARY_ADDRESS_INDEX_SQL = (f"CREATE UNIQUE INDEX IF NOT EXISTS {PRIMARY_ADDRESS_INDEX} "
+                             f"ON Address (customer_id) WHERE is_primary")
+
+# Message the trigger used to raise; now shown by the application when the index rejects a row
+PRIMARY_ADDRESS_MESSAGE = 'כבר קיימת כתובת ראשית ללקוח זה'
+
+# Customers with more than one primary address, in one pass over Address
+DUPLICATE_PRIMARY_SQL = """
+    SELECT customer_id, COUNT(*)
+    FROM Address
+    WHERE is_primary
+    GROUP BY customer_id
+    HAVING COUNT(*) > 1
+    ORDER BY customer_id
+"""
+
+# Duplicates listed in the error of a failed bulk load check
+MAX_REPORTED_DUPLICATES = 10
+
+
+class DuplicatePrimaryAddressError(Exception):
+    """Raised by the deferred bulk load check when customers end up with several primary addresses"""
+
+    def __init__(self, duplicates):
+        self.duplicates = duplicates
+        shown = ', '.join(str(customer_id) for customer_id, _ in duplicates[:MAX_REPORTED_DUPLICATES])
+        more = f" (+{len(duplicates) - MAX_REPORTED_DUPLICATES} more)" if len(duplicates) > MAX_REPORTED_DUPLICATES else ""
+        super().__init__(f"{PRIMARY_ADDRESS_MESSAGE}: customers {shown}{more}")
+
+
+def is_primary_address_violation(error):
+    """Whether a database error is the partial unique index rejecting a second primary address"""
+    return (isinstance(error, errors.UniqueViolation)
+            and getattr(error.diag, 'constraint_name', None) == PRIMARY_ADDRESS_INDEX)
+
+
+def describe_error(error):
+    """Text for an error raised while saving an address, with index violations in the trigger's words"""
+    if is_primary_address_violation(error):
+        return PRIMARY_ADDRESS_MESSAGE
+    return str(error)
+
+
+def find_duplicate_primaries(cursor):
+    """(customer_id, primary address count) of every customer with more than one primary address"""
+    cursor.execute(DUPLICATE_PRIMARY_SQL)
+    return [(row[0], row[1]) for row in cursor.fetchall()]
+
+
+def primary_address_index_valid(cursor):
+    """Whether the partial unique index exists and is valid (a failed concurrent build leaves it invalid)"""
+    cursor.execute("SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(%s)", (PRIMARY_ADDRESS_INDEX,))
+    row = cursor.fetchone()
+    return row is not None and row[0]
+
+
+def ensure_primary_address_index(cursor):
+    """
+    Replace the check_primary_address trigger with the partial unique index
+
+    The index is only built when the data already satisfies it, so existing
+    duplicates are reported instead of failing the build. The trigger is
+    dropped only once the index is in place and valid; until then it keeps
+    enforcing the rule.
+
+    Returns:
+        list: Duplicate (customer_id, count) pairs blocking the index, empty once it exists
+    """
+    duplicates = find_duplicate_primaries(cursor)
+    if duplicates:
+        return duplicates
+
+    create_missing_indexes(cursor, 'Address', [
+        (PRIMARY_ADDRESS_INDEX, PRIMARY_ADDRESS_INDEX_SQL.replace("INDEX IF", "INDEX CONCURRENTLY IF"))
+    ])
+    if not primary_address_index_valid(cursor):
+        raise RuntimeError(f"{PRIMARY_ADDRESS_INDEX} is not valid; keeping the check_primary_address trigger")
+
+    cursor.execute("DROP TRIGGER IF EXISTS trg_check_primary_address ON Address")
+    cursor.execute("DROP FUNCTION IF EXISTS check_primary_address()")
+    # The plain partial index the index advisor used to build is covered by the unique one
+    cursor.execute("DROP INDEX IF EXISTS address_primary_idx")
+    return []
+
+
+@contextmanager
+def deferred_primary_address_check(cursor):
+    """
+    Validate primary addresses once, after a bulk load, instead of per row
+
+    Inside the caller's transaction the unique index is dropped for the
+    duration of the load. Afterwards one GROUP BY finds any customer with
+    several primary addresses (raising DuplicatePrimaryAddressError, which
+    rolls the load back with the caller's transaction), and the index is
+    rebuilt in a single sorted pass. Other sessions wait on the Address table
+    lock until the transaction ends.
+    """
+    cursor.execute(f"DROP INDEX IF EXISTS {PRIMARY_ADDRESS_INDEX}")
+    yield
+    duplicates = find_duplicate_primaries(cursor)
+    if duplicates:
+        raise DuplicatePrimaryAddressError(duplicates)
+    cursor.execute(PRIMARY_ADDRESS_INDEX_SQL)
@@ -0,0 +1,325 @@
+# query_executor.py - Run database work off the Tk main loop
+import itertools
+import queue
+import threading
+import time
+import tkinter as tk
+from tkinter import ttk, messagebox
+from concurrent.futures import ThreadPoolExecutor
+from psycopg2.extensions import QueryCanceledError
+from psycopg2.extras import DictCursor
+
+# How often the Tk thread checks for finished jobs, in milliseconds
+POLL_INTERVAL_MS = 50
+
+# Jobs running longer than this show the progress / cancel window, in milliseconds
+PROGRESS_DELAY_MS = 400
+
+# Rows per server-side cursor fetch when streaming a result
+STREAM_CHUNK_ROWS = 500
+
+# Fetched chunks that may wait for the Tk thread before the worker pauses
+STREAM_QUEUE_CHUNKS = 8
+
+# Chunks rendered per poll, so a large result never stalls the main loop
+STREAM_CHUNKS_PER_POLL = 4
+
+# Workers of the background lane, where exports, reports, maintenance and schema jobs run so
+# that paging, search and edits on the interactive lane never queue behind them
+BACKGROUND_WORKERS = 1
+
+
+class ProgressIndicator:
+    """Small window with a busy bar and a Cancel button for long-running queries"""
+
+    def __init__(self, root, on_cancel):
+        self.root = root
+        self.on_cancel = on_cancel
+        self.window = None
+        self.label = None
+
+    def show(self, description):
+        """Show the window, or update its text if it is already open"""
+        if self.window is not None and self.window.winfo_exists():
+            self.label.config(text=description)
+            return
+
+        self.window = tk.Toplevel(self.root)
+        self.window.title("Working...")
+        self.window.geometry("320x140")
+        self.window.resizable(False, False)
+        self.window.transient(self.root)
+        self.window.protocol("WM_DELETE_WINDOW", self.on_cancel)
+
+        self.label = tk.Label(self.window, text=description, font=('Arial', 10))
+        self.label.pack(pady=(15, 5))
+
+        progress = ttk.Progressbar(self.window, mode='indeterminate', length=260)
+        progress.pack(pady=5)
+        progress.start(10)
+
+        tk.Button(self.window, text="Cancel", command=self.on_cancel,
+                  bg='#e74c3c', fg='white', font=('Arial', 10, 'bold')).pack(pady=5)
+
+    def hide(self):
+        """Close the window if it is open"""
+        if self.window is not None and self.window.winfo_exists():
+            self.window.destroy()
+        self.window = None
+
+
+class QueryExecutor:
+    """
+    Run database work on worker threads with pooled connections
+
+    Jobs run in two lanes: the interactive lane (paging, search, edits) and
+    the background lane for long jobs, submitted with background=True. Within
+    a lane jobs run one at a time in submission order. Each job runs on a
+    connection checked out of the pool for that job and in its own
+    transaction: committed when the job returns, rolled back when it raises.
+    Results are handed back to the Tk thread by polling with root.after, so
+    callbacks may touch widgets freely.
+
+    Parameters:
+        root (tk.Tk): Application root window
+        db_pool (DatabasePool): Connections for the jobs; closed by shutdown()
+    """
+
+    def __init__(self, root, db_pool, poll_interval=POLL_INTERVAL_MS,
+                 progress_delay=PROGRESS_DELAY_MS):
+        self.root = root
+        self.db_pool = db_pool
+        self.connect_params = db_pool.connect_params
+        self.poll_interval = poll_interval
+        self.progress_delay = progress_delay
+
+        self.pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='query-executor')
+        self.background_pool = ThreadPoolExecutor(max_workers=BACKGROUND_WORKERS,
+                                                  thread_name_prefix='query-background')
+        self.pending = []
+        self.progress = ProgressIndicator(root, self._cancel_shown)
+        self._shown = None
+        self._poll_id = None
+        self._stream_ids = itertools.count(1)
+
+        # Token -> connection of the jobs whose statements are running right now
+        self._lock = threading.Lock()
+        self._running = {}
+
+    def _run(self, work, args, token=None):
+        """Worker thread: run one job on a pooled connection in its own transaction"""
+        connection = self.db_pool.getconn()
+        try:
+            with self._lock:
+                self._running[token] = connection
+            try:
+                with connection.cursor(cursor_factory=DictCursor) as cursor:
+                    result = work(cursor, *args)
+            finally:
+                with self._lock:
+                    self._running.pop(token, None)
+            connection.commit()
+            return result
+        except Exception:
+            if not connection.closed:
+                connection.rollback()
+            raise
+        finally:
+            self.db_pool.putconn(connection)
+
+    def submit(self, work, *args, on_success=None, on_error=None, description="Running query...",
+               stop=None, status=None, background=False):
+        """
+        Queue work(cursor, *args) on the worker thread
+
+        on_success(result) or on_error(exception) is called on the Tk thread
+        when the job finishes; without on_error, failures are shown in a
+        message box. Returns the job's Future.
+
+        Long jobs that do work between statements can pass a threading.Event as
+        stop, which cancel() sets, and a status() callable whose text is shown
+        under the description in the progress window.
+
+        Long jobs pass background=True to run in the background lane.
+        """
+        token = object()
+        return self._queue(self._lane(background).submit(self._run, work, args, token), on_success, on_error,
+                           description, token, stop=stop, status=status)
+
+    def _lane(self, background):
+        """Thread pool of the interactive or the background lane"""
+        return self.background_pool if background else self.pool
+
+    def stream(self, sql, params=None, on_rows=None, on_success=None, on_error=None,
+               chunk_size=STREAM_CHUNK_ROWS, description="Running query...", background=False):
+        """
+        Run a query on a named server-side cursor and hand its rows over in chunks
+
+        The worker fetches chunk_size rows at a time (the cursor's itersize) and
+        passes each chunk to on_rows(rows) on the Tk thread, so the first rows
+        show up as soon as the server produces them and neither side ever holds
+        the whole result. At most STREAM_QUEUE_CHUNKS chunks wait in between; the
+        worker pauses fetching while the queue is full. on_success(row_count) is
+        called after the last chunk.
+        """
+        chunks = queue.Queue(maxsize=STREAM_QUEUE_CHUNKS)
+        stop = threading.Event()
+        cursor_name = f"gui_stream_{next(self._stream_ids)}"
+
+        def work(cursor):
+            total = 0
+            with cursor.connection.cursor(name=cursor_name, cursor_factory=DictCursor) as named:
+                named.itersize = chunk_size
+                named.execute(sql, params)
+                while True:
+                    rows = named.fetchmany(chunk_size)
+                    if not rows:
+                        return total
+                    total += len(rows)
+                    while True:
+                        if stop.is_set():
+                            raise QueryCanceledError("canceling statement due to user request")
+                        try:
+                            chunks.put(rows, timeout=0.1)
+                            break
+                        except queue.Full:
+                            continue
+
+        token = object()
+        return self._queue(self._lane(background).submit(self._run, work, (), token), on_success, on_error,
+                           description, token, chunks=chunks, on_rows=on_rows, stop=stop)
+
+    def _queue(self, future, on_success, on_error, description, token, chunks=None, on_rows=None,
+               stop=None, status=None):
+        """Track a submitted job until _poll dispatches its results"""
+        self.pending.append({
+            'future': future,
+            'token': token,
+            'on_success': on_success,
+            'on_error': on_error,
+            'description': description,
+            'started': time.monotonic(),
+            'chunks': chunks,
+            'on_rows': on_rows,
+            'stop': stop,
+            'status': status
+        })
+        if self._poll_id is None:
+            self._poll_id = self.root.after(self.poll_interval, self._poll)
+        return future
+
+    def _dispatch(self, callback, *args):
+        """Tk thread: call a result callback, ignoring screens that were closed meanwhile"""
+        try:
+            callback(*args)
+        except tk.TclError:
+            # The screen that asked for the result was closed meanwhile
+            pass
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to show results: {str(e)}")
+
+    def _poll(self):
+        """Tk thread: dispatch streamed chunks and finished jobs, keep the progress window in sync"""
+        self._poll_id = None
+        now = time.monotonic()
+
+        still_pending = []
+        for job in self.pending:
+            drained = True
+            if job['chunks'] is not None:
+                for _ in range(STREAM_CHUNKS_PER_POLL):
+                    try:
+                        rows = job['chunks'].get_nowait()
+                    except queue.Empty:
+                        break
+                    if job['on_rows'] is not None:
+                        self._dispatch(job['on_rows'], rows)
+                drained = job['chunks'].empty()
+
+            future = job['future']
+            if not (future.done() and drained):
+                still_pending.append(job)
+                continue
+            if future.cancelled():
+                # Dropped by cancel_job before it started
+                continue
+
+            error = future.exception()
+            if error is None:
+                if job['on_success'] is not None:
+                    self._dispatch(job['on_success'], future.result())
+            elif job['on_error'] is not None:
+                self._dispatch(job['on_error'], error)
+            elif isinstance(error, QueryCanceledError):
+                messagebox.showinfo("Cancelled", "The query was cancelled.")
+            else:
+                messagebox.showerror("Error", f"Query failed: {str(error)}")
+        self.pending = still_pending
+
+        slow = [job for job in self.pending if (now - job['started']) * 1000 >= self.progress_delay]
+        if slow:
+            # Cancel in the progress window cancels this job only
+            self._shown = slow[0]['future']
+            description = slow[0]['description']
+            if slow[0]['status'] is not None:
+                description = f"{description}\n{slow[0]['status']()}"
+            self.progress.show(description)
+        else:
+            self._shown = None
+            self.progress.hide()
+
+        if self.pending:
+            self._poll_id = self.root.after(self.poll_interval, self._poll)
+
+    def _cancel_shown(self):
+        """Cancel button of the progress window: cancel the job it shows"""
+        if self._shown is not None:
+            self.cancel_job(self._shown)
+
+    def cancel(self):
+        """Cancel the statements running in both lanes and any streams"""
+        for job in self.pending:
+            if job['stop'] is not None:
+                job['stop'].set()
+        with self._lock:
+            for connection in self._running.values():
+                if not connection.closed:
+                    connection.cancel()
+
+    def cancel_job(self, future):
+        """
+        Cancel one job without touching the others
+
+        A job still waiting in line is dropped. A running job has its statement
+        cancelled, and finishes through on_error with a QueryCanceledError.
+        """
+        if future.cancel():
+            return
+        for job in self.pending:
+            if job['future'] is future:
+                if job['stop'] is not None:
+                    job['stop'].set()
+                # Holding the lock keeps the worker from moving on to the next job meanwhile
+                with self._lock:
+                    connection = self._running.get(job['token'])
+                    if connection is not None and not connection.closed:
+                        connection.cancel()
+
+    def shutdown(self):
+        """Cancel running work, stop the worker and close the pool"""
+        self.cancel()
+        for job in self.pending:
+            job['future'].cancel()
+        self.pending = []
+        self.progress.hide()
+        if self._poll_id is not None:
+            self.root.after_cancel(self._poll_id)
+            self._poll_id = None
+        self.background_pool.shutdown(wait=False)
+        self.pool.submit(self._close)
+        self.pool.shutdown(wait=False)
+
+    def _close(self):
+        """Worker thread: close the pool once the running jobs have let go of their connections"""
+        self.background_pool.shutdown(wait=True)
+        self.db_pool.close()
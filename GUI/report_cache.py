@@ -0,0 +1,126 @@
+# report_cache.py - Materialized views behind the aggregate reports, refreshed on a schedule
+import threading
+import time
+from datetime import datetime
+
+# Seconds between background refreshes of the report views
+REPORT_REFRESH_INTERVAL = 300
+
+# View name -> (defining query, unique index column). REFRESH ... CONCURRENTLY
+# needs a unique index, and lets readers keep using the old contents meanwhile.
+REPORT_VIEWS = {
+    'report_segment_age': ("""
+        SELECT
+            S.segment_id,
+            S.segment_name,
+            ROUND(AVG(EXTRACT(YEAR FROM AGE(C.date_of_birth))), 1) AS avg_age,
+            COUNT(*) as customer_count
+        FROM
+            CustomerSegmentAssignment A
+        JOIN
+            Customer C ON C.CustomerID = A.customer_id
+        JOIN
+            CustomerSegment S ON S.segment_id = A.segment_id
+        GROUP BY
+            S.segment_id, S.segment_name
+    """, 'segment_id'),
+    'report_monthly_registration': ("""
+        SELECT
+            DATE_TRUNC('month', customer_since)::date AS month_start,
+            COUNT(*) AS customer_count
+        FROM
+            Customer
+        GROUP BY
+            DATE_TRUNC('month', customer_since)
+    """, 'month_start')
+}
+
+
+def ensure_report_views(cursor):
+    """Create any missing report view and its unique index; returns the views created"""
+    cursor.execute("SELECT matviewname FROM pg_matviews WHERE schemaname = current_schema()")
+    existing = {row[0] for row in cursor.fetchall()}
+
+    created = []
+    for view, (sql, key_column) in REPORT_VIEWS.items():
+        if view not in existing:
+            cursor.execute(f"CREATE MATERIALIZED VIEW {view} AS {sql}")
+            created.append(view)
+        cursor.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {view}_key ON {view} ({key_column})")
+    return created
+
+
+def refresh_report_views(cursor, views=REPORT_VIEWS):
+    """
+    Recompute the report views without blocking readers
+
+    Returns:
+        dict: view -> seconds its refresh took
+    """
+    timings = {}
+    for view in views:
+        started = time.perf_counter()
+        cursor.execute(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view}")
+        timings[view] = time.perf_counter() - started
+    return timings
+
+
+class ReportCacheRefresher:
+    """
+    Refresh the report views on a background thread every interval seconds
+
+    Runs on its own pooled connection, so a refresh never queues behind (or
+    delays) the GUI's QueryExecutor jobs.
+
+    Parameters:
+        db_pool (DatabasePool): Pool the refresh borrows a connection from
+        interval (float): Seconds between refreshes
+    """
+
+    def __init__(self, db_pool, interval=REPORT_REFRESH_INTERVAL):
+        self.db_pool = db_pool
+        self.interval = interval
+        self.last_refreshed = None
+        self.last_error = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self, refresh_now=False):
+        """Start refreshing, optionally with an immediate first refresh"""
+        if refresh_now:
+            self._wake.set()
+        self._thread = threading.Thread(target=self._run, name='report-cache', daemon=True)
+        self._thread.start()
+
+    def refresh_now(self):
+        """Ask for a refresh without waiting for the schedule"""
+        self._wake.set()
+
+    def stop(self):
+        """Stop after the refresh in progress, if any"""
+        self._stop.set()
+        self._wake.set()
+
+    def describe(self):
+        """Freshness of the cached reports, for report headers"""
+        if self.last_refreshed is None:
+            return "report cache not refreshed yet this session"
+        return f"report cache refreshed {self.last_refreshed:%H:%M:%S}"
+
+    def _run(self):
+        """Background thread: refresh, then sleep until the next interval or refresh_now()"""
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                return
+            try:
+                with self.db_pool.cursor() as cursor:
+                    timings = refresh_report_views(cursor)
+                self.last_refreshed = datetime.now()
+                self.last_error = None
+                print(f"🔄 Report cache refreshed in {sum(timings.values()):.3f}s")
+            except Exception as e:
+                self.last_error = e
+                print(f"❌ Report cache refresh failed: {e}")
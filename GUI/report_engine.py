@@ -0,0 +1,262 @@
+# report_engine.py - Build the full Part 2 report in parallel from one snapshot
+import html
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_EXCEPTION
+from datetime import datetime
+from psycopg2.extensions import QueryCanceledError
+from report_queries import REPORTS, DATABASE_STATS_SQL
+
+try:
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4, landscape
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+    PDF_AVAILABLE = True
+except ImportError:
+    PDF_AVAILABLE = False
+
+# Sections run at once, each on its own pooled connection
+REPORT_WORKERS = 4
+
+# Pool connections a report leaves alone: the coordinator's and one for the interactive lane
+RESERVED_CONNECTIONS = 2
+
+# Rows kept per section; only one more is fetched, to tell that a section was cut short
+REPORT_MAX_ROWS = 1000
+
+# First statement of the coordinator's transaction and of every section's, which adopts its snapshot
+SECTION_TRANSACTION_SQL = "SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY"
+
+# Report document formats -> (file type label, file extension)
+REPORT_FORMATS = {
+    'html': ("HTML", '.html'),
+    'markdown': ("Markdown", '.md'),
+    'pdf': ("PDF", '.pdf')
+}
+
+# Sections of the full report, in document order
+REPORT_SECTIONS = REPORTS + [("DATABASE STATISTICS", DATABASE_STATS_SQL)]
+
+
+def available_report_formats():
+    """Report formats that can be written with the installed packages"""
+    return [name for name in REPORT_FORMATS if name != 'pdf' or PDF_AVAILABLE]
+
+
+class ReportEngine:
+    """
+    Run report sections in parallel on connections borrowed from the shared pool
+
+    A coordinator connection opens a REPEATABLE READ transaction and exports
+    its snapshot; every section adopts that snapshot with SET TRANSACTION
+    SNAPSHOT, so all sections see the database at the same instant even though
+    they run on different connections. Sections are read through server-side
+    cursors, so rows past max_rows never leave the server.
+
+    Parameters:
+        db_pool (DatabasePool): Pool the sections borrow their connections from
+        workers (int): Sections run at once, at most the pool size less RESERVED_CONNECTIONS
+        max_rows (int): Rows kept per section
+    """
+
+    def __init__(self, db_pool, workers=REPORT_WORKERS, max_rows=REPORT_MAX_ROWS):
+        self.db_pool = db_pool
+        self.workers = max(1, min(workers, db_pool.size - RESERVED_CONNECTIONS))
+        self.max_rows = max_rows
+
+        self.stop = threading.Event()
+        self.completed = 0
+        self.total = 0
+        self._lock = threading.Lock()
+        self._busy = set()
+
+    def status(self):
+        """Progress text for the progress window"""
+        return f"{self.completed} of {self.total} sections done"
+
+    def cancel(self):
+        """Cancel the sections that are running and skip the rest (safe from any thread)"""
+        self.stop.set()
+        with self._lock:
+            for connection in self._busy:
+                connection.cancel()
+
+    def _run_section(self, snapshot, number, title, sql):
+        """Worker thread: run one section inside the shared snapshot"""
+        if self.stop.is_set():
+            raise QueryCanceledError("canceling report due to user request")
+
+        connection = self.db_pool.getconn()
+        with self._lock:
+            self._busy.add(connection)
+        started = time.perf_counter()
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(SECTION_TRANSACTION_SQL)
+                cursor.execute("SET TRANSACTION SNAPSHOT %s", (snapshot,))
+            with connection.cursor(name=f'report_section_{number}') as cursor:
+                cursor.execute(sql)
+                rows = cursor.fetchmany(self.max_rows + 1)
+                columns = [column.name for column in cursor.description]
+        finally:
+            with self._lock:
+                self._busy.discard(connection)
+            # putconn() rolls the read-only transaction back
+            self.db_pool.putconn(connection)
+
+        truncated = len(rows) > self.max_rows
+        rows = rows[:self.max_rows]
+        seconds = time.perf_counter() - started
+        with self._lock:
+            self.completed += 1
+        print(f"⏱️ Report section '{title}': {len(rows)}{'+' if truncated else ''} rows in {seconds:.3f}s")
+        return {'title': title, 'columns': columns, 'rows': rows, 'truncated': truncated, 'seconds': seconds}
+
+    def run(self, cursor, sections=REPORT_SECTIONS):
+        """
+        Run every (title, sql) section and return the assembled report
+
+        Parameters:
+            cursor: Coordinator cursor on a pooled connection, before its transaction
+                has run any statement; the snapshot lives as long as that transaction
+            sections (list): (title, sql) pairs
+
+        Returns:
+            dict: generated (datetime), snapshot (str), seconds (float) and
+                sections (list of dicts with title, columns, rows, truncated, seconds)
+        """
+        self.stop.clear()
+        self.completed = 0
+        self.total = len(sections)
+        started = time.perf_counter()
+
+        cursor.execute(SECTION_TRANSACTION_SQL)
+        cursor.execute("SELECT pg_export_snapshot()")
+        snapshot = cursor.fetchone()[0]
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='report') as workers:
+            futures = [workers.submit(self._run_section, snapshot, number, title, sql)
+                       for number, (title, sql) in enumerate(sections)]
+            # Wake up regularly so setting stop from outside cancels the running sections
+            pending = futures
+            while pending:
+                done, pending = wait(pending, timeout=0.1, return_when=FIRST_EXCEPTION)
+                if self.stop.is_set() or any(future.exception() for future in done):
+                    self.cancel()
+                    break
+            results = [future.result() for future in futures]
+
+        seconds = time.perf_counter() - started
+        print(f"✅ Report built: {len(sections)} sections in {seconds:.3f}s")
+        return {'generated': datetime.now(), 'snapshot': snapshot, 'seconds': seconds, 'sections': results}
+
+
+def _cell(value):
+    """Text of one result value"""
+    return "" if value is None else str(value).strip()
+
+
+def _row_count(section):
+    """Rows of a section for the timings table, with a + when it was cut short"""
+    return f"{len(section['rows'])}{'+' if section['truncated'] else ''}"
+
+
+def render_markdown(report):
+    """Report as a Markdown document"""
+    lines = ["# Customer Database Report", "",
+             f"Generated {report['generated']:%Y-%m-%d %H:%M} from snapshot `{report['snapshot']}`.", ""]
+    for section in report['sections']:
+        lines += [f"## {section['title'].title()}", ""]
+        if section['rows']:
+            lines.append("| " + " | ".join(section['columns']) + " |")
+            lines.append("|" + "---|" * len(section['columns']))
+            for row in section['rows']:
+                lines.append("| " + " | ".join(_cell(value).replace("|", "\\|") for value in row) + " |")
+        else:
+            lines.append("_No rows._")
+        if section['truncated']:
+            lines += ["", f"_Only the first {len(section['rows'])} rows are shown._"]
+        lines.append("")
+
+    lines += ["## Section Timings", "", "| Section | Rows | Seconds |", "|---|---|---|"]
+    for section in report['sections']:
+        lines.append(f"| {section['title'].title()} | {_row_count(section)} "
+                     f"| {section['seconds']:.3f} |")
+    lines += ["", f"Total: {report['seconds']:.3f} s", ""]
+    return "\n".join(lines)
+
+
+def render_html(report):
+    """Report as a standalone HTML document"""
+    parts = ["<!DOCTYPE html>", "<html><head><meta charset='utf-8'><title>Customer Database Report</title>",
+             "<style>body{font-family:Arial,sans-serif;margin:30px;color:#2c3e50}"
+             "table{border-collapse:collapse;margin-bottom:20px}"
+             "th,td{border:1px solid #bdc3c7;padding:4px 8px;text-align:left}"
+             "th{background:#34495e;color:white}</style></head><body>",
+             "<h1>Customer Database Report</h1>",
+             f"<p>Generated {report['generated']:%Y-%m-%d %H:%M} from snapshot "
+             f"<code>{html.escape(report['snapshot'])}</code>.</p>"]
+    for section in report['sections']:
+        parts.append(f"<h2>{html.escape(section['title'].title())}</h2>")
+        if section['rows']:
+            parts.append("<table><tr>" + "".join(f"<th>{html.escape(column)}</th>"
+                                                 for column in section['columns']) + "</tr>")
+            for row in section['rows']:
+                parts.append("<tr>" + "".join(f"<td>{html.escape(_cell(value))}</td>" for value in row) + "</tr>")
+            parts.append("</table>")
+        else:
+            parts.append("<p><em>No rows.</em></p>")
+        if section['truncated']:
+            parts.append(f"<p><em>Only the first {len(section['rows'])} rows are shown.</em></p>")
+
+    parts.append("<h2>Section Timings</h2><table><tr><th>Section</th><th>Rows</th><th>Seconds</th></tr>")
+    for section in report['sections']:
+        parts.append(f"<tr><td>{html.escape(section['title'].title())}</td>"
+                     f"<td>{_row_count(section)}</td><td>{section['seconds']:.3f}</td></tr>")
+    parts.append(f"</table><p>Total: {report['seconds']:.3f} s</p></body></html>")
+    return "\n".join(parts)
+
+
+def render_pdf(report, path):
+    """Write the report as a PDF document (needs reportlab)"""
+    styles = getSampleStyleSheet()
+    table_style = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#34495e')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#bdc3c7')),
+        ('FONTSIZE', (0, 0), (-1, -1), 8),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP')
+    ])
+
+    story = [Paragraph("Customer Database Report", styles['Title']),
+             Paragraph(f"Generated {report['generated']:%Y-%m-%d %H:%M} from snapshot "
+                       f"{html.escape(report['snapshot'])}.", styles['Normal'])]
+    for section in report['sections']:
+        story += [Spacer(1, 12), Paragraph(html.escape(section['title'].title()), styles['Heading2'])]
+        if section['rows']:
+            data = [section['columns']] + [[Paragraph(html.escape(_cell(value)), styles['BodyText'])
+                                            for value in row] for row in section['rows']]
+            story.append(Table(data, repeatRows=1, style=table_style))
+        else:
+            story.append(Paragraph("No rows.", styles['Italic']))
+        if section['truncated']:
+            story.append(Paragraph(f"Only the first {len(section['rows'])} rows are shown.", styles['Italic']))
+
+    story += [Spacer(1, 12), Paragraph("Section Timings", styles['Heading2'])]
+    timings = [["Section", "Rows", "Seconds"]] + [
+        [section['title'].title(), _row_count(section), f"{section['seconds']:.3f}"]
+        for section in report['sections']]
+    story += [Table(timings, style=table_style), Paragraph(f"Total: {report['seconds']:.3f} s", styles['Normal'])]
+
+    SimpleDocTemplate(path, pagesize=landscape(A4)).build(story)
+
+
+def write_report(report, path, report_format):
+    """Write the report to path in one of REPORT_FORMATS"""
+    if report_format == 'pdf':
+        render_pdf(report, path)
+        return
+    text = render_html(report) if report_format == 'html' else render_markdown(report)
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(text)
@@ -0,0 +1,150 @@
+# report_queries.py - SQL behind the Reports & Queries screen
+
+# Query 1: Customers with valid documents
+VALID_DOCUMENTS_SQL = """
+    SELECT 
+        C.Customer_First_Name, 
+        C.Customer_Last_Name, 
+        COUNT(D.document_id) AS ValidDocuments
+    FROM 
+        Customer C
+    JOIN 
+        CustomerDocument D ON C.CustomerID = D.customer_id
+    WHERE 
+        D.expiry_date > CURRENT_DATE
+    GROUP BY 
+        C.CustomerID, C.Customer_First_Name, C.Customer_Last_Name
+    ORDER BY ValidDocuments DESC
+"""
+
+# Query 2: Primary addresses of customers who joined this year
+NEW_CUSTOMER_ADDRESSES_SQL = """
+    SELECT 
+        C.Customer_First_Name, 
+        C.Customer_Last_Name,
+        A.street_address, 
+        A.city_name,
+        C.customer_since
+    FROM 
+        Customer C
+    JOIN 
+        Address A ON C.CustomerID = A.customer_id
+    WHERE 
+        A.is_primary = TRUE
+        AND EXTRACT(YEAR FROM C.customer_since) = EXTRACT(YEAR FROM CURRENT_DATE)
+    ORDER BY C.customer_since DESC
+"""
+
+# Query 3: Important customer notes
+IMPORTANT_NOTES_SQL = """
+    SELECT 
+        C.CustomerID, 
+        C.Customer_First_Name, 
+        C.Customer_Last_Name, 
+        N.note_category,
+        N.note_text,
+        N.note_date
+    FROM 
+        Customer C
+    JOIN 
+        CustomerNote N ON C.CustomerID = N.customer_id
+    WHERE 
+        N.is_important = TRUE
+    ORDER BY N.note_date DESC
+"""
+
+# Query 4: Primary contact information
+PRIMARY_CONTACTS_SQL = """
+    SELECT 
+        C.Customer_First_Name, 
+        C.Customer_Last_Name,
+        CT.contact_type, 
+        CT.contact_value
+    FROM 
+        Customer C
+    JOIN 
+        Contact CT ON C.CustomerID = CT.customer_id
+    WHERE 
+        CT.is_primary = TRUE
+    ORDER BY 
+        CT.contact_type, C.Customer_Last_Name
+"""
+
+# Query 6: Average age by customer segment
+SEGMENT_AGE_SQL = """
+    SELECT 
+        S.segment_name, 
+        ROUND(AVG(EXTRACT(YEAR FROM AGE(C.date_of_birth))), 1) AS avg_age,
+        COUNT(*) as customer_count
+    FROM 
+        CustomerSegmentAssignment A
+    JOIN 
+        Customer C ON C.CustomerID = A.customer_id
+    JOIN 
+        CustomerSegment S ON S.segment_id = A.segment_id
+    GROUP BY 
+        S.segment_name, S.segment_id
+    ORDER BY avg_age DESC
+"""
+
+# Query 8: Monthly customer registration
+MONTHLY_REGISTRATION_SQL = """
+    SELECT 
+        EXTRACT(MONTH FROM customer_since) AS month,
+        TO_CHAR(DATE_TRUNC('month', customer_since), 'Month YYYY') as month_name,
+        COUNT(*) AS customer_count,
+        ROUND(100.0 * COUNT(*) / SUM(COUNT(*)) OVER (), 1) AS percentage,
+        SUM(COUNT(*)) OVER () AS total
+    FROM 
+        Customer
+    GROUP BY 
+        EXTRACT(MONTH FROM customer_since), DATE_TRUNC('month', customer_since)
+    ORDER BY 
+        month
+"""
+
+# Query 6 from the report cache (report_cache.REPORT_VIEWS), same columns
+SEGMENT_AGE_CACHED_SQL = """
+    SELECT segment_name, avg_age, customer_count
+    FROM report_segment_age
+    ORDER BY avg_age DESC
+"""
+
+# Query 8 from the report cache: only the monthly totals are stored, the shares
+# are computed over those few rows
+MONTHLY_REGISTRATION_CACHED_SQL = """
+    SELECT 
+        EXTRACT(MONTH FROM month_start) AS month,
+        TO_CHAR(month_start, 'Month YYYY') as month_name,
+        customer_count,
+        ROUND(100.0 * customer_count / SUM(customer_count) OVER (), 1) AS percentage,
+        SUM(customer_count) OVER () AS total
+    FROM 
+        report_monthly_registration
+    ORDER BY 
+        month
+"""
+
+# Record counts per table plus customer coverage, one (metric, value) row each
+DATABASE_STATS_SQL = """
+    SELECT 'Customer' AS metric, COUNT(*) AS value FROM Customer
+    UNION ALL SELECT 'Address', COUNT(*) FROM Address
+    UNION ALL SELECT 'Contact', COUNT(*) FROM Contact
+    UNION ALL SELECT 'CustomerDocument', COUNT(*) FROM CustomerDocument
+    UNION ALL SELECT 'CustomerNote', COUNT(*) FROM CustomerNote
+    UNION ALL SELECT 'CustomerSegment', COUNT(*) FROM CustomerSegment
+    UNION ALL SELECT 'CustomerSegmentAssignment', COUNT(*) FROM CustomerSegmentAssignment
+    UNION ALL SELECT 'Customers with Addresses', COUNT(DISTINCT customer_id) FROM Address
+    UNION ALL SELECT 'Customers with Valid Docs', COUNT(DISTINCT customer_id)
+              FROM CustomerDocument WHERE expiry_date > CURRENT_DATE
+"""
+
+# Report title -> query, in menu order
+REPORTS = [
+    ("CUSTOMERS WITH VALID DOCUMENTS", VALID_DOCUMENTS_SQL),
+    ("NEW CUSTOMERS PRIMARY ADDRESSES (This Year)", NEW_CUSTOMER_ADDRESSES_SQL),
+    ("IMPORTANT CUSTOMER NOTES", IMPORTANT_NOTES_SQL),
+    ("PRIMARY CONTACT INFORMATION", PRIMARY_CONTACTS_SQL),
+    ("CUSTOMER SEGMENT AGE ANALYSIS", SEGMENT_AGE_SQL),
+    ("MONTHLY CUSTOMER REGISTRATION", MONTHLY_REGISTRATION_SQL)
+]
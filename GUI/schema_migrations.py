@@ -0,0 +1,130 @@
+# schema_migrations.py - Schema upgrades run by an administrator, and the read-only check done at login
+from id_allocation import IDENTITY_KEYS, key_sequence, ensure_identity_keys, lagging_key_sequences
+from customer_search import SEARCH_INDEXES, ensure_search_indexes
+from primary_address import ensure_primary_address_index, primary_address_index_valid
+from index_advisor import ensure_recommended_indexes, propose_indexes
+from live_updates import NOTIFY_EVENTS, NOTIFY_TABLES, ensure_change_notifications, existing_notify_triggers
+from report_cache import REPORT_VIEWS, ensure_report_views
+from advanced_search import ensure_search_vectors, missing_search_vectors
+from customer_status import customer_status_functions_installed, install_customer_status_functions
+
+# Features the login check reports on; the GUI leaves out what a missing one would break
+KEY_SEQUENCES = 'Key sequences'
+SEARCH_INDEXES_FEATURE = 'Search indexes'
+PRIMARY_ADDRESSES = 'Primary address index'
+RECOMMENDED_INDEXES_FEATURE = 'Recommended indexes'
+LIVE_UPDATES = 'Live updates'
+REPORT_CACHE = 'Report cache'
+ADVANCED_SEARCH = 'Advanced search'
+CUSTOMER_STATUS = 'Customer status functions'
+
+# Upgrades in the order they run; each returns what it changed (or, for primary
+# addresses, the duplicates that kept it from changing anything)
+MIGRATIONS = [
+    (KEY_SEQUENCES, ensure_identity_keys),
+    (SEARCH_INDEXES_FEATURE, ensure_search_indexes),
+    (PRIMARY_ADDRESSES, ensure_primary_address_index),
+    (RECOMMENDED_INDEXES_FEATURE, ensure_recommended_indexes),
+    (LIVE_UPDATES, ensure_change_notifications),
+    (REPORT_CACHE, ensure_report_views),
+    (ADVANCED_SEARCH, ensure_search_vectors),
+    (CUSTOMER_STATUS, install_customer_status_functions)
+]
+
+# Command that applies the migrations, quoted in the login warning
+MIGRATE_COMMAND = "python schema_migrations.py"
+
+
+def run_migrations(cursor):
+    """
+    Apply every migration in order; needs DDL and extension privileges
+
+    Returns:
+        dict: feature -> result of its migration
+    """
+    results = {}
+    for feature, migrate in MIGRATIONS:
+        results[feature] = migrate(cursor)
+        if feature == PRIMARY_ADDRESSES and results[feature]:
+            print(f"⚠️ {feature}: {len(results[feature])} customers have several primary addresses, "
+                  f"index not created")
+        else:
+            print(f"✅ {feature}: {results[feature] or 'up to date'}")
+    return results
+
+
+def valid_indexes(cursor, names):
+    """The names among names that are built and valid"""
+    cursor.execute("""
+        SELECT c.relname FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indexrelid
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = current_schema() AND i.indisvalid AND c.relname = ANY(%s)
+    """, (list(names),))
+    return {row[0] for row in cursor.fetchall()}
+
+
+def check_schema(cursor):
+    """
+    Compare the schema with what the migrations would produce, reading the catalogs
+    and the largest key of each identity column
+
+    Returns:
+        dict: feature -> description of what is missing, for every feature not up to date
+    """
+    problems = {}
+
+    missing = [table for table in IDENTITY_KEYS if key_sequence(cursor, table) is None]
+    if missing:
+        problems[KEY_SEQUENCES] = f"no identity sequence on {', '.join(missing)}; adding records may fail"
+    lagging = lagging_key_sequences(cursor)
+    if lagging:
+        # Rows loaded with explicit keys (inserttable.sql) leave the sequences behind
+        problem = f"identity sequence behind MAX key on {', '.join(lagging)}; adding records will fail"
+        problems[KEY_SEQUENCES] = f"{problems[KEY_SEQUENCES]}; {problem}" if missing else problem
+
+    names = [name for name, _ in SEARCH_INDEXES]
+    missing = sorted(set(names) - valid_indexes(cursor, names))
+    if missing:
+        problems[SEARCH_INDEXES_FEATURE] = f"missing {', '.join(missing)}; customer search will be slow"
+
+    if not primary_address_index_valid(cursor):
+        problems[PRIMARY_ADDRESSES] = "one primary address per customer is not enforced by the index"
+
+    proposals = propose_indexes(cursor)
+    if proposals:
+        problems[RECOMMENDED_INDEXES_FEATURE] = (f"missing {', '.join(proposal['index'] for proposal in proposals)}; "
+                                                 f"see the Index Advisor")
+
+    if len(existing_notify_triggers(cursor)) < len(NOTIFY_TABLES) * len(NOTIFY_EVENTS):
+        problems[LIVE_UPDATES] = "change notification triggers missing; grids reload after changes"
+
+    cursor.execute("SELECT matviewname FROM pg_matviews WHERE schemaname = current_schema()")
+    missing = sorted(set(REPORT_VIEWS) - {row[0] for row in cursor.fetchall()})
+    if missing:
+        problems[REPORT_CACHE] = f"missing {', '.join(missing)}; reports run live"
+
+    missing = missing_search_vectors(cursor)
+    if missing:
+        problems[ADVANCED_SEARCH] = f"no search vectors on {', '.join(missing)}; advanced search is unavailable"
+
+    if not customer_status_functions_installed(cursor):
+        problems[CUSTOMER_STATUS] = "customer_status_bulk is missing; customer statuses cannot be computed"
+    return problems
+
+
+if __name__ == "__main__":
+    from config import DatabaseConfig
+    from connection_pool import DatabasePool
+
+    # Connection settings come from DatabaseConfig (DB_HOST, DB_PORT, ... environment variables)
+    db_config = DatabaseConfig()
+    if not db_config.get_config()['password']:
+        db_config.update_config(password=input("Enter PostgreSQL password: "))
+
+    db_pool = DatabasePool(db_config)
+    try:
+        with db_pool.cursor() as cursor:
+            run_migrations(cursor)
+    finally:
+        db_pool.close()
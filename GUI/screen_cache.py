@@ -0,0 +1,104 @@
+# screen_cache.py - Keep built screens alive and switch between them without rebuilding
+from collections import OrderedDict
+import tkinter as tk
+
+# Screens kept built at once, the one on display included
+MAX_CACHED_SCREENS = 4
+
+# Treeview rows the hidden screens may hold together before the least recently used go
+MAX_CACHED_ROWS = 2000
+
+
+class ScreenCache:
+    """
+    Build each screen once into its own frame and hide / show it on navigation
+
+    Screens are kept in least-recently-used order; when more than max_screens
+    are built, or the hidden ones hold more than max_rows rows between them,
+    the least recently used hidden screens are destroyed and rebuilt the next
+    time they are opened. Each screen carries a dirty flag that the owner sets
+    when its data may have changed while it was hidden.
+
+    Parameters:
+        root (tk.Tk): Window the screen frames are packed into
+        max_screens (int): Screens kept built at once
+        max_rows (int): Rows the hidden screens may hold together
+    """
+
+    def __init__(self, root, max_screens=MAX_CACHED_SCREENS, max_rows=MAX_CACHED_ROWS):
+        self.root = root
+        self.max_screens = max_screens
+        self.max_rows = max_rows
+        self.screens = OrderedDict()
+        self.current = None
+
+    def show(self, name, build, weight=None, on_evict=None):
+        """
+        Display a screen, building it with build(frame) if it is not cached
+
+        weight() returns the rows the screen holds, on_evict() is called when
+        it is destroyed to make room.
+
+        Returns:
+            tuple: (frame, dirty) where dirty is None for a freshly built
+                screen, else whether it was marked dirty while hidden
+        """
+        self.hide()
+        screen = self.screens.get(name)
+        if screen is not None:
+            self.screens.move_to_end(name)
+            dirty, screen['dirty'] = screen['dirty'], False
+        else:
+            screen = {'frame': tk.Frame(self.root), 'dirty': False, 'weight': weight, 'on_evict': on_evict}
+            self.screens[name] = screen
+            build(screen['frame'])
+            dirty = None
+
+        screen['frame'].pack(fill='both', expand=True)
+        screen['frame'].tkraise()
+        self.current = name
+        self._evict()
+        return screen['frame'], dirty
+
+    def hide(self):
+        """Take the displayed screen off the window, keeping it built"""
+        if self.current is not None and self.current in self.screens:
+            self.screens[self.current]['frame'].pack_forget()
+        self.current = None
+
+    def holds(self, widget):
+        """Whether widget is the frame of a cached screen"""
+        return any(screen['frame'] is widget for screen in self.screens.values())
+
+    def mark_dirty(self, names=None, exclude=None):
+        """Flag screens (all by default) whose data must be reloaded when next shown"""
+        for name, screen in self.screens.items():
+            if (names is None or name in names) and name != exclude:
+                screen['dirty'] = True
+
+    def clear(self):
+        """Destroy every cached screen"""
+        for name in list(self.screens):
+            self._destroy(name)
+        self.current = None
+
+    def _destroy(self, name):
+        """Destroy one screen and tell its owner"""
+        screen = self.screens.pop(name)
+        if screen['on_evict'] is not None:
+            screen['on_evict']()
+        screen['frame'].destroy()
+
+    def _hidden_rows(self):
+        """Rows held by the screens not on display"""
+        return sum(screen['weight']() for name, screen in self.screens.items()
+                   if name != self.current and screen['weight'] is not None)
+
+    def _evict(self):
+        """Destroy least recently used hidden screens until within the limits"""
+        for name in list(self.screens):
+            if len(self.screens) <= self.max_screens and self._hidden_rows() <= self.max_rows:
+                return
+            if name != self.current:
+                print(f"🗑️ Evicting cached screen '{name}'")
+                self._destroy(name)
@@ -0,0 +1,438 @@
+# virtual_grid.py - Keyset-paginated, windowed Treeview loading
+from collections import deque
+from tkinter import messagebox
+
+# Rows fetched per page
+PAGE_SIZE = 200
+
+# Pages kept in the Treeview at once; older pages are dropped and re-fetched on demand
+MAX_PAGES = 5
+
+# Fetch the next / previous page once the view is this close to either end
+SCROLL_THRESHOLD = 0.1
+
+# Fourth element of an order_by column that can never be NULL in the result
+NOT_NULL = 'NOT NULL'
+
+
+class KeysetPager:
+    """
+    Fetch pages of a query with keyset pagination
+
+    Instead of OFFSET, each page continues after (or before) the sort key of a
+    row already shown, so every page costs the same no matter how deep the user
+    has scrolled.
+
+    Parameters:
+        select_sql (str): SELECT ... FROM ... [JOIN ...] without WHERE / ORDER BY
+        order_by (list): (expression, 'ASC' or 'DESC', row index[, NOT_NULL]) per sort
+            column; the columns together must identify a row, so end with the primary
+            key. Marking the columns NOT_NULL lets pages be index range scans.
+        where (str): Optional filter applied to every page
+        params (tuple): Parameters of the filter
+        page_size (int): Rows per page
+    """
+
+    def __init__(self, select_sql, order_by, where=None, params=(), page_size=PAGE_SIZE):
+        self.select_sql = select_sql
+        self.order_by = [tuple(column[:3]) for column in order_by]
+        self.not_null = {column[0] for column in order_by if column[3:] == (NOT_NULL,)}
+        self.where = where
+        self.params = tuple(params)
+        self.page_size = page_size
+
+    def key_of(self, row):
+        """Sort key values of a fetched row"""
+        return tuple(row[index] for _, _, index in self.order_by)
+
+    def id_of(self, row):
+        """Primary key of a fetched row: the last sort column"""
+        return row[self.order_by[-1][2]]
+
+    def compare_keys(self, first, second):
+        """-1, 0 or 1 as sort key first comes before, with or after second in display order"""
+        for (_, direction, _), a, b in zip(self.order_by, first, second):
+            if a == b:
+                continue
+            if a is None or b is None:
+                # NULLS LAST for ASC, NULLS FIRST for DESC
+                result = 1 if a is None else -1
+                return result if direction == 'ASC' else -result
+            result = -1 if a < b else 1
+            return result if direction == 'ASC' else -result
+        return 0
+
+    @staticmethod
+    def _beyond(expression, direction, value, forward, nullable=True):
+        """
+        Condition for rows strictly past value in one sort column, or None if none can be
+
+        Follows Postgres NULL ordering: NULLS LAST for ASC, NULLS FIRST for DESC.
+        """
+        ascending = (direction == 'ASC') == forward
+        if not nullable:
+            return f"{expression} {'>' if ascending else '<'} %s", [value]
+        if value is None:
+            # NULLs are last when ascending, so nothing comes after them
+            return None if ascending else (f"{expression} IS NOT NULL", [])
+        if ascending:
+            return f"({expression} > %s OR {expression} IS NULL)", [value]
+        return f"{expression} < %s", [value]
+
+    def _predicate(self, key, forward):
+        """
+        Keyset condition for rows after (or before) key
+
+        When every column is NOT NULL and sorts the same way this is the row
+        comparison (a, b) > (v1, v2), which an index on (a, b) answers with one
+        range scan. Otherwise it expands to (a past v1) OR (a = v1 AND b past v2)
+        OR ... so each column can sort in its own direction and NULLs sort as
+        Postgres sorts them; a NOT NULL first column also bounds the whole
+        condition, so the index scan still starts at the key.
+        """
+        expressions = [expression for expression, _, _ in self.order_by]
+        directions = {direction for _, direction, _ in self.order_by}
+        if len(directions) == 1 and self.not_null.issuperset(expressions):
+            operator = '>' if (directions.pop() == 'ASC') == forward else '<'
+            return (f"({', '.join(expressions)}) {operator} ({', '.join(['%s'] * len(key))})",
+                    list(key))
+
+        clauses, params = [], []
+        for position, ((expression, direction, _), value) in enumerate(zip(self.order_by, key)):
+            beyond = self._beyond(expression, direction, value, forward, expression not in self.not_null)
+            if beyond is not None:
+                terms, term_params = [], []
+                for (previous, _, _), previous_value in zip(self.order_by[:position], key):
+                    if previous_value is None:
+                        terms.append(f"{previous} IS NULL")
+                    else:
+                        terms.append(f"{previous} = %s")
+                        term_params.append(previous_value)
+                terms.append(beyond[0])
+                clauses.append(f"({' AND '.join(terms)})")
+                params.extend(term_params + beyond[1])
+        if not clauses:
+            return 'FALSE', params
+
+        first, direction, _ = self.order_by[0]
+        if first in self.not_null:
+            bound = '>=' if (direction == 'ASC') == forward else '<='
+            return f"{first} {bound} %s AND ({' OR '.join(clauses)})", [key[0]] + params
+        return ' OR '.join(clauses), params
+
+    def full_query(self):
+        """The whole result as one (sql, params), in display order, for exports"""
+        where = f"WHERE {self.where}" if self.where else ""
+        order = ', '.join(f"{expression} {direction}" for expression, direction, _ in self.order_by)
+        return f"{self.select_sql} {where} ORDER BY {order}", list(self.params)
+
+    def fetch_ids(self, cursor, ids):
+        """Fetch the rows with the given primary keys that still pass the filter"""
+        conditions = [f"{self.order_by[-1][0]} = ANY(%s)"]
+        if self.where:
+            conditions.insert(0, f"({self.where})")
+        cursor.execute(f"{self.select_sql} WHERE {' AND '.join(conditions)}",
+                       list(self.params) + [list(ids)])
+        return cursor.fetchall()
+
+    def fetch_page(self, cursor, key=None, forward=True):
+        """Fetch the page after key (or before it when forward is False), in display order"""
+        conditions, params = [], list(self.params)
+        if self.where:
+            conditions.append(f"({self.where})")
+        if key is not None:
+            predicate, predicate_params = self._predicate(key, forward)
+            conditions.append(f"({predicate})")
+            params.extend(predicate_params)
+
+        flipped = {'ASC': 'DESC', 'DESC': 'ASC'}
+        order = ', '.join(f"{expression} {direction if forward else flipped[direction]}"
+                          for expression, direction, _ in self.order_by)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        cursor.execute(f"{self.select_sql} {where} ORDER BY {order} LIMIT %s",
+                       params + [self.page_size])
+        rows = cursor.fetchall()
+        if not forward:
+            rows.reverse()
+        return rows
+
+
+class VirtualGrid:
+    """
+    Show a KeysetPager's rows in a Treeview, loading pages as the user scrolls
+
+    Only max_pages pages live in the Treeview; when a new page is loaded at one
+    end, the page at the other end is dropped and fetched again if the user
+    scrolls back to it. Pages are fetched through the QueryExecutor, so
+    scrolling never blocks the Tk main loop.
+
+    Each item's iid is the row's primary key, so apply_changes() can patch
+    single rows when a change notification arrives instead of reloading.
+
+    Parameters:
+        tree (ttk.Treeview): Treeview to fill
+        scrollbar (ttk.Scrollbar): Vertical scrollbar attached to the tree
+        pager (KeysetPager): Source of the rows
+        executor (QueryExecutor): Runs the page queries
+        format_row (callable): Optional row -> Treeview values conversion
+        max_pages (int): Pages kept in memory
+    """
+
+    def __init__(self, tree, scrollbar, pager, executor, format_row=None, max_pages=MAX_PAGES):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.pager = pager
+        self.executor = executor
+        self.format_row = format_row or list
+        self.max_pages = max_pages
+
+        self.pages = deque()
+        self.keys = {}
+        self.has_before = False
+        self.has_after = False
+        self.fixed = False
+        self._loading = False
+        self._generation = 0
+
+        self.tree.configure(yscrollcommand=self._on_scroll)
+
+    def reset(self, pager=None, on_loaded=None, on_error=None):
+        """
+        Reload from the first page, optionally switching to a new pager
+
+        on_loaded(count) is called with the number of rows shown once the
+        first page is in the tree.
+        """
+        if pager is not None:
+            self.pager = pager
+        self.fixed = False
+        self._generation += 1
+        generation = self._generation
+        self._loading = True
+
+        def show_first_page(rows):
+            if generation != self._generation:
+                return
+            self._clear()
+            self.has_before = False
+            self._add_page(rows, at_end=True)
+            self.has_after = len(rows) == self.pager.page_size
+            self.tree.yview_moveto(0)
+            self._loading = False
+            if on_loaded is not None:
+                on_loaded(len(rows))
+
+        def failed(error):
+            self._loading = False
+            if on_error is not None:
+                on_error(error)
+            else:
+                messagebox.showerror("Error", f"Failed to load rows: {str(error)}")
+
+        self.executor.submit(self.pager.fetch_page, on_success=show_first_page, on_error=failed,
+                             description="Loading rows...")
+
+    def show_rows(self, rows):
+        """
+        Show a fixed list of rows, such as ranked search results, instead of paging
+
+        Any page still loading is discarded; reset() switches back to paging.
+        """
+        self._generation += 1
+        self._loading = False
+        self.fixed = True
+        self._clear()
+        self.has_before = self.has_after = False
+        self._add_page(rows, at_end=True)
+        self.tree.yview_moveto(0)
+
+    def _clear(self):
+        """Remove every row"""
+        self.tree.delete(*self.tree.get_children())
+        self.pages.clear()
+        self.keys.clear()
+
+    def _add_page(self, rows, at_end):
+        """Insert a page of rows at either end of the tree"""
+        if not rows:
+            return
+        items = []
+        position = 'end' if at_end else 0
+        for row in rows:
+            iid = str(self.pager.id_of(row))
+            if self.tree.exists(iid):
+                # Already placed by a change notification
+                self.tree.item(iid, values=self.format_row(row))
+                continue
+            items.append(self.tree.insert('', position, iid=iid, values=self.format_row(row)))
+            self.keys[iid] = self.pager.key_of(row)
+            if not at_end:
+                position += 1
+
+        page = {'items': items,
+                'first_key': self.pager.key_of(rows[0]),
+                'last_key': self.pager.key_of(rows[-1])}
+        if at_end:
+            self.pages.append(page)
+        else:
+            self.pages.appendleft(page)
+
+    def _drop_page(self, from_end):
+        """Remove the page at one end of the tree"""
+        page = self.pages.pop() if from_end else self.pages.popleft()
+        self.tree.delete(*[iid for iid in page['items'] if self.tree.exists(iid)])
+        for iid in page['items']:
+            self.keys.pop(iid, None)
+
+    def apply_changes(self, operation, ids):
+        """
+        Patch the rows a change notification names instead of reloading
+
+        Deleted rows are removed; inserted and updated rows are fetched by
+        primary key and replaced, moved or placed in sort order, but only when
+        they fall inside the loaded window (rows past either end show up when
+        the user scrolls there). Rows that no longer pass the filter are
+        removed. RELOAD, sent for bulk changes, reloads from the first page.
+        """
+        if operation == 'RELOAD':
+            if not self.fixed:
+                self.reset(on_error=lambda error: None)
+            return
+        if operation == 'DELETE':
+            for iid in map(str, ids):
+                self._remove(iid)
+            return
+        if self.fixed:
+            ids = [key for key in ids if self.tree.exists(str(key))]
+            if not ids:
+                return
+        generation = self._generation
+
+        def patch(rows):
+            if generation != self._generation or not self.tree.winfo_exists():
+                return
+            found = {str(self.pager.id_of(row)): row for row in rows}
+            for iid in map(str, ids):
+                row = found.get(iid)
+                if row is None:
+                    self._remove(iid)
+                elif self.tree.exists(iid) and self.keys.get(iid) == self.pager.key_of(row):
+                    self.tree.item(iid, values=self.format_row(row))
+                else:
+                    self._remove(iid)
+                    if not self.fixed:
+                        self._place(iid, row)
+
+        self.executor.submit(self.pager.fetch_ids, ids, on_success=patch,
+                             on_error=lambda error: None, description="Updating rows...")
+
+    def _remove(self, iid):
+        """Remove one row if it is shown"""
+        if self.tree.exists(iid):
+            self.tree.delete(iid)
+        self.keys.pop(iid, None)
+        for page in self.pages:
+            if iid in page['items']:
+                page['items'].remove(iid)
+
+    def _place(self, iid, row):
+        """Insert one row at its sort position if it falls inside the loaded window"""
+        key = self.pager.key_of(row)
+        compare = self.pager.compare_keys
+        if self.pages:
+            if self.has_before and compare(key, self.pages[0]['first_key']) < 0:
+                return
+            if self.has_after and compare(key, self.pages[-1]['last_key']) > 0:
+                return
+        else:
+            self.pages.append({'items': [], 'first_key': key, 'last_key': key})
+
+        # Sorted position among the loaded rows (kept in display order) and the page that gets the row
+        ordered = self.tree.get_children()
+        position = next((index for index, child in enumerate(ordered)
+                         if compare(key, self.keys[child]) < 0), len(ordered))
+        neighbour = ordered[position] if position < len(ordered) else (ordered[-1] if ordered else None)
+        page = next((page for page in self.pages if neighbour in page['items']), self.pages[-1])
+
+        self.tree.insert('', position, iid=iid, values=self.format_row(row))
+        self.keys[iid] = key
+        page['items'].append(iid)
+        if compare(key, self.pages[0]['first_key']) < 0:
+            self.pages[0]['first_key'] = key
+        if compare(key, self.pages[-1]['last_key']) > 0:
+            self.pages[-1]['last_key'] = key
+
+    def _visible_anchor(self):
+        """First visible item, used to keep the view steady while pages change"""
+        children = self.tree.get_children()
+        if not children:
+            return None
+        top = int(float(self.tree.yview()[0]) * len(children))
+        return children[min(top, len(children) - 1)]
+
+    def _restore_anchor(self, anchor):
+        """Scroll so anchor is the first visible item again"""
+        children = self.tree.get_children()
+        if anchor is not None and children and self.tree.exists(anchor):
+            self.tree.yview_moveto(self.tree.index(anchor) / len(children))
+
+    def load_next(self):
+        """Fetch the page after the last loaded one"""
+        self._load(forward=True)
+
+    def load_previous(self):
+        """Fetch the page before the first loaded one"""
+        self._load(forward=False)
+
+    def _load(self, forward):
+        """Queue the fetch of the page past either end of the loaded window"""
+        if not self.pages or not (self.has_after if forward else self.has_before):
+            self._loading = False
+            return
+        self._loading = True
+        generation = self._generation
+        key = self.pages[-1]['last_key'] if forward else self.pages[0]['first_key']
+
+        def show_page(rows):
+            if generation != self._generation:
+                return
+            anchor = self._visible_anchor()
+            self._add_page(rows, at_end=forward)
+
+            more = len(rows) == self.pager.page_size
+            if forward:
+                self.has_after = more
+            else:
+                self.has_before = more
+
+            if len(self.pages) > self.max_pages:
+                self._drop_page(from_end=not forward)
+                if forward:
+                    self.has_before = True
+                else:
+                    self.has_after = True
+
+            self._restore_anchor(anchor)
+            self._loading = False
+
+        def failed(error):
+            if generation == self._generation:
+                self.has_after = self.has_before = False
+                self._loading = False
+            messagebox.showerror("Error", f"Failed to load rows: {str(error)}")
+
+        self.executor.submit(self.pager.fetch_page, key, forward,
+                             on_success=show_page, on_error=failed, description="Loading rows...")
+
+    def _on_scroll(self, first, last):
+        """Treeview yscrollcommand: update the scrollbar and load pages near either end"""
+        self.scrollbar.set(first, last)
+        if self._loading:
+            return
+        if float(last) >= 1 - SCROLL_THRESHOLD and self.has_after:
+            self._loading = True
+            self.tree.after_idle(self.load_next)
+        elif float(first) <= SCROLL_THRESHOLD and self.has_before:
+            self._loading = True
+            self.tree.after_idle(self.load_previous)
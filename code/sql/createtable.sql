@@ -9,7 +9,7 @@ CREATE TABLE Customer (
 );
 
 CREATE TABLE Address (
-    addressID INT PRIMARY KEY,
+    addressID INT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
     customer_id INT,
     street_address VARCHAR(255),
     city_name VARCHAR(50),
@@ -22,7 +22,7 @@ CREATE TABLE Address (
 );
 
 CREATE TABLE Contact (
-    contactID INT PRIMARY KEY,
+    contactID INT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
     customer_id INT,
     contact_type VARCHAR(50),
     contact_value VARCHAR(100),
@@ -31,7 +31,7 @@ CREATE TABLE Contact (
 );
 
 CREATE TABLE CustomerDocument (
-    document_id INT PRIMARY KEY,
+    document_id INT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
     customer_id INT,
     document_type VARCHAR(50),
     document_number VARCHAR(50) UNIQUE,
@@ -43,7 +43,7 @@ CREATE TABLE CustomerDocument (
 );
 
 CREATE TABLE CustomerNote (
-    note_id INT PRIMARY KEY,
+    note_id INT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
     customer_id INT,
     employee_id INT,  -- Assuming employees exist in another table
     note_date DATE,
@@ -61,10 +61,49 @@ CREATE TABLE CustomerSegment (
 );
 
 CREATE TABLE CustomerSegmentAssignment (
-    assignment_id INT PRIMARY KEY,
+    assignment_id INT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
     customer_id INT,
     segment_id INT,
     assigned_date DATE,
     FOREIGN KEY (customer_id) REFERENCES Customer(CustomerID) ON DELETE CASCADE,
     FOREIGN KEY (segment_id) REFERENCES CustomerSegment(segment_id) ON DELETE CASCADE
 );
+
+-- Foreign keys: joins to Customer and ON DELETE CASCADE would otherwise scan the child tables
+CREATE INDEX address_customer_id_idx ON Address (customer_id);
+CREATE INDEX contact_customer_id_idx ON Contact (customer_id);
+CREATE INDEX customer_document_customer_id_idx ON CustomerDocument (customer_id);
+CREATE INDEX customer_note_customer_id_idx ON CustomerNote (customer_id);
+CREATE INDEX segment_assignment_customer_segment_idx ON CustomerSegmentAssignment (customer_id, segment_id);
+CREATE INDEX segment_assignment_segment_id_idx ON CustomerSegmentAssignment (segment_id);
+
+-- One primary address per customer (replaces the check_primary_address trigger)
+CREATE UNIQUE INDEX address_one_primary_idx ON Address (customer_id) WHERE is_primary;
+
+-- Customer search: trigram name lookups and SSN prefix matches
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX customer_first_name_trgm_idx ON Customer USING gin (Customer_First_Name gin_trgm_ops);
+CREATE INDEX customer_last_name_trgm_idx ON Customer USING gin (Customer_Last_Name gin_trgm_ops);
+CREATE INDEX customer_ssn_pattern_idx ON Customer (ssn text_pattern_ops);
+
+-- Advanced search: full-text vectors kept current by Postgres, and their GIN indexes
+ALTER TABLE Customer ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (to_tsvector('simple', coalesce(Customer_First_Name, '') || ' ' || coalesce(Customer_Last_Name, ''))) STORED;
+CREATE INDEX customer_search_vector_idx ON Customer USING gin (search_vector);
+ALTER TABLE Address ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (to_tsvector('simple', coalesce(street_address, '') || ' ' || coalesce(city_name, ''))) STORED;
+CREATE INDEX address_search_vector_idx ON Address USING gin (search_vector);
+ALTER TABLE Contact ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (to_tsvector('simple', coalesce(contact_value, ''))) STORED;
+CREATE INDEX contact_search_vector_idx ON Contact USING gin (search_vector);
+ALTER TABLE CustomerNote ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (to_tsvector('simple', coalesce(note_text, ''))) STORED;
+CREATE INDEX customernote_search_vector_idx ON CustomerNote USING gin (search_vector);
+
+-- Report filters
+CREATE INDEX contact_primary_idx ON Contact (customer_id) WHERE is_primary;
+CREATE INDEX customer_document_expiry_idx ON CustomerDocument (expiry_date, customer_id);
+CREATE INDEX customer_note_important_idx ON CustomerNote (note_date DESC) WHERE is_important;
+
+-- Duplicate contact groups, in the order the deduplication window reads them
+CREATE INDEX contact_dedup_idx ON Contact (customer_id, contact_type, (lower(regexp_replace(btrim(contact_value), '\s+', ' ', 'g'))), is_primary DESC NULLS LAST, contactID);
+
+-- Grid pages in display order, so keyset pagination is an index range scan
+CREATE INDEX address_keyset_idx ON Address (customer_id, addressID);
+CREATE INDEX segment_assignment_keyset_idx ON CustomerSegmentAssignment (customer_id, assigned_date DESC, assignment_id);
@@ -0,0 +1,38 @@
+-- Move the surrogate keys to identity columns and sync their sequences.
+-- Safe to run repeatedly, and needed again after loading rows with explicit IDs
+-- (e.g. inserttable.sql) so the next generated key does not collide.
+
+DO $$
+DECLARE
+    key RECORD;
+    seq TEXT;
+    max_key BIGINT;
+    next_key BIGINT;
+BEGIN
+    FOR key IN
+        SELECT * FROM (VALUES
+            ('address', 'addressid'),
+            ('contact', 'contactid'),
+            ('customerdocument', 'document_id'),
+            ('customernote', 'note_id'),
+            ('customersegmentassignment', 'assignment_id')
+        ) AS keys(table_name, column_name)
+    LOOP
+        seq := pg_get_serial_sequence(key.table_name, key.column_name);
+        IF seq IS NULL THEN
+            EXECUTE format('ALTER TABLE %I ALTER COLUMN %I ADD GENERATED BY DEFAULT AS IDENTITY',
+                           key.table_name, key.column_name);
+            seq := pg_get_serial_sequence(key.table_name, key.column_name);
+        END IF;
+
+        -- Only ever move the sequence forward, past the largest key: it may already be ahead
+        -- (deleted tail rows, keys reserved by allocate_ids for a load not yet committed)
+        EXECUTE format('SELECT COALESCE(MAX(%I), 0) FROM %I', key.column_name, key.table_name)
+            INTO max_key;
+        EXECUTE format('SELECT CASE WHEN is_called THEN last_value + 1 ELSE last_value END FROM %s', seq)
+            INTO next_key;
+        IF next_key <= max_key THEN
+            PERFORM setval(seq, max_key);
+        END IF;
+    END LOOP;
+END $$;
@@ -68,3 +68,16 @@ VALUES
     (703, 1003, 601, '2021-03-10'),
     (704, 1004, 603, '2020-10-20'),
     (705, 1005, 604, '2022-02-01');
+
+-- The rows above carry explicit keys, so move each identity sequence past the largest one
+-- (forward only, as identity_migration.sql does) or the next generated key collides
+SELECT setval(pg_get_serial_sequence('address', 'addressid'), MAX(addressID)) FROM Address
+HAVING MAX(addressID) > COALESCE(pg_sequence_last_value(pg_get_serial_sequence('address', 'addressid')::regclass), 0);
+SELECT setval(pg_get_serial_sequence('contact', 'contactid'), MAX(contactID)) FROM Contact
+HAVING MAX(contactID) > COALESCE(pg_sequence_last_value(pg_get_serial_sequence('contact', 'contactid')::regclass), 0);
+SELECT setval(pg_get_serial_sequence('customerdocument', 'document_id'), MAX(document_id)) FROM CustomerDocument
+HAVING MAX(document_id) > COALESCE(pg_sequence_last_value(pg_get_serial_sequence('customerdocument', 'document_id')::regclass), 0);
+SELECT setval(pg_get_serial_sequence('customernote', 'note_id'), MAX(note_id)) FROM CustomerNote
+HAVING MAX(note_id) > COALESCE(pg_sequence_last_value(pg_get_serial_sequence('customernote', 'note_id')::regclass), 0);
+SELECT setval(pg_get_serial_sequence('customersegmentassignment', 'assignment_id'), MAX(assignment_id)) FROM CustomerSegmentAssignment
+HAVING MAX(assignment_id) > COALESCE(pg_sequence_last_value(pg_get_serial_sequence('customersegmentassignment', 'assignment_id')::regclass), 0);
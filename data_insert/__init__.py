@@ -0,0 +1 @@
+# data_insert - Sample data generation and loading, shared by the scripts here and the GUI
@@ -0,0 +1,356 @@
+import numpy as np
+from datetime import date
+from faker import Faker
+try:
+    from .unique_allocator import DEFAULT_KEY, allocate
+except ImportError:
+    # Imported by the scripts in this directory rather than as part of the package
+    from unique_allocator import DEFAULT_KEY, allocate
+
+# Value lists shared by all insert methods
+ADDRESS_TYPES = ["Home", "Work", "Shipping", "Billing", "Secondary"]
+COUNTRIES = ["Israel", "USA", "Canada", "UK", "Australia", "Germany", "France"]
+CONTACT_TYPES = ["Email", "Phone", "Mobile", "Work Phone", "Fax", "Social Media"]
+DOCUMENT_TYPES = ["Passport", "Driver License", "ID Card", "Birth Certificate", "Social Security Card", "Tax ID"]
+NOTE_CATEGORIES = ["Inquiry", "Complaint", "Request", "Feedback", "Update", "Alert"]
+NOTE_TEMPLATES = [
+    "Customer called about {topic}. Resolved issue by {resolution}.",
+    "Customer visited branch to discuss {topic}. {resolution}.",
+    "Customer emailed regarding {topic}. {resolution}.",
+    "Follow-up needed on customer's {topic}. {resolution}.",
+    "Important note about customer's {topic}. {resolution}."
+]
+TOPICS = ["account access", "transaction dispute", "loan application", "interest rates", "fees", "online banking"]
+RESOLUTIONS = [
+    "Provided information",
+    "Escalated to manager",
+    "Reset credentials",
+    "Scheduled appointment",
+    "Updated account settings"
+]
+
+# Column order of every generated table (SQLite schema names)
+TABLE_COLUMNS = {
+    'Customer': ['CustomerID', 'Customer_First_Name', 'Customer_Last_Name',
+                 'ssn', 'date_of_birth', 'customer_since'],
+    'Address': ['addressID', 'customer_id', 'street_address', 'city_name',
+                'state', 'zip_code', 'country', 'address_type', 'is_primary'],
+    'Contact': ['contactID', 'customer_id', 'contact_type', 'contact_value', 'is_primary'],
+    'CustomerDocument': ['document_id', 'customer_id', 'document_type', 'document_number',
+                         'issue_date', 'expiry_date', 'verification_status', 'file_reference'],
+    'CustomerNote': ['note_id', 'customer_id', 'employee_id', 'note_date',
+                     'note_category', 'note_text', 'is_important'],
+    'CustomerSegmentAssignment': ['assignment_id', 'customer_id', 'segment_id', 'assigned_date']
+}
+
+# Tables in foreign key load order
+TABLE_ORDER = list(TABLE_COLUMNS)
+
+# Child rows per customer as (minimum, maximum), both inclusive
+DEFAULT_CHILD_COUNTS = {
+    'Address': (1, 3),
+    'Contact': (1, 3),
+    'CustomerDocument': (1, 2),
+    'CustomerNote': (1, 3)
+}
+
+# SSN key space: AAA-GG-SSSS with AAA in 100-999, GG in 10-99, SSSS in 1000-9999
+SSN_SPACE = 900 * 90 * 9000
+
+# Document number space per document type: 10000-999999
+DOCUMENT_NUMBER_SPACE = 990000
+DOCUMENT_SPACE = len(DOCUMENT_TYPES) * DOCUMENT_NUMBER_SPACE
+
+DAYS_PER_YEAR = 365
+
+
+def build_value_pools(pool_size=2000, seed=None):
+    """
+    Sample Faker values once into NumPy pools that rows are drawn from by index
+
+    Parameters:
+        pool_size (int): Number of values sampled per pool
+        seed (int): Optional Faker seed for reproducible pools
+    """
+    fake = Faker()
+    if seed is not None:
+        fake.seed_instance(seed)
+
+    def sample(provider):
+        return np.array([provider() for _ in range(pool_size)])
+
+    note_texts = [template.format(topic=topic, resolution=resolution)
+                  for template in NOTE_TEMPLATES
+                  for topic in TOPICS
+                  for resolution in RESOLUTIONS]
+
+    return {
+        'first_name': sample(fake.first_name),
+        'last_name': sample(fake.last_name),
+        'street_address': sample(fake.street_address),
+        'city': sample(fake.city),
+        'state': sample(fake.state),
+        'zipcode': sample(fake.zipcode),
+        'email': sample(fake.email),
+        'phone_number': sample(fake.phone_number),
+        'user_name': sample(fake.user_name),
+        'note_text': np.array(note_texts)
+    }
+
+
+def _pick(rng, pool, n):
+    """Draw n values from a pool with a NumPy index array"""
+    pool = np.asarray(pool)
+    return pool[rng.integers(0, len(pool), n)]
+
+
+def _random_dates(rng, n, start_days, end_days):
+    """ISO date strings offset from today by a uniform number of days in [start_days, end_days]"""
+    today = np.datetime64(date.today(), 'D')
+    offsets = rng.integers(start_days, end_days + 1, n)
+    return np.datetime_as_string(today + offsets, unit='D')
+
+
+def _child_rows(rng, customer_ids, min_count, max_count):
+    """
+    Expand customers into child rows with np.repeat
+
+    Returns the parent customer_id of every child row and the row's position
+    within its customer (0 for the first child, used for is_primary).
+    """
+    counts = rng.integers(min_count, max_count + 1, len(customer_ids))
+    parents = np.repeat(customer_ids, counts)
+    group_starts = np.cumsum(counts) - counts
+    positions = np.arange(len(parents)) - np.repeat(group_starts, counts)
+    return parents, positions
+
+
+def _concat(*parts):
+    """Element-wise string concatenation of arrays and scalars"""
+    result = np.asarray(parts[0]).astype(str)
+    for part in parts[1:]:
+        result = np.char.add(result, np.asarray(part).astype(str))
+    return result
+
+
+def format_ssn(indices):
+    """Format indices in [0, SSN_SPACE) as AAA-GG-SSSS strings"""
+    indices = np.asarray(indices, dtype=np.int64)
+    area = 100 + indices // (90 * 9000)
+    group = 10 + (indices // 9000) % 90
+    serial = 1000 + indices % 9000
+    return _concat(area, '-', group, '-', serial)
+
+
+def format_document_numbers(indices):
+    """Split indices in [0, DOCUMENT_SPACE) into types and numbers"""
+    indices = np.asarray(indices, dtype=np.int64)
+    types = np.array(DOCUMENT_TYPES)[indices // DOCUMENT_NUMBER_SPACE]
+    prefixes = np.char.upper(np.char.ljust(types, 2).astype('U2'))
+    numbers = 10000 + indices % DOCUMENT_NUMBER_SPACE
+    return types, _concat(prefixes, '-', numbers)
+
+
+def generate_customers(rng, pools, customer_ids, allocator_key=DEFAULT_KEY):
+    """Customer columns for the given IDs, each SSN a keyed permutation of the customer ID"""
+    n = len(customer_ids)
+    ssn_indices = allocate(SSN_SPACE, customer_ids - 1, allocator_key)
+
+    return {
+        'CustomerID': customer_ids,
+        'Customer_First_Name': _pick(rng, pools['first_name'], n),
+        'Customer_Last_Name': _pick(rng, pools['last_name'], n),
+        'ssn': format_ssn(ssn_indices),
+        'date_of_birth': _random_dates(rng, n, -90 * DAYS_PER_YEAR, -18 * DAYS_PER_YEAR),
+        'customer_since': _random_dates(rng, n, -10 * DAYS_PER_YEAR, 0)
+    }
+
+
+def generate_addresses(rng, pools, customer_ids, first_id, per_customer=(1, 3)):
+    """Address columns with 1-3 addresses per customer, the first one primary"""
+    parents, positions = _child_rows(rng, customer_ids, *per_customer)
+    n = len(parents)
+
+    return {
+        'addressID': np.arange(first_id, first_id + n),
+        'customer_id': parents,
+        'street_address': _pick(rng, pools['street_address'], n),
+        'city_name': _pick(rng, pools['city'], n),
+        'state': _pick(rng, pools['state'], n),
+        'zip_code': _pick(rng, pools['zipcode'], n),
+        'country': _pick(rng, COUNTRIES, n),
+        'address_type': _pick(rng, ADDRESS_TYPES, n),
+        'is_primary': positions == 0
+    }
+
+
+def generate_contacts(rng, pools, customer_ids, first_id, per_customer=(1, 3)):
+    """Contact columns whose value format follows the contact type"""
+    parents, positions = _child_rows(rng, customer_ids, *per_customer)
+    n = len(parents)
+    contact_types = _pick(rng, CONTACT_TYPES, n)
+
+    values = np.empty(n, dtype='U100')
+
+    is_email = contact_types == "Email"
+    values[is_email] = _pick(rng, pools['email'], is_email.sum())
+
+    is_phone = np.isin(contact_types, ["Phone", "Mobile", "Work Phone"])
+    values[is_phone] = _pick(rng, pools['phone_number'], is_phone.sum())
+
+    is_fax = contact_types == "Fax"
+    fax_count = is_fax.sum()
+    values[is_fax] = _concat('+1-', rng.integers(100, 1000, fax_count),
+                             '-', rng.integers(100, 1000, fax_count),
+                             '-', rng.integers(1000, 10000, fax_count))
+
+    is_social = contact_types == "Social Media"
+    values[is_social] = _concat('@', _pick(rng, pools['user_name'], is_social.sum()))
+
+    return {
+        'contactID': np.arange(first_id, first_id + n),
+        'customer_id': parents,
+        'contact_type': contact_types,
+        'contact_value': values,
+        'is_primary': positions == 0
+    }
+
+
+def generate_documents(rng, customer_ids, first_id, per_customer=(1, 2), allocator_key=DEFAULT_KEY):
+    """Document columns with document numbers permuted from the document IDs, 80% verified"""
+    parents, _ = _child_rows(rng, customer_ids, *per_customer)
+    n = len(parents)
+    document_ids = np.arange(first_id, first_id + n)
+
+    number_indices = allocate(DOCUMENT_SPACE, document_ids - 1, allocator_key)
+    document_types, document_numbers = format_document_numbers(number_indices)
+
+    return {
+        'document_id': document_ids,
+        'customer_id': parents,
+        'document_type': document_types,
+        'document_number': document_numbers,
+        'issue_date': _random_dates(rng, n, -10 * DAYS_PER_YEAR, -1 * DAYS_PER_YEAR),
+        'expiry_date': _random_dates(rng, n, 1 * DAYS_PER_YEAR, 10 * DAYS_PER_YEAR),
+        'verification_status': rng.random(n) < 0.8,
+        'file_reference': _concat('DOC_', parents, '_', document_types, '_', document_ids, '.pdf')
+    }
+
+
+def generate_notes(rng, pools, customer_ids, first_id, per_customer=(1, 3), max_employee_id=50):
+    """Note columns built from the template pool, 20% important"""
+    parents, _ = _child_rows(rng, customer_ids, *per_customer)
+    n = len(parents)
+
+    return {
+        'note_id': np.arange(first_id, first_id + n),
+        'customer_id': parents,
+        'employee_id': rng.integers(1, max_employee_id + 1, n),
+        'note_date': _random_dates(rng, n, -3 * DAYS_PER_YEAR, 0),
+        'note_category': _pick(rng, NOTE_CATEGORIES, n),
+        'note_text': _pick(rng, pools['note_text'], n),
+        'is_important': rng.random(n) < 0.2
+    }
+
+
+def generate_segment_assignments(rng, customer_ids, first_id=None, num_segments=10):
+    """One segment assignment per customer; IDs follow the customer IDs unless first_id is given"""
+    n = len(customer_ids)
+    if first_id is None:
+        assignment_ids = customer_ids
+    else:
+        assignment_ids = np.arange(first_id, first_id + n)
+
+    return {
+        'assignment_id': assignment_ids,
+        'customer_id': customer_ids,
+        'segment_id': rng.integers(1, num_segments + 1, n),
+        'assigned_date': _random_dates(rng, n, -5 * DAYS_PER_YEAR, 0)
+    }
+
+
+def generate_tables(customer_ids, id_starts=None, child_counts=None, seed=None,
+                    pools=None, max_employee_id=50, allocator_key=DEFAULT_KEY):
+    """
+    Generate every customer table as columns of NumPy arrays
+
+    Parameters:
+        customer_ids (array-like): Customer IDs to generate
+        id_starts (dict): First primary key per child table; defaults to the first customer ID
+        child_counts (dict): (min, max) child rows per customer, see DEFAULT_CHILD_COUNTS
+        seed (int): Seed for reproducible output
+        pools (dict): Value pools from build_value_pools, built on demand when omitted
+        max_employee_id (int): Upper bound of the employee IDs written on notes
+        allocator_key (int): Key of the SSN / document number permutations; SSNs and
+            document numbers stay unique across calls (and parallel shards) that
+            share the key and use disjoint customer and document IDs
+
+    Returns:
+        dict: table name -> {column name -> array}, in TABLE_COLUMNS order
+    """
+    customer_ids = np.asarray(customer_ids, dtype=np.int64)
+    rng = np.random.default_rng(seed)
+    if pools is None:
+        pools = build_value_pools(seed=seed)
+
+    counts = dict(DEFAULT_CHILD_COUNTS)
+    counts.update(child_counts or {})
+
+    first_customer = int(customer_ids[0]) if len(customer_ids) else 1
+    starts = {table: first_customer for table in DEFAULT_CHILD_COUNTS}
+    starts['CustomerSegmentAssignment'] = None
+    starts.update(id_starts or {})
+
+    return {
+        'Customer': generate_customers(rng, pools, customer_ids, allocator_key),
+        'Address': generate_addresses(rng, pools, customer_ids, starts['Address'], counts['Address']),
+        'Contact': generate_contacts(rng, pools, customer_ids, starts['Contact'], counts['Contact']),
+        'CustomerDocument': generate_documents(rng, customer_ids, starts['CustomerDocument'],
+                                               counts['CustomerDocument'], allocator_key),
+        'CustomerNote': generate_notes(rng, pools, customer_ids, starts['CustomerNote'],
+                                       counts['CustomerNote'], max_employee_id),
+        'CustomerSegmentAssignment': generate_segment_assignments(
+            rng, customer_ids, starts['CustomerSegmentAssignment'])
+    }
+
+
+def rekey_table(table_name, table, ids, allocator_key=DEFAULT_KEY):
+    """
+    Replace a generated table's primary keys with externally allocated ones
+
+    For loads that take keys from a database sequence. Document numbers, types
+    and file references are derived from the document IDs, so they are
+    re-derived from the new keys and stay unique.
+    """
+    ids = np.asarray(ids, dtype=np.int64)
+    table[TABLE_COLUMNS[table_name][0]] = ids
+    if table_name == 'CustomerDocument':
+        number_indices = allocate(DOCUMENT_SPACE, ids - 1, allocator_key)
+        table['document_type'], table['document_number'] = format_document_numbers(number_indices)
+        table['file_reference'] = _concat('DOC_', table['customer_id'], '_', table['document_type'],
+                                          '_', ids, '.pdf')
+    return table
+
+
+def table_length(table):
+    """Number of rows in a generated table"""
+    return len(next(iter(table.values())))
+
+
+def iter_rows(table, columns, chunk_size=100000):
+    """
+    Yield rows of plain Python values (for executemany / COPY) from column arrays
+
+    Columns are converted with tolist() one chunk at a time, so database drivers
+    never see NumPy scalars and memory stays bounded.
+    """
+    total = table_length(table)
+    for start in range(0, total, chunk_size):
+        end = start + chunk_size
+        yield from zip(*(table[column][start:end].tolist() for column in columns))
+
+
+def iter_records(table, columns, chunk_size=100000):
+    """Yield rows as dictionaries keyed by column name (for JSON export)"""
+    for row in iter_rows(table, columns, chunk_size):
+        yield dict(zip(columns, row))
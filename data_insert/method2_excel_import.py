@@ -1,12 +1,27 @@
 import pandas as pd
+import pyarrow.parquet as pq
 import sqlite3
-import random
-from datetime import datetime
-from faker import Faker
+import itertools
 import os
+from openpyxl import Workbook, load_workbook
+from columnar_generator import generate_tables, iter_rows, TABLE_COLUMNS
+from sqlite_profile import connect_database, close_database, table_transaction
 
-# Initialize Faker for generating realistic data
-fake = Faker()
+# Template file formats: Excel, or CSV / Parquet interchange files with the same layout
+TEMPLATE_FORMATS = ('xlsx', 'csv', 'parquet')
+
+# Rows per executemany batch (and per Parquet row group)
+TEMPLATE_BATCH_SIZE = 10000
+
+# Table -> template file name (without extension) in excel_templates/, in foreign key order
+TEMPLATES = [
+    ('Customer', 'customer_template'),
+    ('Address', 'address_template'),
+    ('Contact', 'contact_template'),
+    ('CustomerDocument', 'document_template'),
+    ('CustomerNote', 'note_template'),
+    ('CustomerSegmentAssignment', 'segment_assignment_template')
+]
 
 def create_database():
     """Create the SQLite database with all necessary tables if it doesn't exist"""
@@ -130,14 +145,81 @@ def create_segments():
     
     conn.close()
 
-def method2_excel_import(start_id=1, end_id=450):
+def write_template(path, table, columns, file_format='xlsx'):
+    """
+    Write a generated table as a template file
+    
+    Excel files are written with an openpyxl write-only workbook, which streams
+    rows to disk instead of keeping every cell in memory. CSV and Parquet
+    frames are built from complete column arrays.
+    """
+    if file_format == 'xlsx':
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet()
+        sheet.append(columns)
+        for row in iter_rows(table, columns):
+            sheet.append(row)
+        workbook.save(path)
+        return
+    
+    df = pd.DataFrame({column: table[column] for column in columns})
+    if file_format == 'csv':
+        # Booleans as 1/0 so SQLite's numeric affinity stores them like the other methods
+        df.astype({column: 'int8' for column in columns if df[column].dtype == bool}).to_csv(path, index=False)
+    else:
+        df.to_parquet(path, index=False, row_group_size=TEMPLATE_BATCH_SIZE)
+
+def iter_template_batches(path, file_format='xlsx', batch_size=TEMPLATE_BATCH_SIZE):
+    """Read a template file lazily, yielding (columns, rows) batches"""
+    if file_format == 'xlsx':
+        workbook = load_workbook(path, read_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            columns = list(next(rows))
+            while True:
+                batch = list(itertools.islice(rows, batch_size))
+                if not batch:
+                    break
+                yield columns, batch
+        finally:
+            workbook.close()
+    elif file_format == 'csv':
+        # Read as text so values like zip codes keep their leading zeros
+        for chunk in pd.read_csv(path, chunksize=batch_size, dtype=str, keep_default_na=False):
+            yield list(chunk.columns), chunk.values.tolist()
+    else:
+        parquet_file = pq.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=batch_size):
+            yield batch.schema.names, list(zip(*batch.to_pydict().values()))
+
+def import_template(conn, table_name, path, file_format='xlsx', batch_size=TEMPLATE_BATCH_SIZE):
+    """Import a template file in batches with executemany in one transaction, returning the record count"""
+    total = 0
+    with table_transaction(conn):
+        for columns, rows in iter_template_batches(path, file_format, batch_size):
+            conn.executemany(f'''
+                INSERT INTO {table_name} ({', '.join(columns)})
+                VALUES ({', '.join(['?'] * len(columns))})
+            ''', rows)
+            total += len(rows)
+    return total
+
+def method2_excel_import(start_id=1, end_id=450, id_starts=None,
+                         file_format='xlsx', batch_size=TEMPLATE_BATCH_SIZE, profile='default'):
     """
     Method 2: Excel template creation and import
     
     Parameters:
         start_id (int): Starting ID for records
         end_id (int): Ending ID for records
+        id_starts (dict): First primary key per child table (defaults to start_id)
+        file_format (str): 'xlsx', or 'csv' / 'parquet' to skip Excel for large imports
+        batch_size (int): Rows per executemany batch during import
+        profile (str): SQLite connection profile, 'default' or 'bulk' (see sqlite_profile)
     """
+    if file_format not in TEMPLATE_FORMATS:
+        raise ValueError(f"Unknown file format '{file_format}', expected one of {TEMPLATE_FORMATS}")
+    
     print(f"\n=== METHOD 2: EXCEL TEMPLATE CREATION AND IMPORT (IDs {start_id}-{end_id}) ===")
     
     # Create or connect to database
@@ -149,239 +231,27 @@ def method2_excel_import(start_id=1, end_id=450):
     # Create directory for excel templates
     os.makedirs('excel_templates', exist_ok=True)
     
-    # ---------------------- Customer Template ----------------------
-    print("Creating customer Excel template...")
-    customer_df = pd.DataFrame(columns=[
-        'CustomerID', 'Customer_First_Name', 'Customer_Last_Name', 
-        'ssn', 'date_of_birth', 'customer_since'
-    ])
-    
-    # Add rows
-    used_ssns = set()
-    for i in range(start_id, end_id + 1):
-        while True:
-            ssn = f"{random.randint(100, 999)}-{random.randint(10, 99)}-{random.randint(1000, 9999)}"
-            if ssn not in used_ssns:
-                used_ssns.add(ssn)
-                break
-        
-        customer_df.loc[i - start_id] = [
-            i,
-            fake.first_name(),
-            fake.last_name(),
-            ssn,
-            fake.date_of_birth(minimum_age=18, maximum_age=90).strftime('%Y-%m-%d'),
-            fake.date_between(start_date='-10y', end_date='today').strftime('%Y-%m-%d')
-        ]
-    
-    # Save customer template
-    customer_df.to_excel('excel_templates/customer_template.xlsx', index=False)
-    
-    # ---------------------- Address Template ----------------------
-    print("Creating address Excel template...")
-    address_rows = []
-    address_types = ["Home", "Work", "Shipping", "Billing", "Secondary"]
-    countries = ["Israel", "USA", "Canada", "UK", "Australia", "Germany", "France"]
-    
-    address_id = start_id
-    for i in range(start_id, end_id + 1):
-        # Each customer gets 1-3 addresses
-        num_addresses = random.randint(1, 3)
-        for j in range(num_addresses):
-            address_rows.append([
-                address_id,
-                i,
-                fake.street_address(),
-                fake.city(),
-                fake.state(),
-                fake.zipcode(),
-                random.choice(countries),
-                random.choice(address_types),
-                1 if j == 0 else 0  # First address is primary
-            ])
-            address_id += 1
-    
-    address_df = pd.DataFrame(address_rows, columns=[
-        'addressID', 'customer_id', 'street_address', 'city_name', 
-        'state', 'zip_code', 'country', 'address_type', 'is_primary'
-    ])
-    
-    # Save address template
-    address_df.to_excel('excel_templates/address_template.xlsx', index=False)
-    
-    # ---------------------- Contact Template ----------------------
-    print("Creating contact Excel template...")
-    contact_rows = []
-    contact_types = ["Email", "Phone", "Mobile", "Work Phone", "Fax", "Social Media"]
+    # Generate all tables at once as column arrays
+    print("Generating template data...")
+    generated = generate_tables(range(start_id, end_id + 1), id_starts=id_starts)
     
-    contact_id = start_id
-    for i in range(start_id, end_id + 1):
-        # Each customer gets 1-3 contacts
-        num_contacts = random.randint(1, 3)
-        for j in range(num_contacts):
-            contact_type = random.choice(contact_types)
-            
-            if contact_type == "Email":
-                value = fake.email()
-            elif contact_type in ["Phone", "Mobile", "Work Phone"]:
-                value = fake.phone_number()
-            elif contact_type == "Fax":
-                value = f"+1-{random.randint(100, 999)}-{random.randint(100, 999)}-{random.randint(1000, 9999)}"
-            else:  # Social Media
-                value = f"@{fake.user_name()}"
-            
-            contact_rows.append([
-                contact_id,
-                i,
-                contact_type,
-                value,
-                1 if j == 0 else 0  # First contact is primary
-            ])
-            contact_id += 1
+    # ---------------------- Templates ----------------------
+    for table_name, file_name in TEMPLATES:
+        print(f"Creating {table_name} {file_format.upper()} template...")
+        write_template(f'excel_templates/{file_name}.{file_format}',
+                       generated[table_name], TABLE_COLUMNS[table_name], file_format)
     
-    contact_df = pd.DataFrame(contact_rows, columns=[
-        'contactID', 'customer_id', 'contact_type', 'contact_value', 'is_primary'
-    ])
-    
-    # Save contact template
-    contact_df.to_excel('excel_templates/contact_template.xlsx', index=False)
-    
-    # ---------------------- Document Template ----------------------
-    print("Creating document Excel template...")
-    document_rows = []
-    document_types = ["Passport", "Driver License", "ID Card", "Birth Certificate", "Social Security Card", "Tax ID"]
-    used_document_numbers = set()
-    
-    document_id = start_id
-    for i in range(start_id, end_id + 1):
-        # Each customer gets 1-2 documents
-        num_documents = random.randint(1, 2)
-        for j in range(num_documents):
-            doc_type = random.choice(document_types)
-            
-            # Generate unique document number
-            while True:
-                doc_num = f"{doc_type[:2].upper()}-{random.randint(10000, 999999)}"
-                if doc_num not in used_document_numbers:
-                    used_document_numbers.add(doc_num)
-                    break
-            
-            issue_date = fake.date_between(start_date='-10y', end_date='-1y').strftime('%Y-%m-%d')
-            expiry_date = fake.date_between(start_date='+1y', end_date='+10y').strftime('%Y-%m-%d')
-            
-            document_rows.append([
-                document_id,
-                i,
-                doc_type,
-                doc_num,
-                issue_date,
-                expiry_date,
-                1 if random.random() < 0.8 else 0,  # 80% are verified
-                f"DOC_{i}_{doc_type}_{document_id}.pdf"
-            ])
-            document_id += 1
-    
-    document_df = pd.DataFrame(document_rows, columns=[
-        'document_id', 'customer_id', 'document_type', 'document_number',
-        'issue_date', 'expiry_date', 'verification_status', 'file_reference'
-    ])
-    
-    # Save document template
-    document_df.to_excel('excel_templates/document_template.xlsx', index=False)
-    
-    # ---------------------- Note Template ----------------------
-    print("Creating note Excel template...")
-    note_rows = []
-    note_categories = ["Inquiry", "Complaint", "Request", "Feedback", "Update", "Alert"]
-    note_templates = [
-        "Customer called about {topic}. Resolved issue by {resolution}.",
-        "Customer visited branch to discuss {topic}. {resolution}.",
-        "Customer emailed regarding {topic}. {resolution}."
-    ]
-    topics = ["account access", "transaction dispute", "loan application", "interest rates", "fees", "online banking"]
-    resolutions = [
-        "Provided information",
-        "Escalated to manager",
-        "Reset credentials",
-        "Scheduled appointment",
-        "Updated account settings"
-    ]
-    
-    note_id = start_id
-    for i in range(start_id, end_id + 1):
-        # Each customer gets 1-3 notes
-        num_notes = random.randint(1, 3)
-        for j in range(num_notes):
-            employee_id = random.randint(1, 50)
-            note_date = fake.date_between(start_date='-3y', end_date='today').strftime('%Y-%m-%d')
-            category = random.choice(note_categories)
-            template = random.choice(note_templates)
-            topic = random.choice(topics)
-            resolution = random.choice(resolutions)
-            note_text = template.format(topic=topic, resolution=resolution)
-            
-            note_rows.append([
-                note_id,
-                i,
-                employee_id,
-                note_date,
-                category,
-                note_text,
-                1 if random.random() < 0.2 else 0  # 20% are important
-            ])
-            note_id += 1
-    
-    note_df = pd.DataFrame(note_rows, columns=[
-        'note_id', 'customer_id', 'employee_id', 'note_date', 
-        'note_category', 'note_text', 'is_important'
-    ])
-    
-    # Save note template
-    note_df.to_excel('excel_templates/note_template.xlsx', index=False)
-    
-    # ---------------------- Segment Assignment Template ----------------------
-    print("Creating segment assignment Excel template...")
-    segment_assignment_rows = []
-    
-    for i in range(start_id, end_id + 1):
-        # Each customer gets 1 segment assignment
-        segment_id = random.randint(1, 10)
-        assigned_date = fake.date_between(start_date='-5y', end_date='today').strftime('%Y-%m-%d')
-        
-        segment_assignment_rows.append([
-            i,  # assignment_id
-            i,  # customer_id
-            segment_id,
-            assigned_date
-        ])
-    
-    segment_assignment_df = pd.DataFrame(segment_assignment_rows, columns=[
-        'assignment_id', 'customer_id', 'segment_id', 'assigned_date'
-    ])
-    
-    # Save segment assignment template
-    segment_assignment_df.to_excel('excel_templates/segment_assignment_template.xlsx', index=False)
-    
-    # ---------------------- Import Excel templates to database ----------------------
-    print("\nImporting Excel templates to database...")
+    # ---------------------- Import templates to database ----------------------
+    print(f"\nImporting {file_format.upper()} templates to database...")
     
     # Connect to database
-    conn = sqlite3.connect('customer_database.db')
+    conn = connect_database(profile)
     
     # Import templates to database
-    tables = [
-        {'name': 'Customer', 'file': 'customer_template.xlsx'},
-        {'name': 'Address', 'file': 'address_template.xlsx'},
-        {'name': 'Contact', 'file': 'contact_template.xlsx'},
-        {'name': 'CustomerDocument', 'file': 'document_template.xlsx'},
-        {'name': 'CustomerNote', 'file': 'note_template.xlsx'},
-        {'name': 'CustomerSegmentAssignment', 'file': 'segment_assignment_template.xlsx'}
-    ]
-    
-    for table in tables:
-        df = pd.read_excel(f"excel_templates/{table['file']}")
-        df.to_sql(table['name'], conn, if_exists='append', index=False)
-        print(f"Imported {len(df)} records to {table['name']} table")
+    for table_name, file_name in TEMPLATES:
+        count = import_template(conn, table_name, f'excel_templates/{file_name}.{file_format}',
+                                file_format, batch_size)
+        print(f"Imported {count} records to {table_name} table")
     
     # Verify counts
     table_counts = {}
@@ -395,7 +265,7 @@ def method2_excel_import(start_id=1, end_id=450):
     
     # Close connection
     conn.commit()
-    conn.close()
+    close_database(conn, profile)
     
     print("\n=== DATA GENERATION SUMMARY ===")
     for table, count in table_counts.items():
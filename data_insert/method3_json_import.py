@@ -1,12 +1,25 @@
 import sqlite3
 import json
-import random
-from datetime import datetime
-from faker import Faker
+import operator
 import os
+from columnar_generator import generate_tables, iter_records, TABLE_COLUMNS
+from sqlite_profile import connect_database, close_database, table_transaction
 
-# Initialize Faker for generating realistic data
-fake = Faker()
+# Supported file formats: JSON arrays or NDJSON (one object per line)
+JSON_FORMATS = ('json', 'ndjson')
+
+# Records per executemany batch when importing NDJSON
+NDJSON_BATCH_SIZE = 10000
+
+# Table -> data file name (without extension), in foreign key order
+JSON_FILES = [
+    ('Customer', 'customers'),
+    ('Address', 'addresses'),
+    ('Contact', 'contacts'),
+    ('CustomerDocument', 'documents'),
+    ('CustomerNote', 'notes'),
+    ('CustomerSegmentAssignment', 'segment_assignments')
+]
 
 def create_database():
     """Create the SQLite database with all necessary tables if it doesn't exist"""
@@ -130,220 +143,58 @@ def create_segments():
     
     conn.close()
 
-def method3_json_import(start_id=1, end_id=450):
+def write_ndjson(path, table, columns):
+    """Write a generated table as NDJSON, one object per line"""
+    with open(path, 'w') as f:
+        for record in iter_records(table, columns):
+            f.write(json.dumps(record))
+            f.write('\n')
+
+def iter_ndjson_batches(path, batch_size=NDJSON_BATCH_SIZE):
+    """Read an NDJSON file lazily, yielding lists of at most batch_size objects"""
+    batch = []
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            batch.append(json.loads(line))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+def import_ndjson(conn, table_name, path, columns, batch_size=NDJSON_BATCH_SIZE):
     """
-    Method 3: JSON Generation and Import
+    Import an NDJSON file with one executemany per batch
     
-    Parameters:
-        start_id (int): Starting ID for records
-        end_id (int): Ending ID for records
+    Only one batch is held in memory at a time, so memory stays flat no
+    matter how large the file is. Returns the number of imported records.
     """
-    print(f"\n=== METHOD 3: JSON GENERATION AND IMPORT (IDs {start_id}-{end_id}) ===")
-    
-    # Create or connect to database
-    create_database()
-    
-    # Create segments if needed
-    create_segments()
-    
-    # Create directory for JSON files
-    os.makedirs('json_data', exist_ok=True)
-    
-    # ---------------------- Customer Data ----------------------
-    print("Generating customer JSON data...")
-    customer_data = []
-    used_ssns = set()
-    
-    for i in range(start_id, end_id + 1):
-        while True:
-            ssn = f"{random.randint(100, 999)}-{random.randint(10, 99)}-{random.randint(1000, 9999)}"
-            if ssn not in used_ssns:
-                used_ssns.add(ssn)
-                break
-        
-        customer_data.append({
-            "CustomerID": i,
-            "Customer_First_Name": fake.first_name(),
-            "Customer_Last_Name": fake.last_name(),
-            "ssn": ssn,
-            "date_of_birth": fake.date_of_birth(minimum_age=18, maximum_age=90).strftime('%Y-%m-%d'),
-            "customer_since": fake.date_between(start_date='-10y', end_date='today').strftime('%Y-%m-%d')
-        })
-    
-    # Save customer data to JSON
-    with open('json_data/customers.json', 'w') as f:
-        json.dump(customer_data, f, indent=2)
-    
-    # ---------------------- Address Data ----------------------
-    print("Generating address JSON data...")
-    address_data = []
-    address_types = ["Home", "Work", "Shipping", "Billing", "Secondary"]
-    countries = ["Israel", "USA", "Canada", "UK", "Australia", "Germany", "France"]
-    
-    address_id = start_id
-    for i in range(start_id, end_id + 1):
-        # Each customer gets 1-3 addresses
-        num_addresses = random.randint(1, 3)
-        for j in range(num_addresses):
-            address_data.append({
-                "addressID": address_id,
-                "customer_id": i,
-                "street_address": fake.street_address(),
-                "city_name": fake.city(),
-                "state": fake.state(),
-                "zip_code": fake.zipcode(),
-                "country": random.choice(countries),
-                "address_type": random.choice(address_types),
-                "is_primary": 1 if j == 0 else 0  # First address is primary
-            })
-            address_id += 1
-    
-    # Save address data to JSON
-    with open('json_data/addresses.json', 'w') as f:
-        json.dump(address_data, f, indent=2)
-    
-    # ---------------------- Contact Data ----------------------
-    print("Generating contact JSON data...")
-    contact_data = []
-    contact_types = ["Email", "Phone", "Mobile", "Work Phone", "Fax", "Social Media"]
-    
-    contact_id = start_id
-    for i in range(start_id, end_id + 1):
-        # Each customer gets 1-3 contacts
-        num_contacts = random.randint(1, 3)
-        for j in range(num_contacts):
-            contact_type = random.choice(contact_types)
-            
-            if contact_type == "Email":
-                value = fake.email()
-            elif contact_type in ["Phone", "Mobile", "Work Phone"]:
-                value = fake.phone_number()
-            elif contact_type == "Fax":
-                value = f"+1-{random.randint(100, 999)}-{random.randint(100, 999)}-{random.randint(1000, 9999)}"
-            else:  # Social Media
-                value = f"@{fake.user_name()}"
-            
-            contact_data.append({
-                "contactID": contact_id,
-                "customer_id": i,
-                "contact_type": contact_type,
-                "contact_value": value,
-                "is_primary": 1 if j == 0 else 0  # First contact is primary
-            })
-            contact_id += 1
-    
-    # Save contact data to JSON
-    with open('json_data/contacts.json', 'w') as f:
-        json.dump(contact_data, f, indent=2)
-    
-    # ---------------------- Document Data ----------------------
-    print("Generating document JSON data...")
-    document_data = []
-    document_types = ["Passport", "Driver License", "ID Card", "Birth Certificate", "Social Security Card", "Tax ID"]
-    used_document_numbers = set()
-    
-    document_id = start_id
-    for i in range(start_id, end_id + 1):
-        # Each customer gets 1-2 documents
-        num_documents = random.randint(1, 2)
-        for j in range(num_documents):
-            doc_type = random.choice(document_types)
-            
-            # Generate unique document number
-            while True:
-                doc_num = f"{doc_type[:2].upper()}-{random.randint(10000, 999999)}"
-                if doc_num not in used_document_numbers:
-                    used_document_numbers.add(doc_num)
-                    break
-            
-            document_data.append({
-                "document_id": document_id,
-                "customer_id": i,
-                "document_type": doc_type,
-                "document_number": doc_num,
-                "issue_date": fake.date_between(start_date='-10y', end_date='-1y').strftime('%Y-%m-%d'),
-                "expiry_date": fake.date_between(start_date='+1y', end_date='+10y').strftime('%Y-%m-%d'),
-                "verification_status": 1 if random.random() < 0.8 else 0,  # 80% are verified
-                "file_reference": f"DOC_{i}_{doc_type}_{document_id}.pdf"
-            })
-            document_id += 1
-    
-    # Save document data to JSON
-    with open('json_data/documents.json', 'w') as f:
-        json.dump(document_data, f, indent=2)
-    
-    # ---------------------- Note Data ----------------------
-    print("Generating note JSON data...")
-    note_data = []
-    note_categories = ["Inquiry", "Complaint", "Request", "Feedback", "Update", "Alert"]
-    note_templates = [
-        "Customer called about {topic}. Resolved issue by {resolution}.",
-        "Customer visited branch to discuss {topic}. {resolution}.",
-        "Customer emailed regarding {topic}. {resolution}."
-    ]
-    topics = ["account access", "transaction dispute", "loan application", "interest rates", "fees", "online banking"]
-    resolutions = [
-        "Provided information",
-        "Escalated to manager",
-        "Reset credentials",
-        "Scheduled appointment",
-        "Updated account settings"
-    ]
-    
-    note_id = start_id
-    for i in range(start_id, end_id + 1):
-        # Each customer gets 1-3 notes
-        num_notes = random.randint(1, 3)
-        for j in range(num_notes):
-            employee_id = random.randint(1, 50)
-            note_date = fake.date_between(start_date='-3y', end_date='today')
-            category = random.choice(note_categories)
-            template = random.choice(note_templates)
-            topic = random.choice(topics)
-            resolution = random.choice(resolutions)
-            note_text = template.format(topic=topic, resolution=resolution)
-            
-            note_data.append({
-                "note_id": note_id,
-                "customer_id": i,
-                "employee_id": employee_id,
-                "note_date": note_date.strftime('%Y-%m-%d'),
-                "note_category": category,
-                "note_text": note_text,
-                "is_important": 1 if random.random() < 0.2 else 0  # 20% are important
-            })
-            note_id += 1
-    
-    # Save note data to JSON
-    with open('json_data/notes.json', 'w') as f:
-        json.dump(note_data, f, indent=2)
-    
-    # ---------------------- Segment Assignment Data ----------------------
-    print("Generating segment assignment JSON data...")
-    segment_assignment_data = []
-    
-    for i in range(start_id, end_id + 1):
-        # Each customer gets 1 segment assignment
-        segment_id = random.randint(1, 10)
-        
-        segment_assignment_data.append({
-            "assignment_id": i,
-            "customer_id": i,
-            "segment_id": segment_id,
-            "assigned_date": fake.date_between(start_date='-5y', end_date='today').strftime('%Y-%m-%d')
-        })
-    
-    # Save segment assignment data to JSON
-    with open('json_data/segment_assignments.json', 'w') as f:
-        json.dump(segment_assignment_data, f, indent=2)
-    
-    # ---------------------- Import JSON data to database ----------------------
-    print("\nImporting JSON data to database...")
-    
-    # Connect to database
-    conn = sqlite3.connect('customer_database.db')
-    cursor = conn.cursor()
-    
+    insert_sql = f'''
+        INSERT INTO {table_name} ({', '.join(columns)})
+        VALUES ({', '.join(['?'] * len(columns))})
+    '''
+    get_values = operator.itemgetter(*columns)
+    
+    total = 0
+    with table_transaction(conn):
+        for batch in iter_ndjson_batches(path, batch_size):
+            conn.executemany(insert_sql, [get_values(record) for record in batch])
+            total += len(batch)
+    return total
+
+def import_ndjson_files(conn, batch_size=NDJSON_BATCH_SIZE):
+    """Import every NDJSON table file in foreign key order"""
+    for table_name, file_name in JSON_FILES:
+        print(f"Importing {table_name} data...")
+        count = import_ndjson(conn, table_name, f'json_data/{file_name}.ndjson',
+                              TABLE_COLUMNS[table_name], batch_size)
+        print(f"Imported {count} records to {table_name} table")
+
+def import_json_files(cursor):
+    """Import the JSON array files with one execute per record"""
     # Import customer data
     print("Importing customer data...")
     with open('json_data/customers.json', 'r') as f:
@@ -460,6 +311,58 @@ def method3_json_import(start_id=1, end_id=450):
             assignment['segment_id'],
             assignment['assigned_date']
         ))
+
+def method3_json_import(start_id=1, end_id=450, id_starts=None,
+                        file_format='json', batch_size=NDJSON_BATCH_SIZE, profile='default'):
+    """
+    Method 3: JSON Generation and Import
+    
+    Parameters:
+        start_id (int): Starting ID for records
+        end_id (int): Ending ID for records
+        id_starts (dict): First primary key per child table (defaults to start_id)
+        file_format (str): 'json' for JSON arrays, 'ndjson' for streamed one-object-per-line files
+        batch_size (int): Records per executemany batch in 'ndjson' mode
+        profile (str): SQLite connection profile, 'default' or 'bulk' (see sqlite_profile)
+    """
+    if file_format not in JSON_FORMATS:
+        raise ValueError(f"Unknown file format '{file_format}', expected one of {JSON_FORMATS}")
+    
+    print(f"\n=== METHOD 3: JSON GENERATION AND IMPORT (IDs {start_id}-{end_id}) ===")
+    
+    # Create or connect to database
+    create_database()
+    
+    # Create segments if needed
+    create_segments()
+    
+    # Create directory for JSON files
+    os.makedirs('json_data', exist_ok=True)
+    
+    # Generate all tables at once as column arrays
+    print("Generating JSON data...")
+    generated = generate_tables(range(start_id, end_id + 1), id_starts=id_starts)
+    
+    for table_name, file_name in JSON_FILES:
+        print(f"Saving {table_name} {file_format.upper()} data...")
+        if file_format == 'ndjson':
+            write_ndjson(f'json_data/{file_name}.ndjson', generated[table_name], TABLE_COLUMNS[table_name])
+        else:
+            records = list(iter_records(generated[table_name], TABLE_COLUMNS[table_name]))
+            with open(f'json_data/{file_name}.json', 'w') as f:
+                json.dump(records, f, indent=2)
+    
+    # ---------------------- Import JSON data to database ----------------------
+    print(f"\nImporting {file_format.upper()} data to database...")
+    
+    # Connect to database
+    conn = connect_database(profile)
+    cursor = conn.cursor()
+    
+    if file_format == 'ndjson':
+        import_ndjson_files(conn, batch_size)
+    else:
+        import_json_files(cursor)
     
     # Verify counts
     table_counts = {}
@@ -472,7 +375,7 @@ def method3_json_import(start_id=1, end_id=450):
     
     # Commit and close
     conn.commit()
-    conn.close()
+    close_database(conn, profile)
     
     print("\n=== DATA GENERATION SUMMARY ===")
     for table, count in table_counts.items():
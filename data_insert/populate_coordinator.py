@@ -1,6 +1,13 @@
 import sqlite3
 import os
 import sys
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+from table_stats import table_counts, STATS_MODES
+
+# Directory where parallel workers write their shard outputs
+SHARD_DIR = 'shards'
 
 def check_prerequisites():
     """Check that all required modules are installed"""
@@ -8,12 +15,15 @@ def check_prerequisites():
         import pandas
         import faker
         import json
+        import numpy
+        import openpyxl
+        import pyarrow
         print("All required modules are installed.")
         return True
     except ImportError as e:
         print(f"Error: Missing required module - {e}")
         print("Please install the required modules with:")
-        print("pip install pandas faker")
+        print("pip install pandas faker numpy openpyxl pyarrow")
         return False
 
 def create_database():
@@ -134,30 +144,30 @@ def create_segments():
     
     print(f"Created {len(segments)} customer segments")
 
-def validate_database(min_records=400):
-    """Validate the database to ensure it has sufficient records"""
-    print("\n=== VALIDATING DATABASE ===")
+def validate_database(min_records=400, mode='exact'):
+    """
+    Validate the database to ensure it has sufficient records
+    
+    Parameters:
+        min_records (int): Records every generated table needs; every customer
+            gets at least one row in each table, so callers pass the number of
+            customers they generated
+        mode (str): 'exact' counts all tables in one query, 'estimate' reads
+            sqlite_stat1 (kept current by the bulk profile's ANALYZE)
+    """
+    print(f"\n=== VALIDATING DATABASE ({mode} counts) ===")
     
     # Connect to database
     conn = sqlite3.connect('customer_database.db')
-    cursor = conn.cursor()
     
-    # Check record count for each table
-    tables = [
-        'Customer', 
-        'Address', 
-        'Contact', 
-        'CustomerDocument', 
-        'CustomerNote', 
-        'CustomerSegment', 
-        'CustomerSegmentAssignment'
-    ]
+    # Check record count for each table; the data was just loaded, so skip the cache
+    counts = table_counts(conn.cursor(), mode, refresh=True)
     
     all_valid = True
-    for table in tables:
-        cursor.execute(f"SELECT COUNT(*) FROM {table}")
-        count = cursor.fetchone()[0]
-        if table == 'CustomerSegment':
+    for table, count in counts.items():
+        if count is None:
+            status = "✗ FAIL"
+        elif table == 'CustomerSegment':
             status = "✓ PASS" if count == 10 else "✗ FAIL"
         else:
             status = "✓ PASS" if count >= min_records else "✗ FAIL"
@@ -177,7 +187,158 @@ def validate_database(min_records=400):
     
     return all_valid
 
-def main():
+def plan_shards(total_customers, num_shards, start_id=1):
+    """
+    Split customers into disjoint ID shards and reserve child-row ID ranges up front
+    
+    Child tables get blocks sized for the maximum number of child rows per
+    customer, so shards never collide on addressID, contactID, document_id,
+    note_id or assignment_id no matter how many rows each shard draws.
+    SSNs and document numbers are permutations of the customer and document
+    IDs under one shared key (see unique_allocator), so disjoint ID blocks
+    also keep them unique.
+    
+    Parameters:
+        total_customers (int): Number of customers across all shards
+        num_shards (int): Number of shards
+        start_id (int): First CustomerID
+    
+    Returns:
+        list: One dict per shard with start_id, end_id and id_starts
+    """
+    from columnar_generator import DEFAULT_CHILD_COUNTS
+    
+    num_shards = max(1, min(num_shards, total_customers))
+    base_size, remainder = divmod(total_customers, num_shards)
+    
+    shards = []
+    next_customer = start_id
+    next_child_ids = {table: start_id for table in DEFAULT_CHILD_COUNTS}
+    next_child_ids['CustomerSegmentAssignment'] = start_id
+    
+    for index in range(num_shards):
+        size = base_size + (1 if index < remainder else 0)
+        shards.append({
+            'shard': index,
+            'start_id': next_customer,
+            'end_id': next_customer + size - 1,
+            'id_starts': dict(next_child_ids)
+        })
+        
+        next_customer += size
+        for table, (_, max_count) in DEFAULT_CHILD_COUNTS.items():
+            next_child_ids[table] += size * max_count
+        next_child_ids['CustomerSegmentAssignment'] += size
+    
+    return shards
+
+def generate_shard(shard, output_dir=SHARD_DIR, seed=None):
+    """
+    Worker: generate one shard's tables and save them as a .npz file
+    
+    Returns the path of the shard output file.
+    """
+    import numpy as np
+    from columnar_generator import generate_tables, table_length
+    
+    shard_seed = None if seed is None else seed + shard['shard']
+    generated = generate_tables(range(shard['start_id'], shard['end_id'] + 1),
+                                id_starts=shard['id_starts'],
+                                seed=shard_seed)
+    
+    arrays = {f"{table}__{column}": values
+              for table, columns in generated.items()
+              for column, values in columns.items()}
+    
+    path = os.path.join(output_dir, f"shard_{shard['shard']:04d}.npz")
+    np.savez(path, **arrays)
+    
+    rows = sum(table_length(columns) for columns in generated.values())
+    print(f"Shard {shard['shard']}: IDs {shard['start_id']}-{shard['end_id']}, {rows} rows")
+    return path
+
+def merge_shards(shard_paths, db_path='customer_database.db', profile='default'):
+    """Load every shard output into the SQLite database, one transaction per table in foreign key order"""
+    import numpy as np
+    from columnar_generator import iter_rows, TABLE_COLUMNS, TABLE_ORDER
+    from sqlite_profile import connect_database, close_database, table_transaction
+    
+    print("\n=== MERGING SHARD OUTPUTS ===")
+    shards = [np.load(path) for path in shard_paths]
+    
+    conn = connect_database(profile, db_path)
+    cursor = conn.cursor()
+    
+    for table_name in TABLE_ORDER:
+        columns = TABLE_COLUMNS[table_name]
+        insert_sql = f"""
+            INSERT INTO {table_name} ({', '.join(columns)})
+            VALUES ({', '.join(['?'] * len(columns))})
+        """
+        inserted = 0
+        with table_transaction(conn):
+            for shard in shards:
+                table = {column: shard[f"{table_name}__{column}"] for column in columns}
+                cursor.executemany(insert_sql, iter_rows(table, columns))
+                inserted += cursor.rowcount
+        print(f"Merged {inserted} records into {table_name}")
+    
+    close_database(conn, profile)
+    
+    for shard in shards:
+        shard.close()
+
+def compare_profiles(total_customers=450, parallel=False, workers=None, json_format='json',
+                     excel_format='xlsx'):
+    """
+    Populate a fresh database once per SQLite profile and report the load times
+    
+    The database file is removed before each run so both profiles load the same
+    amount of data into empty tables.
+    """
+    from sqlite_profile import DB_PATH, PROFILES
+    
+    timings = {}
+    for profile in PROFILES:
+        for path in (DB_PATH, DB_PATH + '-wal', DB_PATH + '-shm'):
+            if os.path.exists(path):
+                os.remove(path)
+        started = time.perf_counter()
+        main(total_customers, parallel, workers, json_format, excel_format, profile)
+        timings[profile] = time.perf_counter() - started
+    
+    print("\n======================================================")
+    print("                 PROFILE COMPARISON")
+    print("======================================================")
+    for profile, elapsed in timings.items():
+        print(f"{profile:>8}: {elapsed:.2f}s ({total_customers / elapsed:,.0f} customers/s)")
+    return timings
+
+def populate_parallel(total_customers=450, num_workers=None, seed=None, profile='default'):
+    """
+    Generate the customer data in parallel shards and merge them into the database
+    
+    Parameters:
+        total_customers (int): Number of customers to generate
+        num_workers (int): Worker processes (defaults to the CPU count)
+        seed (int): Optional base seed, each shard uses seed + shard index
+        profile (str): SQLite connection profile used for the merge
+    """
+    num_workers = num_workers or os.cpu_count() or 1
+    shards = plan_shards(total_customers, num_workers)
+    
+    print(f"\n=== GENERATING {total_customers} CUSTOMERS IN {len(shards)} PARALLEL SHARDS ===")
+    os.makedirs(SHARD_DIR, exist_ok=True)
+    
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        futures = [executor.submit(generate_shard, shard, SHARD_DIR, seed) for shard in shards]
+        shard_paths = [future.result() for future in futures]
+    
+    merge_shards(shard_paths, profile=profile)
+    return shards
+
+def main(total_customers=450, parallel=False, workers=None, json_format='json', excel_format='xlsx',
+         profile='default', stats_mode='exact'):
     """Main function to coordinate the population of the database"""
     print("======================================================")
     print("      CUSTOMER DATABASE POPULATION COORDINATOR")
@@ -193,46 +354,80 @@ def main():
     # Create the segments (common for all methods)
     create_segments()
     
-    # Define ID ranges for each method
-    total_customers = 450  # Total number of customers to generate
-    customers_per_method = total_customers // 3
-    
-    method1_start = 1
-    method1_end = method1_start + customers_per_method - 1
+    started = time.perf_counter()
     
-    method2_start = method1_end + 1
-    method2_end = method2_start + customers_per_method - 1
+    if parallel:
+        shards = populate_parallel(total_customers, workers, profile=profile)
+        elapsed = time.perf_counter() - started
+        
+        # Validate the database: at least one row per customer in every table
+        is_valid = validate_database(total_customers, mode=stats_mode)
+        
+        print("\n======================================================")
+        print("                  PROCESS SUMMARY")
+        print("======================================================")
+        for shard in shards:
+            print(f"Shard {shard['shard']}: IDs {shard['start_id']}-{shard['end_id']}")
+        print(f"\nLoad time with '{profile}' profile: {elapsed:.2f}s")
+        print("\nDatabase population completed.")
+        
+        return 0 if is_valid else 1
     
-    method3_start = method2_end + 1
-    method3_end = total_customers
+    # Define ID ranges for each method; child-row IDs are reserved up front
+    # so the three methods never collide
+    method1, method2, method3 = plan_shards(total_customers, 3)
     
     # Import and run method 1 (Direct Python Insertion)
     print("\n=== RUNNING METHOD 1: DIRECT PYTHON INSERTION ===")
     from method1_direct_insertion import method1_direct_insertion
-    method1_direct_insertion(method1_start, method1_end)
+    method1_direct_insertion(method1['start_id'], method1['end_id'],
+                             method1['id_starts'], profile=profile)
     
     # Import and run method 2 (Excel Import)
     print("\n=== RUNNING METHOD 2: EXCEL IMPORT ===")
     from method2_excel_import import method2_excel_import
-    method2_excel_import(method2_start, method2_end)
+    method2_excel_import(method2['start_id'], method2['end_id'],
+                         method2['id_starts'], excel_format, profile=profile)
     
     # Import and run method 3 (JSON Import)
     print("\n=== RUNNING METHOD 3: JSON IMPORT ===")
     from method3_json_import import method3_json_import
-    method3_json_import(method3_start, method3_end)
+    method3_json_import(method3['start_id'], method3['end_id'],
+                        method3['id_starts'], json_format, profile=profile)
+    elapsed = time.perf_counter() - started
     
-    # Validate the database
-    is_valid = validate_database()
+    # Validate the database: at least one row per customer in every table
+    is_valid = validate_database(total_customers, mode=stats_mode)
     
     print("\n======================================================")
     print("                  PROCESS SUMMARY")
     print("======================================================")
-    print(f"Method 1 (Direct Python Insertion): IDs {method1_start}-{method1_end}")
-    print(f"Method 2 (Excel Import): IDs {method2_start}-{method2_end}")
-    print(f"Method 3 (JSON Import): IDs {method3_start}-{method3_end}")
+    print(f"Method 1 (Direct Python Insertion): IDs {method1['start_id']}-{method1['end_id']}")
+    print(f"Method 2 (Excel Import): IDs {method2['start_id']}-{method2['end_id']}")
+    print(f"Method 3 (JSON Import): IDs {method3['start_id']}-{method3['end_id']}")
+    print(f"\nLoad time with '{profile}' profile: {elapsed:.2f}s")
     print("\nDatabase population completed.")
     
     return 0 if is_valid else 1
 
 if __name__ == "__main__":
-    sys.exit(main())
+    parser = argparse.ArgumentParser(description="Populate the customer database")
+    parser.add_argument('--customers', type=int, default=450, help="Total number of customers")
+    parser.add_argument('--parallel', action='store_true', help="Generate in parallel shards")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes for --parallel")
+    parser.add_argument('--json-format', choices=['json', 'ndjson'], default='json',
+                        help="File format used by method 3")
+    parser.add_argument('--excel-format', choices=['xlsx', 'csv', 'parquet'], default='xlsx',
+                        help="Template file format used by method 2")
+    parser.add_argument('--profile', choices=['default', 'bulk'], default='default',
+                        help="SQLite connection profile used for the loads")
+    parser.add_argument('--compare-profiles', action='store_true',
+                        help="Rebuild the database with each profile and compare load times")
+    parser.add_argument('--stats-mode', choices=STATS_MODES, default='exact',
+                        help="How validation counts records: exact, or estimated from sqlite_stat1")
+    args = parser.parse_args()
+    if args.compare_profiles:
+        compare_profiles(args.customers, args.parallel, args.workers, args.json_format, args.excel_format)
+        sys.exit(0)
+    sys.exit(main(args.customers, args.parallel, args.workers, args.json_format, args.excel_format,
+                  args.profile, args.stats_mode))
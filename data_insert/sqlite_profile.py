@@ -0,0 +1,65 @@
+import sqlite3
+from contextlib import contextmanager
+
+DB_PATH = 'customer_database.db'
+
+# Connection profiles: 'default' keeps sqlite3.connect defaults (rollback journal,
+# synchronous=FULL), 'bulk' trades durability for load speed until the load is done
+PROFILES = ('default', 'bulk')
+
+# Page cache for bulk loads, in KiB (negative cache_size values are KiB)
+BULK_CACHE_SIZE_KIB = 256 * 1024
+
+
+def apply_bulk_profile(conn):
+    """
+    Switch a connection to the bulk-load settings
+
+    WAL journal, no fsync on commit, a large page cache and in-memory temp
+    storage. The only indexes on these tables back the PRIMARY KEY and UNIQUE
+    constraints, so they cannot be dropped for the load and stay maintained.
+    """
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = OFF")
+    conn.execute(f"PRAGMA cache_size = -{BULK_CACHE_SIZE_KIB}")
+    conn.execute("PRAGMA temp_store = MEMORY")
+
+
+def restore_durable_profile(conn):
+    """Restore durable settings after a bulk load and refresh planner statistics"""
+    conn.execute("PRAGMA synchronous = FULL")
+    conn.execute("PRAGMA journal_mode = DELETE")
+    conn.execute("ANALYZE")
+    conn.commit()
+
+
+def connect_database(profile='default', db_path=DB_PATH):
+    """Open the customer database with the given profile"""
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown profile '{profile}', expected one of {PROFILES}")
+
+    conn = sqlite3.connect(db_path)
+    if profile == 'bulk':
+        apply_bulk_profile(conn)
+    return conn
+
+
+def close_database(conn, profile='default'):
+    """Close a connection opened with connect_database, restoring durable settings first"""
+    if profile == 'bulk':
+        restore_durable_profile(conn)
+    conn.close()
+
+
+@contextmanager
+def table_transaction(conn):
+    """Run the load of one table inside a single explicit transaction"""
+    if conn.in_transaction:
+        conn.commit()
+    conn.execute("BEGIN")
+    try:
+        yield conn
+    except Exception:
+        conn.rollback()
+        raise
+    conn.commit()
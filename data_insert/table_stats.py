@@ -0,0 +1,171 @@
+import sqlite3
+import threading
+import time
+
+# Tables reported by the stats callers, in foreign key order
+STATS_TABLES = [
+    'Customer',
+    'Address',
+    'Contact',
+    'CustomerDocument',
+    'CustomerNote',
+    'CustomerSegment',
+    'CustomerSegmentAssignment'
+]
+
+# 'estimate' reads planner statistics and answers instantly; 'exact' counts every row
+STATS_MODES = ('estimate', 'exact')
+
+# Seconds a result is reused before the database is asked again
+STATS_CACHE_TTL = 30.0
+
+# Extra metric name -> scalar COUNT query, computed in exact mode only
+COVERAGE_METRICS = {
+    'Customers with Addresses': "SELECT COUNT(DISTINCT customer_id) FROM Address",
+    'Customers with Valid Docs': ("SELECT COUNT(DISTINCT customer_id) FROM CustomerDocument "
+                                  "WHERE expiry_date > CURRENT_DATE")
+}
+
+# (database, mode, tables, metrics) -> (time stored, counts); shared by every caller in the process
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def _is_sqlite(cursor):
+    return isinstance(cursor, sqlite3.Cursor)
+
+
+def _database_identity(cursor):
+    """Key telling databases apart in the cache: the SQLite file or the Postgres DSN"""
+    if _is_sqlite(cursor):
+        return ('sqlite',) + tuple(row[2] for row in cursor.execute("PRAGMA database_list").fetchall())
+    return ('postgres', cursor.connection.dsn)
+
+
+def _existing_tables(cursor, tables):
+    """Subset of tables that exist, matched case-insensitively like unquoted SQL names"""
+    if _is_sqlite(cursor):
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    else:
+        cursor.execute("""
+            SELECT table_name FROM information_schema.tables
+            WHERE table_schema = current_schema()
+        """)
+    existing = {row[0].lower() for row in cursor.fetchall()}
+    return [table for table in tables if table.lower() in existing]
+
+
+def _estimate_postgres(cursor, tables):
+    """
+    Row estimates from pg_stat_user_tables.n_live_tup, falling back to pg_class.reltuples
+
+    reltuples is scaled by the table's current size the way the planner does,
+    so it stays close between ANALYZE runs.
+    """
+    cursor.execute("""
+        SELECT c.relname,
+               COALESCE(NULLIF(s.n_live_tup, 0),
+                        CASE WHEN c.relpages > 0 AND c.reltuples >= 0
+                             THEN c.reltuples / c.relpages
+                                  * (pg_relation_size(c.oid) / current_setting('block_size')::int)
+                        END,
+                        0)::bigint
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        LEFT JOIN pg_stat_user_tables s ON s.relid = c.oid
+        WHERE c.relkind IN ('r', 'p')
+          AND n.nspname = current_schema()
+          AND c.relname = ANY(%s)
+    """, ([table.lower() for table in tables],))
+    estimates = {row[0]: row[1] for row in cursor.fetchall()}
+    return {table: estimates.get(table.lower()) for table in tables}
+
+
+def _estimate_sqlite(cursor, tables):
+    """
+    Row counts recorded by the last ANALYZE in sqlite_stat1
+
+    Tables ANALYZE has not seen fall back to MAX(rowid), a single index probe
+    that matches the count as long as rows were only appended.
+    """
+    stats = {}
+    if cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'").fetchone():
+        for table, stat in cursor.execute("SELECT tbl, stat FROM sqlite_stat1").fetchall():
+            # stat starts with the row count, followed by per-column averages
+            stats[table.lower()] = int(stat.split()[0])
+
+    existing = _existing_tables(cursor, tables)
+    counts = {}
+    for table in tables:
+        if table not in existing:
+            counts[table] = None
+        elif table.lower() in stats:
+            counts[table] = stats[table.lower()]
+        else:
+            counts[table] = cursor.execute(f"SELECT COALESCE(MAX(rowid), 0) FROM {table}").fetchone()[0]
+    return counts
+
+
+def _exact(cursor, tables, metrics):
+    """
+    Every count in a single statement
+
+    Each count is an independent scalar subquery, so the server runs the whole
+    set in one round trip; COUNT(*) is parallel safe, so Postgres may hand the
+    larger scans to parallel workers.
+    """
+    existing = _existing_tables(cursor, tables)
+    queries = [f"(SELECT COUNT(*) FROM {table})" for table in existing]
+    queries += [f"({sql})" for sql in metrics.values()]
+    if not queries:
+        return {table: None for table in tables}
+
+    cursor.execute(f"SELECT {', '.join(queries)}")
+    values = list(cursor.fetchone())
+    counts = {table: (values.pop(0) if table in existing else None) for table in tables}
+    counts.update(zip(metrics, values))
+    return counts
+
+
+def table_counts(cursor, mode='estimate', tables=STATS_TABLES, metrics=None,
+                 ttl=STATS_CACHE_TTL, refresh=False):
+    """
+    Row counts of the given tables, from a cache shared by all callers
+
+    Parameters:
+        cursor: sqlite3 or psycopg2 cursor
+        mode (str): 'estimate' (planner statistics) or 'exact' (one counting query)
+        tables (list): Tables to count; missing tables are reported as None
+        metrics (dict): Extra name -> COUNT query, only computed in exact mode
+        ttl (float): Seconds a cached result may be reused
+        refresh (bool): Ignore any cached result
+
+    Returns:
+        dict: table / metric name -> count (None when unknown), tables first
+    """
+    if mode not in STATS_MODES:
+        raise ValueError(f"Unknown stats mode '{mode}', expected one of {STATS_MODES}")
+    metrics = metrics or {}
+    key = (_database_identity(cursor), mode, tuple(tables), tuple(metrics))
+
+    with _cache_lock:
+        cached = _cache.get(key)
+    if cached is not None and not refresh and time.monotonic() - cached[0] < ttl:
+        return dict(cached[1])
+
+    if mode == 'exact':
+        counts = _exact(cursor, tables, metrics)
+    else:
+        estimate = _estimate_sqlite if _is_sqlite(cursor) else _estimate_postgres
+        counts = estimate(cursor, tables)
+        counts.update({name: None for name in metrics})
+
+    with _cache_lock:
+        _cache[key] = (time.monotonic(), counts)
+    return dict(counts)
+
+
+def invalidate_stats():
+    """Forget every cached result, e.g. after loading data"""
+    with _cache_lock:
+        _cache.clear()
@@ -0,0 +1,69 @@
+import numpy as np
+
+# Key shared by every process that generates the same database, so shards
+# generated in parallel map their disjoint row IDs to disjoint values
+DEFAULT_KEY = 5785
+
+# Feistel rounds; four rounds of a keyed mixing function give a well-shuffled order
+FEISTEL_ROUNDS = 4
+
+_MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_2 = np.uint64(0x94D049BB133111EB)
+
+
+class FeistelPermutation:
+    """
+    Keyed bijection of [0, size) onto itself
+
+    A balanced Feistel network permutes the smallest even-bit power of two that
+    covers size, and values that land outside [0, size) are encrypted again
+    (cycle walking) until they fall inside. Mapping distinct inputs therefore
+    always yields distinct outputs, with no set of used values to keep and no
+    retries on collision. Every method works on whole NumPy arrays.
+    """
+
+    def __init__(self, size, key=DEFAULT_KEY, rounds=FEISTEL_ROUNDS):
+        if size < 1:
+            raise ValueError("Permutation size must be at least 1")
+        self.size = int(size)
+        self.half_bits = max(1, ((self.size - 1).bit_length() + 1) // 2)
+        self.mask = np.uint64((1 << self.half_bits) - 1)
+        self.round_keys = np.random.default_rng(key).integers(
+            0, np.iinfo(np.uint64).max, rounds, dtype=np.uint64, endpoint=True)
+
+    def _round(self, right, round_key):
+        """Keyed mixing function (SplitMix64 finalizer) truncated to half_bits"""
+        x = (right ^ round_key) * _MIX_1
+        x ^= x >> np.uint64(31)
+        x *= _MIX_2
+        x ^= x >> np.uint64(29)
+        return x & self.mask
+
+    def _encrypt(self, values):
+        """One pass of the Feistel network over the power-of-two domain"""
+        shift = np.uint64(self.half_bits)
+        left = values >> shift
+        right = values & self.mask
+        for round_key in self.round_keys:
+            left, right = right, left ^ self._round(right, round_key)
+        return (left << shift) | right
+
+    def permute(self, indices):
+        """Map indices in [0, size) to their unique permuted positions"""
+        indices = np.asarray(indices, dtype=np.int64)
+        if len(indices) and (indices.min() < 0 or indices.max() >= self.size):
+            raise ValueError(f"Indices must lie in [0, {self.size})")
+
+        size = np.uint64(self.size)
+        with np.errstate(over='ignore'):
+            values = self._encrypt(indices.astype(np.uint64))
+            outside = values >= size
+            while outside.any():
+                values[outside] = self._encrypt(values[outside])
+                outside = values >= size
+        return values.astype(np.int64)
+
+
+def allocate(size, indices, key=DEFAULT_KEY):
+    """Unique values in [0, size) for distinct indices, see FeistelPermutation"""
+    return FeistelPermutation(size, key).permute(indices)
@@ -0,0 +1,9 @@
+# conftest.py - Make the GUI modules, the data_insert package and its scripts importable from the tests
+import os
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, 'GUI'))
+sys.path.insert(0, REPO_ROOT)
+# The data_insert scripts import each other by plain module name
+sys.path.append(os.path.join(REPO_ROOT, 'data_insert'))
@@ -0,0 +1,32 @@
+# test_advanced_search.py - Built advanced searches must carry one parameter per placeholder
+import pytest
+
+from advanced_search import SEARCH_SOURCES, build_advanced_search
+
+
+def placeholders(sql):
+    """Number of %s placeholders, failing on any other % that psycopg2 would misread"""
+    assert sql.replace('%s', '').count('%') == 0, sql
+    return sql.count('%s')
+
+
+FILTERS = [
+    {},
+    {'segment_id': 3},
+    {'since_from': '2020-01-01', 'since_to': '2021-01-01'},
+    {'notes_from': '2022-01-01', 'notes_to': '2022-12-31', 'important_only': True},
+    {'segment_id': 1, 'since_from': '2020-01-01', 'notes_to': '2022-12-31'},
+]
+
+
+@pytest.mark.parametrize('filters', FILTERS)
+@pytest.mark.parametrize('sources', [None, ['Note'], list(SEARCH_SOURCES)[:2] + ['Note']])
+def test_build_advanced_search_placeholders(sources, filters):
+    sql, params = build_advanced_search('"late payment" -refund', sources, **filters)
+    assert placeholders(sql) == len(params)
+
+
+def test_note_filters_need_notes():
+    sources = [source for source in SEARCH_SOURCES if source != 'Note']
+    with pytest.raises(ValueError):
+        build_advanced_search('payment', sources, important_only=True)
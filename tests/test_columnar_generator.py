@@ -0,0 +1,39 @@
+# test_columnar_generator.py - Generated SSNs and document numbers must never repeat, across shards too
+import numpy as np
+import pytest
+
+from data_insert.columnar_generator import build_value_pools, generate_tables, rekey_table
+
+
+@pytest.fixture(scope='module')
+def pools():
+    return build_value_pools(pool_size=50, seed=1)
+
+
+def test_ssns_unique_across_shards(pools):
+    # Two shards of disjoint customer IDs generated separately, as populate_coordinator does
+    first = generate_tables(np.arange(1, 5001), pools=pools, seed=1)
+    second = generate_tables(np.arange(5001, 10001), pools=pools, seed=2)
+    ssns = np.concatenate([first['Customer']['ssn'], second['Customer']['ssn']])
+    assert len(np.unique(ssns)) == len(ssns) == 10000
+
+
+def test_document_numbers_unique_across_shards(pools):
+    first = generate_tables(np.arange(1, 3001), id_starts={'CustomerDocument': 1}, pools=pools, seed=1)
+    count = len(first['CustomerDocument']['document_id'])
+    second = generate_tables(np.arange(3001, 6001), id_starts={'CustomerDocument': count + 1},
+                             pools=pools, seed=2)
+    numbers = np.concatenate([table['CustomerDocument']['document_number'] for table in (first, second)])
+    assert len(np.unique(numbers)) == len(numbers)
+
+
+def test_rekeyed_documents_stay_unique(pools):
+    tables = generate_tables(np.arange(1, 2001), pools=pools, seed=3)
+    documents = tables['CustomerDocument']
+    # Keys handed out by a sequence: not consecutive, far from the generated ones
+    ids = 1000000 + 7 * np.arange(len(documents['document_id']))
+    rekey_table('CustomerDocument', documents, ids)
+    assert np.array_equal(documents['document_id'], ids)
+    assert len(np.unique(documents['document_number'])) == len(ids)
+    assert all(str(document_id) in reference for document_id, reference
+               in zip(ids[:10], documents['file_reference'][:10]))
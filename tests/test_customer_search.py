@@ -0,0 +1,27 @@
+# test_customer_search.py - Built search-as-you-type queries must carry one parameter per placeholder
+import pytest
+
+from customer_search import build_search
+
+
+def placeholders(sql):
+    """Number of %s placeholders, failing on any other % that psycopg2 would misread"""
+    assert sql.replace('%s', '').count('%') == 0, sql
+    return sql.count('%s')
+
+
+@pytest.mark.parametrize('term', ['1', '123', '123-', '123-45', '123-45-6789', '1234567890123',
+                                  'cohen', 'dan cohen', '50% off_', '  levi  '])
+def test_build_search_placeholders(term):
+    sql, params = build_search(term)
+    assert placeholders(sql) == len(params)
+
+
+@pytest.mark.parametrize('term', ['', '   ', '-', '--', 'a', 'a b'])
+def test_build_search_too_short(term):
+    assert build_search(term) is None
+
+
+def test_like_wildcards_are_escaped():
+    _, params = build_search('50% off_')
+    assert '%50\\%%' in params and '%off\\_%' in params
@@ -0,0 +1,38 @@
+# test_exporter.py - Postgres column types must map to the Arrow types written to Parquet
+import datetime
+import decimal
+
+import pytest
+
+pa = pytest.importorskip('pyarrow')
+
+from exporter import arrow_type, arrow_value
+
+
+@pytest.mark.parametrize('type_code, expected', [
+    (16, pa.bool_()), (20, pa.int64()), (21, pa.int16()), (23, pa.int32()),
+    (700, pa.float32()), (701, pa.float64()), (1700, pa.float64()),
+    (1082, pa.date32()), (1114, pa.timestamp('us')), (1184, pa.timestamp('us', tz='UTC')),
+    # text, varchar, time and anything unknown are exported as strings
+    (25, pa.string()), (1043, pa.string()), (1083, pa.string()), (999999, pa.string())
+])
+def test_arrow_type(type_code, expected):
+    assert arrow_type(type_code) == expected
+
+
+def test_arrow_values_fit_their_column():
+    assert arrow_value(None, pa.int32()) is None
+    assert arrow_value(decimal.Decimal('10.50'), pa.float64()) == 10.5
+    assert arrow_value(datetime.date(2024, 2, 29), pa.string()) == '2024-02-29'
+    assert arrow_value(datetime.time(8, 30), pa.string()) == '08:30:00'
+    assert arrow_value(42, pa.string()) == '42'
+    assert arrow_value(datetime.date(2024, 2, 29), pa.date32()) == datetime.date(2024, 2, 29)
+
+
+def test_converted_values_build_arrow_arrays():
+    rows = [(1, decimal.Decimal('1.25'), datetime.date(2024, 1, 1), 'x'),
+            (None, None, None, None)]
+    for column, type_code in enumerate((23, 1700, 1082, 25)):
+        field_type = arrow_type(type_code)
+        array = pa.array([arrow_value(row[column], field_type) for row in rows], type=field_type)
+        assert array.type == field_type and array.null_count == 1
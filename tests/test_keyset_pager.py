@@ -0,0 +1,79 @@
+# test_keyset_pager.py - Keyset predicates must select exactly the rows past a key, NULLs included
+import itertools
+import sqlite3
+
+import pytest
+
+from virtual_grid import NOT_NULL, KeysetPager
+
+VALUES = [None, 1, 2]
+
+# Every combination of two nullable sort columns, made unique by the id
+ROWS = [(a, b, row_id) for row_id, (a, b) in enumerate(itertools.product(VALUES, VALUES), start=1)]
+
+
+def rows_matching(sql, params, rows=ROWS):
+    """Rows of rows for which the predicate holds, evaluated by SQLite"""
+    connection = sqlite3.connect(':memory:')
+    connection.execute("CREATE TABLE t (a INTEGER, b INTEGER, id INTEGER)")
+    connection.executemany("INSERT INTO t VALUES (?, ?, ?)", rows)
+    found = connection.execute(f"SELECT a, b, id FROM t WHERE {sql.replace('%s', '?')}", params).fetchall()
+    connection.close()
+    return set(found)
+
+
+@pytest.mark.parametrize('directions', list(itertools.product(['ASC', 'DESC'], repeat=2)))
+@pytest.mark.parametrize('forward', [True, False])
+def test_predicate_with_null_sort_keys(directions, forward):
+    pager = KeysetPager("SELECT a, b, id FROM t",
+                        [('a', directions[0], 0), ('b', directions[1], 1), ('id', 'ASC', 2)])
+    for row in ROWS:
+        key = pager.key_of(row)
+        sql, params = pager._predicate(key, forward)
+        assert sql.count('%s') == len(params)
+
+        wanted = 1 if forward else -1
+        expected = {other for other in ROWS if pager.compare_keys(pager.key_of(other), key) == wanted}
+        assert rows_matching(sql, params) == expected, (key, sql, params)
+
+
+def test_predicate_past_last_row_is_false():
+    pager = KeysetPager("SELECT a, b, id FROM t", [('a', 'ASC', 0)])
+    assert pager._predicate((None,), True) == ('FALSE', [])
+
+
+# The same combinations without NULLs, for columns marked NOT_NULL
+NOT_NULL_ROWS = [row for row in ROWS if None not in row]
+
+
+@pytest.mark.parametrize('directions', list(itertools.product(['ASC', 'DESC'], repeat=2)))
+@pytest.mark.parametrize('forward', [True, False])
+def test_predicate_with_not_null_sort_keys(directions, forward):
+    pager = KeysetPager("SELECT a, b, id FROM t", [('a', directions[0], 0, NOT_NULL), ('b', directions[1], 1),
+                                                   ('id', 'ASC', 2, NOT_NULL)])
+    for row in NOT_NULL_ROWS:
+        key = pager.key_of(row)
+        sql, params = pager._predicate(key, forward)
+        assert sql.count('%s') == len(params)
+        # The NOT NULL first column bounds the whole condition
+        assert sql.startswith('a ')
+        assert 'a IS NULL' not in sql and 'id IS NULL' not in sql
+
+        wanted = 1 if forward else -1
+        expected = {other for other in NOT_NULL_ROWS if pager.compare_keys(pager.key_of(other), key) == wanted}
+        assert rows_matching(sql, params, NOT_NULL_ROWS) == expected, (key, sql, params)
+
+
+@pytest.mark.parametrize('direction', ['ASC', 'DESC'])
+@pytest.mark.parametrize('forward', [True, False])
+def test_predicate_is_row_comparison_when_directions_agree(direction, forward):
+    pager = KeysetPager("SELECT a, b, id FROM t", [('a', direction, 0, NOT_NULL), ('id', direction, 2, NOT_NULL)])
+    for row in NOT_NULL_ROWS:
+        key = pager.key_of(row)
+        sql, params = pager._predicate(key, forward)
+        assert sql == f"(a, id) {'>' if (direction == 'ASC') == forward else '<'} (%s, %s)"
+        assert params == list(key)
+
+        wanted = 1 if forward else -1
+        expected = {other for other in NOT_NULL_ROWS if pager.compare_keys(pager.key_of(other), key) == wanted}
+        assert rows_matching(sql, params, NOT_NULL_ROWS) == expected
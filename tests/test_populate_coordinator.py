@@ -0,0 +1,30 @@
+# test_populate_coordinator.py - Shards must never share customer or child-row IDs
+import pytest
+
+from columnar_generator import DEFAULT_CHILD_COUNTS
+from populate_coordinator import plan_shards
+
+
+@pytest.mark.parametrize('total_customers, num_shards', [(1, 1), (10, 3), (450, 3), (1000, 7), (5, 8)])
+def test_customer_ranges_cover_total_without_overlap(total_customers, num_shards):
+    shards = plan_shards(total_customers, num_shards, start_id=1001)
+    assert len(shards) == min(num_shards, total_customers)
+    ids = [customer_id for shard in shards for customer_id in range(shard['start_id'], shard['end_id'] + 1)]
+    assert ids == list(range(1001, 1001 + total_customers))
+    sizes = [shard['end_id'] - shard['start_id'] + 1 for shard in shards]
+    assert max(sizes) - min(sizes) <= 1
+
+
+@pytest.mark.parametrize('total_customers, num_shards', [(10, 3), (450, 3), (1000, 7)])
+def test_child_blocks_fit_the_most_rows_a_shard_can_draw(total_customers, num_shards):
+    shards = plan_shards(total_customers, num_shards)
+    for table, (_, max_count) in DEFAULT_CHILD_COUNTS.items():
+        for shard, following in zip(shards, shards[1:]):
+            size = shard['end_id'] - shard['start_id'] + 1
+            assert following['id_starts'][table] - shard['id_starts'][table] == size * max_count
+
+    # One segment assignment per customer
+    for shard, following in zip(shards, shards[1:]):
+        size = shard['end_id'] - shard['start_id'] + 1
+        assert (following['id_starts']['CustomerSegmentAssignment']
+                - shard['id_starts']['CustomerSegmentAssignment']) == size
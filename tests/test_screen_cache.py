@@ -0,0 +1,82 @@
+# test_screen_cache.py - Cached screens are evicted least recently used first and keep their dirty flag
+import pytest
+
+import screen_cache
+from screen_cache import ScreenCache
+
+
+class FakeFrame:
+    """Stands in for tk.Frame so screens can be cached without a display"""
+
+    def __init__(self, root):
+        self.packed = False
+        self.destroyed = False
+
+    def pack(self, **options):
+        self.packed = True
+
+    def pack_forget(self):
+        self.packed = False
+
+    def tkraise(self):
+        pass
+
+    def destroy(self):
+        self.destroyed = True
+
+
+@pytest.fixture(autouse=True)
+def fake_frames(monkeypatch):
+    monkeypatch.setattr(screen_cache.tk, 'Frame', FakeFrame)
+
+
+def test_screens_are_built_once():
+    cache = ScreenCache(root=None)
+    built = []
+    frame, dirty = cache.show('customers', built.append)
+    assert dirty is None and built == [frame] and frame.packed
+
+    cache.show('addresses', built.append)
+    assert not frame.packed
+    again, dirty = cache.show('customers', built.append)
+    assert again is frame and dirty is False and len(built) == 2
+
+
+def test_least_recently_used_screen_is_evicted():
+    cache = ScreenCache(root=None, max_screens=2)
+    evicted = []
+    for name in ('a', 'b'):
+        cache.show(name, lambda frame: None, on_evict=lambda name=name: evicted.append(name))
+    cache.show('a', lambda frame: None)
+    cache.show('c', lambda frame: None)
+    assert evicted == ['b'] and list(cache.screens) == ['a', 'c']
+
+
+def test_hidden_rows_limit_evicts_but_keeps_displayed_screen():
+    cache = ScreenCache(root=None, max_screens=10, max_rows=100)
+    cache.show('big', lambda frame: None, weight=lambda: 80)
+    cache.show('small', lambda frame: None, weight=lambda: 30)
+    assert list(cache.screens) == ['big', 'small']
+    # Showing another screen hides 'small' too: 110 hidden rows, so 'big' goes first
+    cache.show('other', lambda frame: None, weight=lambda: 500)
+    assert list(cache.screens) == ['small', 'other']
+
+
+def test_dirty_flags():
+    cache = ScreenCache(root=None)
+    for name in ('a', 'b', 'c'):
+        cache.show(name, lambda frame: None)
+    cache.mark_dirty(exclude='c')
+    cache.mark_dirty(['c'])
+    assert cache.show('a', lambda frame: None)[1] is True
+    # Reading the flag clears it
+    assert cache.show('b', lambda frame: None)[1] is True
+    assert cache.show('a', lambda frame: None)[1] is False
+    assert cache.show('c', lambda frame: None)[1] is True
+
+
+def test_clear_destroys_every_screen():
+    cache = ScreenCache(root=None)
+    frames = [cache.show(name, lambda frame: None)[0] for name in ('a', 'b')]
+    cache.clear()
+    assert all(frame.destroyed for frame in frames) and not cache.screens and cache.current is None
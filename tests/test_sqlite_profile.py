@@ -0,0 +1,55 @@
+# test_sqlite_profile.py - The bulk profile must be switched on for the load and fully undone after it
+import pytest
+
+from sqlite_profile import close_database, connect_database, restore_durable_profile, table_transaction
+
+# PRAGMA synchronous values
+SYNCHRONOUS_OFF = 0
+SYNCHRONOUS_FULL = 2
+
+
+def pragma(conn, name):
+    return conn.execute(f"PRAGMA {name}").fetchone()[0]
+
+
+def test_bulk_profile_applied_and_restored(tmp_path):
+    conn = connect_database('bulk', str(tmp_path / 'bulk.db'))
+    assert pragma(conn, 'journal_mode') == 'wal'
+    assert pragma(conn, 'synchronous') == SYNCHRONOUS_OFF
+    assert pragma(conn, 'cache_size') < 0
+    assert pragma(conn, 'temp_store') == 2
+
+    conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY)")
+    with table_transaction(conn):
+        conn.executemany("INSERT INTO t VALUES (?)", [(i,) for i in range(100)])
+
+    restore_durable_profile(conn)
+    assert pragma(conn, 'journal_mode') == 'delete'
+    assert pragma(conn, 'synchronous') == SYNCHRONOUS_FULL
+    # ANALYZE recorded the row count the stats service reads
+    assert conn.execute("SELECT stat FROM sqlite_stat1 WHERE tbl = 't'").fetchone()[0].split()[0] == '100'
+    conn.close()
+
+
+def test_default_profile_keeps_sqlite_defaults(tmp_path):
+    conn = connect_database('default', str(tmp_path / 'default.db'))
+    assert pragma(conn, 'journal_mode') == 'delete'
+    assert pragma(conn, 'synchronous') == SYNCHRONOUS_FULL
+    close_database(conn)
+
+
+def test_unknown_profile(tmp_path):
+    with pytest.raises(ValueError):
+        connect_database('fast', str(tmp_path / 'unknown.db'))
+
+
+def test_table_transaction_rolls_back_on_error(tmp_path):
+    conn = connect_database('bulk', str(tmp_path / 'rollback.db'))
+    conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY)")
+    conn.commit()
+    with pytest.raises(ZeroDivisionError):
+        with table_transaction(conn):
+            conn.execute("INSERT INTO t VALUES (1)")
+            1 / 0
+    assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+    close_database(conn, 'bulk')
@@ -0,0 +1,59 @@
+# test_table_stats.py - Estimate and exact counts of a SQLite database, and the shared cache
+import sqlite3
+
+import pytest
+
+from table_stats import invalidate_stats, table_counts
+
+TABLES = ['Customer', 'Address', 'Missing']
+
+
+@pytest.fixture
+def cursor(tmp_path):
+    invalidate_stats()
+    conn = sqlite3.connect(str(tmp_path / 'stats.db'))
+    conn.execute("CREATE TABLE Customer (CustomerID INTEGER PRIMARY KEY)")
+    conn.execute("CREATE TABLE Address (addressID INTEGER PRIMARY KEY, customer_id INTEGER)")
+    conn.executemany("INSERT INTO Customer VALUES (?)", [(i,) for i in range(1, 41)])
+    conn.executemany("INSERT INTO Address VALUES (?, ?)", [(i, i % 10) for i in range(1, 31)])
+    conn.commit()
+    yield conn.cursor()
+    conn.close()
+    invalidate_stats()
+
+
+def test_exact_counts_every_row(cursor):
+    cursor.execute("DELETE FROM Customer WHERE CustomerID <= 5")
+    metrics = {'Customers with Addresses': "SELECT COUNT(DISTINCT customer_id) FROM Address"}
+    counts = table_counts(cursor, 'exact', TABLES, metrics)
+    assert counts == {'Customer': 35, 'Address': 30, 'Missing': None, 'Customers with Addresses': 10}
+    assert list(counts) == TABLES + list(metrics)
+
+
+def test_estimate_falls_back_to_max_rowid(cursor):
+    counts = table_counts(cursor, 'estimate', TABLES, {'Metric': "SELECT 1"})
+    assert counts == {'Customer': 40, 'Address': 30, 'Missing': None, 'Metric': None}
+
+
+def test_estimate_reads_analyze_statistics(cursor):
+    cursor.execute("ANALYZE")
+    # Rows added after ANALYZE are not seen until the next one
+    cursor.execute("INSERT INTO Customer VALUES (100)")
+    assert table_counts(cursor, 'estimate', TABLES)['Customer'] == 40
+    assert table_counts(cursor, 'exact', TABLES)['Customer'] == 41
+
+
+def test_results_are_cached_until_invalidated(cursor):
+    assert table_counts(cursor, 'exact', TABLES)['Customer'] == 40
+    cursor.execute("INSERT INTO Customer VALUES (100)")
+    assert table_counts(cursor, 'exact', TABLES)['Customer'] == 40
+    assert table_counts(cursor, 'exact', TABLES, refresh=True)['Customer'] == 41
+    cursor.execute("INSERT INTO Customer VALUES (101)")
+    invalidate_stats()
+    assert table_counts(cursor, 'exact', TABLES)['Customer'] == 42
+    assert table_counts(cursor, 'exact', TABLES, ttl=0)['Customer'] == 42
+
+
+def test_unknown_mode(cursor):
+    with pytest.raises(ValueError):
+        table_counts(cursor, 'guess')
@@ -0,0 +1,33 @@
+# test_unique_allocator.py - FeistelPermutation must be a bijection of [0, size) for every size
+import numpy as np
+import pytest
+
+from data_insert.unique_allocator import FeistelPermutation, allocate
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 7, 16, 17, 255, 1000, 4097, 65536, 100003])
+def test_permutation_is_bijection(size):
+    values = FeistelPermutation(size).permute(np.arange(size))
+    assert values.min() >= 0 and values.max() < size
+    assert len(np.unique(values)) == size
+
+
+@pytest.mark.parametrize('key', [0, 1, 5785, 2 ** 32 - 1])
+def test_permutation_is_bijection_for_any_key(key):
+    size = 10000
+    values = allocate(size, np.arange(size), key=key)
+    assert np.array_equal(np.sort(values), np.arange(size))
+
+
+def test_shards_map_to_disjoint_values():
+    # Parallel shards permute disjoint index ranges with the shared key
+    size = 5000
+    shards = [allocate(size, np.arange(start, min(start + 1300, size))) for start in range(0, size, 1300)]
+    assert len(np.unique(np.concatenate(shards))) == size
+
+
+def test_rejects_indices_outside_domain():
+    with pytest.raises(ValueError):
+        FeistelPermutation(10).permute([10])
+    with pytest.raises(ValueError):
+        FeistelPermutation(0)